@@ -0,0 +1,147 @@
+"""Linha de comando para verificar muitas cadeias, uma por linha.
+
+Uso::
+
+    python -m src dfa [ARQUIVO...]   # 1/0 por linha: número par de 'a' (dfa_even_a)
+    python -m src pda [ARQUIVO...]   # 1/0 por linha: a^n b^n (pda_an_bn)
+    python -m src tm  [ARQUIVO...]   # binário + 1 por linha (tm_increment_binary)
+
+Sem arquivos (ou com ``-``), lê da entrada padrão. Com ``--count``, imprime
+apenas ``aceitas total`` (para ``tm``: entradas válidas e total). Linhas
+inválidas para ``tm`` produzem ``erro``. Finais de linha ``\\r\\n`` são aceitos.
+
+A entrada é lida em blocos grandes e dividida em linhas de uma vez por
+bloco; a saída de cada bloco é escrita com uma única chamada. Só o motor
+do subcomando escolhido é importado (nada de GUI nem NumPy).
+"""
+
+import sys
+
+# Bytes lidos por chamada (``read1``: não espera encher o bloco num pipe).
+READ_SIZE = 1 << 20
+
+
+def _dfa_verdicts(block: bytes):
+    from .exercises import get_even_a_dfa
+    return get_even_a_dfa().accepts_lines(block)
+
+
+def _pda_verdicts(block: bytes):
+    from .exercises import get_an_bn_pda
+    accepts = get_an_bn_pda().accepts
+    return [accepts(line) for line in block.split(b'\n')]
+
+
+def _tm_results(block: bytes):
+    from .exercises import tm_increment_binary
+    results = []
+    for line in block.split(b'\n'):
+        try:
+            results.append(tm_increment_binary(line.decode('latin-1')).encode('latin-1'))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+COMMANDS = {
+    'dfa': _dfa_verdicts,
+    'pda': _pda_verdicts,
+    'tm': _tm_results,
+}
+
+
+def iter_line_blocks(reader, read_size: int = READ_SIZE):
+    """Produz blocos de linhas completas lidos de ``reader``.
+
+    Cada bloco é um ``bytes`` com linhas separadas por ``\\n`` (sem o ``\\n``
+    final e com ``\\r\\n`` normalizado); uma linha nunca é partida entre blocos.
+    """
+    read = getattr(reader, 'read1', reader.read)
+    # pedaços da linha ainda incompleta, unidos uma única vez quando chega o ``\n``
+    # (concatenar a cada leitura seria quadrático numa linha longa)
+    partial = []
+    while True:
+        block = read(read_size)
+        if not block:
+            break
+        cut = block.rfind(b'\n')
+        if cut < 0:
+            partial.append(block)
+            continue
+        if partial:
+            partial.append(block)
+            cut -= len(block)
+            block = b''.join(partial)
+            cut += len(block)
+            partial = []
+        rest = block[cut + 1:]
+        if rest:
+            partial.append(rest)
+        lines = block[:cut + 1]
+        if b'\r' in lines:
+            lines = lines.replace(b'\r\n', b'\n')
+        yield lines[:-1]
+    if partial:
+        rest = b''.join(partial)
+        if b'\r' in rest:
+            rest = rest.replace(b'\r\n', b'\n')
+        yield rest[:-1] if rest.endswith(b'\r') else rest
+
+
+def _format(results) -> bytes:
+    """Uma linha de saída por resultado: 1/0 para vereditos, o texto para a MT."""
+    out = [b'1' if r is True else b'0' if r is False else b'erro' if r is None else r
+           for r in results]
+    out.append(b'')
+    return b'\n'.join(out)
+
+
+def _open_inputs(paths):
+    if not paths:
+        yield sys.stdin.buffer
+        return
+    for path in paths:
+        if path == '-':
+            yield sys.stdin.buffer
+        else:
+            with open(path, 'rb') as f:
+                yield f
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m src',
+                                     description='Verifica cadeias (uma por linha) com os autômatos dos exercícios.')
+    parser.add_argument('command', choices=sorted(COMMANDS), help='autômato a usar')
+    parser.add_argument('files', nargs='*', metavar='ARQUIVO', help="arquivos de entrada ('-' = stdin)")
+    parser.add_argument('-c', '--count', action='store_true', help='imprime só "aceitas total"')
+    args = parser.parse_intermixed_args(argv)
+
+    run = COMMANDS[args.command]
+    write = sys.stdout.buffer.write
+    accepted = total = 0
+    try:
+        for reader in _open_inputs(args.files):
+            for block in iter_line_blocks(reader):
+                results = run(block)
+                if args.count:
+                    total += len(results)
+                    accepted += sum(1 for r in results if r is not None and r is not False)
+                else:
+                    write(_format(results))
+        if args.count:
+            write(f'{accepted} {total}\n'.encode())
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # leitor do pipe fechou (por exemplo, ``| head``): encerra em silêncio
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except OSError as e:
+        print(f'erro: {e}', file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Busca de muitos padrões de uma vez (Aho–Corasick) sobre o motor de AFD.
+
+``AhoCorasick(patterns)`` monta a trie dos padrões, calcula os elos de
+falha em largura e os resolve na construção: cada estado recebe a linha
+completa de transições (a do seu elo de falha, sobrescrita pelos filhos
+na trie). O resultado é um ``DFA`` comum (``self.dfa``, via
+``DFA.from_table``) com a mesma tabela plana de deslocamentos e o mesmo
+``classmap`` dos demais AFDs — bytes que não aparecem em nenhum padrão
+formam a classe 0, que volta à raiz (se os padrões usam os 256 bytes,
+as colunas iguais são agrupadas como em qualquer ``DFA``). Os estados de aceitação são os que
+terminam algum padrão, de modo que ``self.dfa.accepts(s)`` diz se ``s``
+termina com um padrão.
+
+Os estados são numerados com os que têm saída por último: no laço de
+busca, um único ``off >= first_out`` por byte decide se há ocorrência.
+Cada ocorrência é ``(id do padrão, fim)``, com ``fim`` exclusivo (o
+padrão ocupa ``fim - len(padrão)`` até ``fim``); ocorrências sobrepostas
+são todas relatadas.
+
+``search`` percorre ``bytes``/``mmap``/``memoryview`` em blocos;
+``MatchRunner`` recebe a entrada aos pedaços (``feed``), com posições
+globais e ocorrências que atravessam a fronteira entre pedaços.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .dfa import BLOCK_SIZE, DFA, Input, as_bytes
+from .stream import CHUNK_SIZE, iter_file_chunks
+
+Match = Tuple[int, int]
+
+
+class AhoCorasick:
+    """Autômato de Aho–Corasick de um conjunto de padrões (``str`` latin-1 ou ``bytes``).
+
+    O id de cada padrão é sua posição em ``patterns``; padrões repetidos
+    mantêm ids distintos.
+    """
+
+    def __init__(self, patterns: Iterable[Input]):
+        self.patterns: List[bytes] = []
+        for p in patterns:
+            data = as_bytes(p)
+            if data is None:
+                raise ValueError(f"Padrão com caractere fora de latin-1: {p!r}")
+            if not data:
+                raise ValueError("Padrões vazios não são permitidos")
+            self.patterns.append(bytes(data))
+
+        # trie: filhos por estado e ids dos padrões que terminam em cada estado
+        goto: List[Dict[int, int]] = [{}]
+        own: List[List[int]] = [[]]
+        for pid, p in enumerate(self.patterns):
+            q = 0
+            for code in p:
+                nxt = goto[q].get(code)
+                if nxt is None:
+                    nxt = goto[q][code] = len(goto)
+                    goto.append({})
+                    own.append([])
+                q = nxt
+            own[q].append(pid)
+
+        alphabet = bytes(sorted({code for p in self.patterns for code in p}))
+        stride = len(alphabet) + 1
+        cls = {code: i + 1 for i, code in enumerate(alphabet)}
+
+        # elos de falha e linhas resolvidas, em largura (o elo de falha vem antes)
+        n = len(goto)
+        rows: List[Optional[List[int]]] = [None] * n
+        outputs: List[Tuple[int, ...]] = [()] * n
+        rows[0] = [0] * stride
+        for code, child in goto[0].items():
+            rows[0][cls[code]] = child
+        order = [0]
+        fail = [0] * n
+        queue = deque(goto[0].values())
+        while queue:
+            q = queue.popleft()
+            order.append(q)
+            f = fail[q]
+            outputs[q] = tuple(own[q]) + outputs[f]
+            row = list(rows[f])
+            for code, child in goto[q].items():
+                row[cls[code]] = child
+                fail[child] = rows[f][cls[code]]
+                queue.append(child)
+            rows[q] = row
+
+        # renumeração: estados sem saída primeiro, a raiz como 0
+        ranked = [q for q in order if not outputs[q]] + [q for q in order if outputs[q]]
+        new = [0] * n
+        for i, q in enumerate(ranked):
+            new[q] = i
+        # um objeto ``int`` por estado, compartilhado por todas as entradas que levam a ele
+        offsets = [new[q] * stride for q in range(n)]
+        table = [offsets[r] for q in ranked for r in rows[q]]
+        first = sum(1 for q in order if not outputs[q])
+        flags = bytes(1 if outputs[q] else 0 for q in ranked)
+
+        self.dfa = DFA.from_table(alphabet, table, 0, flags)
+        # com os 256 bytes nos padrões, ``from_table`` agrupa colunas e o stride muda
+        self.first_out = first * self.dfa.stride
+        # saídas dos estados ``first_out // stride`` em diante, na mesma ordem
+        self.outputs: List[Tuple[int, ...]] = [outputs[q] for q in ranked[first:]]
+
+    @property
+    def n_states(self) -> int:
+        return self.dfa.n_states
+
+    def _scan(self, block: bytes, off: int, end: int, matches: List[Match]) -> int:
+        # ``end``: fim (exclusivo) de uma ocorrência que termine no primeiro byte
+        dfa = self.dfa
+        stride = dfa.stride
+        t = dfa._fast
+        first, outputs = self.first_out, self.outputs
+        for i, c in enumerate(block.translate(dfa.classmap), end):
+            off = t[off + c]
+            if off >= first:
+                for pid in outputs[(off - first) // stride]:
+                    matches.append((pid, i))
+        return off
+
+    def search(self, data: Input, state: int = 0, offset: int = 0) -> Iterator[Match]:
+        """Produz ``(id do padrão, fim)`` para cada ocorrência em ``data``.
+
+        ``state`` e ``offset`` retomam uma busca anterior (estado do AFD e
+        posição global do primeiro byte de ``data``); veja ``MatchRunner``.
+        """
+        buf = as_bytes(data)
+        if buf is None:
+            raise ValueError("Entrada com caractere fora de latin-1")
+        off = state * self.dfa.stride
+        for start in range(0, len(buf), BLOCK_SIZE):
+            matches: List[Match] = []
+            off = self._scan(bytes(buf[start:start + BLOCK_SIZE]), off, offset + start + 1, matches)
+            yield from matches
+
+    def find_all(self, data: Input) -> List[Match]:
+        """Todas as ocorrências em ``data``, na ordem em que terminam."""
+        return list(self.search(data))
+
+    def runner(self) -> 'MatchRunner':
+        return MatchRunner(self)
+
+    def search_file(self, path, chunk_size: int = CHUNK_SIZE) -> Iterator[Match]:
+        """Ocorrências num arquivo lido via ``mmap``, bloco a bloco."""
+        runner = self.runner()
+        for chunk in iter_file_chunks(path, chunk_size):
+            yield from runner.feed(chunk)
+
+
+class MatchRunner:
+    """Busca incremental: ``feed(pedaço)`` retorna as ocorrências que terminam nele.
+
+    As posições são globais (contadas desde o primeiro pedaço), e um padrão
+    partido entre dois pedaços é encontrado no pedaço em que termina.
+    """
+
+    def __init__(self, automaton: AhoCorasick):
+        self.automaton = automaton
+        self.consumed = 0
+        self._off = 0
+
+    @property
+    def state(self) -> int:
+        return self._off // self.automaton.dfa.stride
+
+    def feed(self, chunk: Input) -> List[Match]:
+        buf = as_bytes(chunk)
+        if buf is None:
+            raise ValueError("Entrada com caractere fora de latin-1")
+        scan = self.automaton._scan
+        matches: List[Match] = []
+        off = self._off
+        for start in range(0, len(buf), BLOCK_SIZE):
+            off = scan(bytes(buf[start:start + BLOCK_SIZE]), off, self.consumed + start + 1, matches)
+        self._off = off
+        self.consumed += len(buf)
+        return matches
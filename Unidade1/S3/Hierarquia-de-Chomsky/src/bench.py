@@ -0,0 +1,245 @@
+"""Benchmarks reprodutíveis de ``dfa_even_a``, ``pda_an_bn`` e ``tm_increment_binary``.
+
+Para cada autômato e cada tamanho de entrada (gerada com semente fixa) o
+harness mede:
+
+- latência de cada repetição (mínimo, média, p50, p90, p99);
+- vazão em símbolos/s (e passos/s para a Máquina de Turing), pela mediana;
+- pico de memória alocada durante uma execução extra, com ``tracemalloc``
+  (fora das repetições cronometradas, pois o rastreamento as deixaria lentas).
+
+Uso::
+
+    python -m src.bench --sizes 1KB,1MB,64MB --repeat 5 --json resultados.json
+    python -m src.bench --baseline resultados.json --threshold 0.2
+
+Com ``--baseline``, o comando termina com código 1 se a vazão de algum
+caso cair (ou o pico de memória subir) mais que ``threshold`` em relação ao
+arquivo JSON de referência — que é a própria saída de uma execução anterior.
+Na suíte de testes, os benchmarks são marcados com ``@pytest.mark.benchmark``
+e só rodam com ``pytest --benchmark`` (veja ``tests/conftest.py``).
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import exercises
+
+DEFAULT_SIZES = '1KB,64KB,1MB'
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+SEED = 1234
+
+_UNITS = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Converte '1KB', '64MB', '1GB' ou '1000' em número de bytes."""
+    t = text.strip().upper()
+    for unit in ('KB', 'MB', 'GB', 'B'):
+        if t.endswith(unit):
+            number = t[:-len(unit)].strip()
+            break
+    else:
+        unit, number = 'B', t
+    try:
+        value = int(float(number) * _UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Tamanho inválido: {text!r}") from None
+    if value < 0:
+        raise ValueError(f"Tamanho inválido: {text!r}")
+    return value
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Percentil ``p`` (0..100) com interpolação linear de valores já ordenados."""
+    if not sorted_values:
+        raise ValueError("Sem valores para o percentil")
+    pos = (len(sorted_values) - 1) * p / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _random_symbols(size: int, symbols: bytes, seed: int) -> bytes:
+    table = bytes(symbols[i % len(symbols)] for i in range(256))
+    rng = random.Random(seed)
+    block = 1 << 20
+    out = bytearray()
+    for i in range(0, size, block):
+        n = min(block, size - i)
+        out += rng.getrandbits(8 * n).to_bytes(n, 'little').translate(table)
+    return bytes(out)
+
+
+def _even_a_input(size: int, seed: int):
+    return _random_symbols(size, b'ab', seed)
+
+
+def _an_bn_input(size: int, seed: int):
+    return b'a' * (size // 2) + b'b' * (size - size // 2)
+
+
+def _increment_input(size: int, seed: int):
+    return _random_symbols(size, b'01', seed).decode('latin-1')
+
+
+def _increment_steps(data: str) -> int:
+    return exercises.INCREMENT_TM.run_accelerated(data or '0').steps
+
+
+# nome -> (gerador de entrada, função medida, passos da execução ou None)
+BENCHMARKS: Dict[str, Tuple[Callable[[int, int], object], Callable[[object], object],
+                            Optional[Callable[[object], int]]]] = {
+    'dfa_even_a': (_even_a_input, exercises.dfa_even_a, None),
+    'pda_an_bn': (_an_bn_input, exercises.pda_an_bn, None),
+    'tm_increment_binary': (_increment_input, exercises.tm_increment_binary, _increment_steps),
+}
+
+
+def measure(name: str, size: int, repeat: int = DEFAULT_REPEAT, seed: int = SEED) -> dict:
+    """Executa um benchmark e retorna suas medidas como dicionário."""
+    make_input, fn, count_steps = BENCHMARKS[name]
+    data = make_input(size, seed)
+    fn(data)  # aquecimento
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(data)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+
+    tracemalloc.start()
+    try:
+        fn(data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    median = max(percentile(times, 50), 1e-9)
+    result = {
+        'bench': name,
+        'size': size,
+        'repeat': repeat,
+        'seconds': {
+            'min': times[0],
+            'mean': sum(times) / len(times),
+            'p50': percentile(times, 50),
+            'p90': percentile(times, 90),
+            'p99': percentile(times, 99),
+        },
+        'symbols_per_s': size / median,
+        'peak_bytes': peak,
+    }
+    if count_steps is not None:
+        steps = count_steps(data)
+        result['steps'] = steps
+        result['steps_per_s'] = steps / median
+    return result
+
+
+def run_suite(names: Sequence[str], sizes: Sequence[int], repeat: int = DEFAULT_REPEAT,
+              seed: int = SEED, log: Optional[Callable[[str], None]] = None) -> dict:
+    """Mede todos os pares (benchmark, tamanho) e retorna o relatório completo."""
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Benchmark desconhecido: {name!r}")
+    results = []
+    for name in names:
+        for size in sizes:
+            r = measure(name, size, repeat, seed)
+            results.append(r)
+            if log is not None:
+                log(format_result(r))
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'numpy': numpy_version,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Lista as regressões de ``report`` em relação a ``baseline``.
+
+    Compara vazão (símbolos/s) e pico de memória dos casos presentes nos
+    dois relatórios; casos ausentes na referência são ignorados.
+    """
+    reference = {(r['bench'], r['size']): r for r in baseline.get('results', [])}
+    problems = []
+    for r in report['results']:
+        base = reference.get((r['bench'], r['size']))
+        if base is None:
+            continue
+        case = f"{r['bench']} ({r['size']} B)"
+        if r['symbols_per_s'] < base['symbols_per_s'] * (1 - threshold):
+            problems.append(f"{case}: vazão {r['symbols_per_s']:.3g} símbolos/s, "
+                            f"referência {base['symbols_per_s']:.3g}")
+        # folga fixa de 64 KB: picos pequenos variam com o alocador
+        if r['peak_bytes'] > base['peak_bytes'] * (1 + threshold) + (1 << 16):
+            problems.append(f"{case}: pico de memória {r['peak_bytes']} B, "
+                            f"referência {base['peak_bytes']} B")
+    return problems
+
+
+def format_result(r: dict) -> str:
+    s = r['seconds']
+    line = (f"{r['bench']:<20} {r['size']:>12} B  p50 {s['p50'] * 1e3:10.3f} ms  "
+            f"p99 {s['p99'] * 1e3:10.3f} ms  {r['symbols_per_s'] / 1e6:9.2f} Msímb/s  "
+            f"pico {r['peak_bytes'] / 1024:10.1f} KB")
+    if 'steps_per_s' in r:
+        line += f"  {r['steps_per_s'] / 1e6:9.2f} Mpassos/s"
+    return line
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.bench', description=__doc__.splitlines()[0])
+    parser.add_argument('--bench', action='append', choices=sorted(BENCHMARKS),
+                        help='benchmark a executar (repetível; padrão: todos)')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'tamanhos separados por vírgula, de 1KB a 1GB (padrão: {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='repetições cronometradas')
+    parser.add_argument('--seed', type=int, default=SEED, help='semente das entradas geradas')
+    parser.add_argument('--json', metavar='ARQUIVO', help='grava o relatório em JSON')
+    parser.add_argument('--baseline', metavar='ARQUIVO', help='relatório JSON de referência')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='regressão tolerada, em fração (padrão: 0.2)')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat deve ser pelo menos 1')
+    try:
+        sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    report = run_suite(args.bench or list(BENCHMARKS), sizes, args.repeat, args.seed, log=print)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            problems = compare(report, json.load(f), args.threshold)
+        for p in problems:
+            print('REGRESSÃO:', p, file=sys.stderr)
+        if problems:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
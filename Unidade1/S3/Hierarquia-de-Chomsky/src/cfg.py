@@ -0,0 +1,350 @@
+"""Gramáticas livres de contexto e reconhecedores CYK e Earley.
+
+Uma ``Grammar`` é dada por um dicionário ``não-terminal -> alternativas``.
+Cada alternativa é uma ``str`` (cada caractere é um símbolo) ou uma
+sequência de símbolos; um símbolo é não-terminal se for chave do
+dicionário e, caso contrário, terminal (um caractere/byte). Exemplo::
+
+    Grammar({'S': ['aSb', '']}, 'S')   # a^n b^n
+
+Reconhecedores (aceitam ``str``, ``bytes`` ou ``memoryview``, como
+``pda_an_bn``):
+
+- ``CYKRecognizer``: CYK sobre a forma normal de Chomsky, *bit-paralelo*:
+  para cada posição inicial ``i`` e não-terminal ``A`` guarda-se um inteiro
+  cujos bits são as posições finais ``j`` com ``A =>* w[i:j]``; cada regra
+  ``A -> BC`` combina linhas inteiras com um único ``|`` de inteiros.
+- ``EarleyRecognizer``: Earley com o tratamento de anuláveis de
+  Aycock-Horspool e a otimização de Leo, que torna linear a recursão à
+  direita (em gramáticas LR-regulares o tempo é linear).
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from .dfa import Input, _symbol_code, as_bytes
+
+# Símbolo interno: ``str`` para não-terminal, ``int`` (byte) para terminal.
+Symbol = Union[str, int]
+Rule = Tuple[str, Tuple[Symbol, ...]]
+
+
+class Grammar:
+    """Gramática livre de contexto (produções, símbolo inicial)."""
+
+    def __init__(self, productions: Dict[str, Iterable[Union[str, Sequence[str]]]], start: str):
+        if start not in productions:
+            raise ValueError(f"Símbolo inicial sem produções: {start!r}")
+        rules: List[Rule] = []
+        for lhs, alternatives in productions.items():
+            for rhs in alternatives:
+                symbols = []
+                for sym in rhs:
+                    if sym in productions:
+                        symbols.append(sym)
+                    else:
+                        symbols.append(_symbol_code(sym))
+                rules.append((lhs, tuple(symbols)))
+        self._init_rules(rules, start)
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[Rule], start: str) -> 'Grammar':
+        """Constrói a partir de regras internas (terminais já como inteiros)."""
+        self = cls.__new__(cls)
+        self._init_rules(list(rules), start)
+        return self
+
+    def _init_rules(self, rules: List[Rule], start: str) -> None:
+        seen = set()
+        self.rules: List[Rule] = []
+        for rule in rules:
+            if rule not in seen:
+                seen.add(rule)
+                self.rules.append(rule)
+        self.start = start
+        self.nonterminals: List[str] = list(dict.fromkeys(
+            [start] + [lhs for lhs, _ in self.rules]
+            + [s for _, rhs in self.rules for s in rhs if isinstance(s, str)]))
+
+    def nullable(self) -> Set[str]:
+        """Não-terminais que derivam a cadeia vazia."""
+        result: Set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in self.rules:
+                if lhs not in result and all(isinstance(s, str) and s in result for s in rhs):
+                    result.add(lhs)
+                    changed = True
+        return result
+
+    def is_cnf(self) -> bool:
+        for lhs, rhs in self.rules:
+            if len(rhs) == 1 and isinstance(rhs[0], int):
+                continue
+            if len(rhs) == 2 and all(isinstance(s, str) for s in rhs):
+                continue
+            if not rhs and lhs == self.start:
+                continue
+            return False
+        return not any(self.start in rhs for _, rhs in self.rules)
+
+    def _fresh(self, base: str, used: Set[str]) -> str:
+        name = base
+        i = 0
+        while name in used:
+            i += 1
+            name = f"{base}{i}"
+        used.add(name)
+        return name
+
+    def to_cnf(self) -> 'Grammar':
+        """Converte para a forma normal de Chomsky (START, TERM, BIN, DEL, UNIT).
+
+        A regra ``S0 -> ε`` só é mantida quando a linguagem contém a cadeia
+        vazia.
+        """
+        used = set(self.nonterminals)
+        start = self._fresh(self.start + "0", used)
+        rules: List[Rule] = [(start, (self.start,))] + list(self.rules)
+
+        # TERM: terminais em lados direitos longos viram não-terminais próprios
+        term_nt: Dict[int, str] = {}
+        step: List[Rule] = []
+        for lhs, rhs in rules:
+            if len(rhs) >= 2:
+                new_rhs = []
+                for s in rhs:
+                    if isinstance(s, int):
+                        if s not in term_nt:
+                            term_nt[s] = self._fresh(f"T<{chr(s)}>", used)
+                            step.append((term_nt[s], (s,)))
+                        s = term_nt[s]
+                    new_rhs.append(s)
+                rhs = tuple(new_rhs)
+            step.append((lhs, rhs))
+
+        # BIN: quebra lados direitos com mais de dois símbolos
+        rules = []
+        for lhs, rhs in step:
+            head = lhs
+            while len(rhs) > 2:
+                nxt = self._fresh(f"{lhs}_", used)
+                rules.append((head, (rhs[0], nxt)))
+                head, rhs = nxt, rhs[1:]
+            rules.append((head, rhs))
+
+        # DEL: remove produções vazias (exceto eventualmente a do início)
+        nullable = Grammar.from_rules(rules, start).nullable()
+        step = []
+        for lhs, rhs in rules:
+            variants = [()]
+            for s in rhs:
+                variants = [v + (s,) for v in variants] + (variants if s in nullable else [])
+            step.extend((lhs, v) for v in variants if v)
+        if start in nullable:
+            step.append((start, ()))
+
+        # UNIT: substitui A -> B pelas produções não unitárias de B
+        units: Dict[str, Set[str]] = {}
+        for lhs, rhs in step:
+            if len(rhs) == 1 and isinstance(rhs[0], str):
+                units.setdefault(lhs, set()).add(rhs[0])
+        by_lhs: Dict[str, List[Tuple[Symbol, ...]]] = {}
+        for lhs, rhs in step:
+            if not (len(rhs) == 1 and isinstance(rhs[0], str)):
+                by_lhs.setdefault(lhs, []).append(rhs)
+        rules = []
+        for a in dict.fromkeys([lhs for lhs, _ in step]):
+            reach = {a}
+            stack = [a]
+            while stack:
+                for b in units.get(stack.pop(), ()):
+                    if b not in reach:
+                        reach.add(b)
+                        stack.append(b)
+            for b in reach:
+                rules.extend((a, rhs) for rhs in by_lhs.get(b, ()) if rhs or a == start)
+        return Grammar.from_rules(rules, start)
+
+    def accepts(self, data: Input, method: str = 'earley') -> bool:
+        """Reconhece ``data`` com ``method`` igual a 'earley' ou 'cyk'."""
+        cache = self.__dict__.setdefault('_recognizers', {})
+        rec = cache.get(method)
+        if rec is None:
+            if method == 'earley':
+                rec = EarleyRecognizer(self)
+            elif method == 'cyk':
+                rec = CYKRecognizer(self)
+            else:
+                raise ValueError("method deve ser 'earley' ou 'cyk'")
+            cache[method] = rec
+        return rec.accepts(data)
+
+
+class CYKRecognizer:
+    """CYK bit-paralelo sobre a forma normal de Chomsky da gramática."""
+
+    def __init__(self, grammar: Grammar):
+        cnf = grammar if grammar.is_cnf() else grammar.to_cnf()
+        self.grammar = cnf
+        index = {nt: i for i, nt in enumerate(cnf.nonterminals)}
+        self.n = len(index)
+        self.start = index[cnf.start]
+        self.accepts_empty = (cnf.start, ()) in cnf.rules
+        # A -> a: máscara de não-terminais por byte
+        self.by_terminal: Dict[int, List[int]] = {}
+        # A -> B C: agrupado pelo símbolo da esquerda, B -> [(C, A)]
+        self.by_left: List[List[Tuple[int, int]]] = [[] for _ in range(self.n)]
+        for lhs, rhs in cnf.rules:
+            if len(rhs) == 1:
+                self.by_terminal.setdefault(rhs[0], []).append(index[lhs])
+            elif len(rhs) == 2:
+                self.by_left[index[rhs[0]]].append((index[rhs[1]], index[lhs]))
+        self._left_symbols = [b for b in range(self.n) if self.by_left[b]]
+
+    def accepts(self, data: Input) -> bool:
+        buf = as_bytes(data)
+        if buf is None:
+            return False
+        w = bytes(buf)
+        n = len(w)
+        if n == 0:
+            return self.accepts_empty
+        nts = range(self.n)
+        by_terminal, by_left, lefts = self.by_terminal, self.by_left, self._left_symbols
+        # ends[i][A]: bits j tais que A =>* w[i:j]; linhas calculadas de n-1 até 0
+        ends: List[Optional[List[int]]] = [None] * n
+        for i in range(n - 1, -1, -1):
+            row = [0] * self.n
+            for a in by_terminal.get(w[i], ()):
+                row[a] |= 1 << (i + 1)
+            # ao chegar em k, todos os bits k da linha i já estão definitivos
+            for k in range(i + 1, n):
+                later = ends[k]
+                for b in lefts:
+                    if row[b] >> k & 1:
+                        for c, a in by_left[b]:
+                            row[a] |= later[c]
+            ends[i] = row
+        return bool(ends[0][self.start] >> n & 1)
+
+
+class EarleyRecognizer:
+    """Reconhecedor de Earley com anuláveis (Aycock-Horspool) e itens de Leo.
+
+    Um item é ``(regra, ponto, origem)``. Cada conjunto ``S[k]`` é indexado
+    pelo símbolo que cada item espera, para que a previsão, a leitura e a
+    conclusão sejam consultas diretas. Na conclusão de ``B`` com origem
+    ``j < k``, se ``S[j]`` tem um único item esperando ``B`` e ``B`` é o
+    último símbolo da regra, a cadeia determinística de conclusões é
+    resumida ao item mais alto (memorizado por ``(j, B)``), evitando o custo
+    quadrático da recursão à direita.
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.grammar = grammar
+        # regra aumentada S' -> S: S' não aparece em nenhum lado direito, logo
+        # seu item concluído nunca é pulado pelos atalhos de Leo
+        self.start = grammar._fresh(grammar.start + "'", set(grammar.nonterminals))
+        self.rules = grammar.rules + [(self.start, (grammar.start,))]
+        self.nullable = Grammar.from_rules(self.rules, self.start).nullable()
+        self.by_lhs: Dict[str, List[int]] = {}
+        for r, (lhs, _) in enumerate(self.rules):
+            self.by_lhs.setdefault(lhs, []).append(r)
+
+    def accepts(self, data: Input) -> bool:
+        buf = as_bytes(data)
+        if buf is None:
+            return False
+        w = bytes(buf)
+        rules, by_lhs, nullable = self.rules, self.by_lhs, self.nullable
+        # por conjunto: itens (dedup) e índice "símbolo esperado -> itens"
+        seen: List[Set[Tuple[int, int, int]]] = []
+        waiting: List[Dict[Symbol, List[Tuple[int, int, int]]]] = []
+        leo: Dict[Tuple[int, str], Optional[Tuple[int, int, int]]] = {}
+
+        def leo_top(j: int, b: str) -> Optional[Tuple[int, int, int]]:
+            # sobe a cadeia determinística iterativamente (pode ser tão longa
+            # quanto a entrada) e memoriza o topo para cada elo percorrido
+            path = []
+            top = None
+            while True:
+                key = (j, b)
+                if key in leo:
+                    top = leo[key]
+                    break
+                candidates = waiting[j].get(b, ())
+                if len(candidates) != 1:
+                    leo[key] = None
+                    break
+                r, dot, origin = candidates[0]
+                if dot + 1 != len(rules[r][1]):
+                    leo[key] = None
+                    break
+                path.append((key, (r, dot + 1, origin)))
+                if origin >= j:
+                    break
+                j, b = origin, rules[r][0]
+            for key, item in reversed(path):
+                if top is None:
+                    top = item
+                leo[key] = top
+            return top
+
+        k = 0
+        agenda: List[Tuple[int, int, int]] = []
+
+        def add(item: Tuple[int, int, int]) -> None:
+            if item not in items:
+                items.add(item)
+                agenda.append(item)
+                rhs = rules[item[0]][1]
+                if item[1] < len(rhs):
+                    wait.setdefault(rhs[item[1]], []).append(item)
+
+        items: Set[Tuple[int, int, int]] = set()
+        wait: Dict[Symbol, List[Tuple[int, int, int]]] = {}
+        seen.append(items)
+        waiting.append(wait)
+        for r in by_lhs.get(self.start, ()):
+            add((r, 0, 0))
+
+        while True:
+            predicted: Set[str] = set()
+            while agenda:
+                r, dot, origin = agenda.pop()
+                lhs, rhs = rules[r]
+                if dot < len(rhs):
+                    sym = rhs[dot]
+                    if isinstance(sym, str):
+                        if sym not in predicted:
+                            predicted.add(sym)
+                            for r2 in by_lhs.get(sym, ()):
+                                add((r2, 0, k))
+                        if sym in nullable:
+                            add((r, dot + 1, origin))
+                    continue
+                # conclusão de ``lhs`` iniciado em ``origin``
+                if origin < k:
+                    top = leo_top(origin, lhs)
+                    if top is not None:
+                        add(top)
+                        continue
+                for r2, d2, o2 in list(waiting[origin].get(lhs, ())):
+                    add((r2, d2 + 1, o2))
+            if k == len(w):
+                break
+            # leitura do byte w[k]
+            scanned = wait.get(w[k], ())
+            k += 1
+            items = set()
+            wait = {}
+            seen.append(items)
+            waiting.append(wait)
+            for r, dot, origin in scanned:
+                add((r, dot + 1, origin))
+            if not agenda:
+                return False
+
+        return any(rules[r][0] == self.start and dot == len(rules[r][1]) and origin == 0
+                   for r, dot, origin in seen[k])
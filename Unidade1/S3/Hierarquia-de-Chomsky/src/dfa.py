@@ -0,0 +1,597 @@
+"""Motor genérico de AFD (autômato finito determinístico) orientado a tabela.
+
+O autômato é descrito por estados, alfabeto, função de transição, estado
+inicial e estados de aceitação, e é compilado para uma tabela densa:
+
+- cada byte da entrada é mapeado para uma *classe* (0 = fora do alfabeto,
+  1..k = símbolos do alfabeto) via ``bytes.translate``, executado em C;
+  um alfabeto com os 256 bytes não deixa espaço para a classe 256, e seus
+  bytes são agrupados em classes de colunas iguais (``_merge_columns``);
+- a tabela ``table`` guarda, na linha de cada estado, o *deslocamento* do
+  próximo estado (``indice * stride``), de modo que o laço interno faz
+  apenas ``off = table[off + classe]``, sem desvios por caractere.
+
+Transições ausentes e símbolos fora do alfabeto levam a um estado morto
+(não aceitador, com laço em si mesmo), sempre presente na tabela.
+
+``DFA.accepts_batch`` classifica muitas cadeias de uma vez com NumPy
+(dependência opcional, importada só quando necessária).
+
+Uma única entrada longa também pode ser dividida em pedaços: cada pedaço
+vira um *mapa de transição* (estado de entrada -> estado de saída, para
+todos os estados), calculado independentemente dos demais, e os mapas são
+compostos por uma varredura associativa (``compose_maps``). Veja
+``DFA.chunk_maps`` e ``DFA.run_scan``.
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from .instrument import Stats
+
+# Tamanho dos blocos traduzidos por vez: limita a memória extra em entradas
+# grandes (``memoryview``/``mmap``) sem custo perceptível no laço.
+BLOCK_SIZE = 1 << 16
+
+# Cadeias por lote em ``accepts_batch`` e quantidade de cadeias ativas abaixo
+# da qual o restante (as mais longas) é terminado no laço escalar.
+BATCH_STRINGS = 1 << 16
+BATCH_SCALAR_TAIL = 16
+
+# Pedaços por entrada em ``chunk_maps`` (avançados juntos com NumPy) e bytes
+# traduzidos por vez ao montar as colunas desses pedaços.
+SCAN_CHUNKS = 4096
+SCAN_BLOCK = 1 << 24
+
+# Tabelas com mais entradas que isto, quando já são ``memoryview`` (por
+# exemplo, mapeadas de um arquivo por ``serialize.load``), são usadas
+# diretamente no laço em vez de copiadas para uma lista.
+LIST_COPY_LIMIT = 1 << 22
+
+Input = Union[str, bytes, bytearray, memoryview]
+
+
+def _numpy():
+    """Importa NumPy sob demanda; retorna None se não estiver instalado."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _symbol_code(sym: Union[str, int]) -> int:
+    """Converte um símbolo (caractere ou inteiro) no código de byte correspondente."""
+    if isinstance(sym, int):
+        code = sym
+    elif isinstance(sym, str) and len(sym) == 1:
+        code = ord(sym)
+    else:
+        raise ValueError(f"Símbolo inválido: {sym!r} (use um caractere ou byte)")
+    if not 0 <= code < 256:
+        raise ValueError(f"Símbolo fora da faixa de um byte: {sym!r}")
+    return code
+
+
+def as_bytes(data: Input) -> Union[bytes, bytearray, memoryview, None]:
+    """Normaliza a entrada para um objeto de bytes.
+
+    Cadeias ``str`` são codificadas em latin-1; se houver caracteres fora
+    dessa faixa (portanto fora de qualquer alfabeto de bytes) retorna ``None``.
+    """
+    if isinstance(data, str):
+        try:
+            return data.encode('latin-1')
+        except UnicodeEncodeError:
+            return None
+    if isinstance(data, memoryview) and (data.format != 'B' or data.ndim != 1):
+        return data.cast('B')
+    return data
+
+
+def _fast_table(table: Sequence[int]) -> Sequence[int]:
+    # cópia em lista para o laço interno (indexação de list é a mais rápida),
+    # exceto para tabelas grandes já mapeadas em memória
+    if isinstance(table, memoryview) and len(table) > LIST_COPY_LIMIT:
+        return table
+    return list(table)
+
+
+def _merge_columns(alphabet: bytes, table: Sequence[int], n: int) -> Tuple[bytes, array]:
+    """``(classmap, tabela)`` de um alfabeto com os 256 bytes.
+
+    Com um símbolo por classe seriam necessárias as classes 1..256, e 256
+    não cabe num byte do ``classmap``. Bytes com a mesma coluna em todos os
+    estados passam a dividir uma classe. A coluna 0 original (fora do
+    alfabeto) é mantida: na posição 0 se houver no máximo 255 classes; se
+    todas as 256 colunas forem distintas, as classes são 0..255 e ela vira
+    a coluna 256 (``foreign``), que nenhum byte alcança.
+    """
+    stride = len(alphabet) + 1
+    columns = [tuple(table[c::stride]) for c in range(stride)]
+    distinct = list(dict.fromkeys(columns[1:]))
+    if len(distinct) < 256:
+        kept, first = [columns[0]] + distinct, 1
+    else:
+        kept, first = distinct + [columns[0]], 0
+    cls = {col: first + i for i, col in enumerate(distinct)}
+    classmap = bytearray(256)
+    for i, code in enumerate(alphabet):
+        classmap[code] = cls[columns[i + 1]]
+    width = len(kept)
+    merged = array('i', [0]) * (n * width)
+    for j, col in enumerate(kept):
+        merged[j::width] = array('i', [off // stride * width for off in col])
+    return bytes(classmap), merged
+
+
+def _text_classes(text: str, classmap: bytes, foreign: int) -> List[int]:
+    """Classes de uma ``str`` com caracteres fora de latin-1 (esses vão para ``foreign``)."""
+    return [classmap[code] if code < 256 else foreign for code in map(ord, text)]
+
+
+def chunk_bounds(size: int, chunks: int) -> List[int]:
+    """Posições finais dos pedaços em que ``chunk_maps`` divide ``size`` bytes.
+
+    São ``min(chunks, size)`` pedaços de mesmo tamanho (pelo menos um); o
+    resto da divisão fica no último.
+    """
+    count = max(1, min(chunks, size))
+    width = size // count
+    return [k * width for k in range(1, count)] + [size]
+
+
+def compose_maps(maps):
+    """Compõe mapas de transição consecutivos (varredura de prefixos inclusiva).
+
+    ``maps[i][q]`` é o estado após o pedaço ``i`` partindo de ``q``; o
+    resultado ``p`` tem ``p[i][q]`` = estado após os pedaços ``0..i``. Com
+    NumPy usa a varredura de Hillis-Steele (``log2`` passos de
+    ``take_along_axis`` sobre todos os pedaços) e retorna uma matriz; sem
+    NumPy, compõe em sequência e retorna uma lista de listas.
+    """
+    np = _numpy()
+    if np is not None:
+        prefix = np.array(maps, dtype=np.int64)
+        d = 1
+        while d < len(prefix):
+            prefix[d:] = np.take_along_axis(prefix[d:], prefix[:-d], axis=1)
+            d *= 2
+        return prefix
+    prefix: List[List[int]] = []
+    for m in maps:
+        prefix.append(list(m) if not prefix else [m[q] for q in prefix[-1]])
+    return prefix
+
+
+class DFA:
+    """AFD compilado em tabela densa de transições.
+
+    Parâmetros:
+    - ``states``: nomes dos estados (qualquer valor hashable);
+    - ``alphabet``: símbolos aceitos (``str`` de caracteres ou ``bytes``);
+    - ``transitions``: dicionário ``(estado, símbolo) -> estado``;
+    - ``start``: estado inicial;
+    - ``accepting``: conjunto de estados de aceitação.
+    """
+
+    def __init__(self, states: Iterable[Hashable], alphabet: Union[str, bytes, Iterable],
+                 transitions: Dict[Tuple[Hashable, Union[str, int]], Hashable],
+                 start: Hashable, accepting: Iterable[Hashable]):
+        names: List[Hashable] = list(states)
+        index = {name: i for i, name in enumerate(names)}
+        if len(index) != len(names):
+            raise ValueError("Estados repetidos na definição do AFD")
+        if start not in index:
+            raise ValueError(f"Estado inicial desconhecido: {start!r}")
+        codes = bytes(_symbol_code(c) for c in alphabet)
+        if len(set(codes)) != len(codes):
+            raise ValueError("Símbolos repetidos no alfabeto")
+
+        dead = len(names)
+        stride = len(codes) + 1
+        rows = [[dead] * stride for _ in range(dead + 1)]
+        cls = {code: i + 1 for i, code in enumerate(codes)}
+        for (src, sym), dst in transitions.items():
+            if src not in index or dst not in index:
+                raise ValueError(f"Transição com estado desconhecido: {src!r} -> {dst!r}")
+            code = _symbol_code(sym)
+            if code not in cls:
+                raise ValueError(f"Símbolo fora do alfabeto: {sym!r}")
+            rows[index[src]][cls[code]] = index[dst]
+
+        flags = bytearray(dead + 1)
+        for name in accepting:
+            if name not in index:
+                raise ValueError(f"Estado de aceitação desconhecido: {name!r}")
+            flags[index[name]] = 1
+
+        table = array('i', (dst * stride for row in rows for dst in row))
+        self._init_compiled(codes, table, index[start], bytes(flags), names + [None])
+
+    @classmethod
+    def from_table(cls, alphabet: bytes, table: Sequence[int], start: int,
+                   accepting: Sequence[int], names: Optional[List[Hashable]] = None,
+                   classmap: Optional[bytes] = None) -> 'DFA':
+        """Constrói o AFD diretamente da forma compilada.
+
+        ``table`` contém deslocamentos (``indice * stride``, com
+        ``stride = len(alphabet) + 1``) e ``accepting`` uma flag por estado.
+        O estado morto não é inserido automaticamente: a coluna 0 da tabela
+        deve levar a algum estado não aceitador. Com ``classmap`` (classe de
+        cada byte, como em ``self.classmap``), a tabela tem uma coluna por
+        classe em vez de uma por símbolo.
+        """
+        alphabet = bytes(alphabet)
+        n = len(accepting)
+        if classmap is None:
+            if len(table) != n * (len(alphabet) + 1):
+                raise ValueError("Tabela com tamanho incompatível com estados e alfabeto")
+        elif len(classmap) != 256 or not n or len(table) % n or max(classmap) >= len(table) // n:
+            raise ValueError("Tabela com tamanho incompatível com estados e classes")
+        self = cls.__new__(cls)
+        self._init_compiled(alphabet, table, start, bytes(accepting),
+                            names if names is not None else list(range(n)), classmap)
+        return self
+
+    def _init_compiled(self, alphabet: bytes, table: Sequence[int], start: int,
+                       accepting: bytes, names: List[Hashable],
+                       classmap: Optional[bytes] = None) -> None:
+        if classmap is None:
+            if len(alphabet) == 256:
+                classmap, table = _merge_columns(alphabet, table, len(accepting))
+            else:
+                classmap = bytearray(256)
+                for i, code in enumerate(alphabet):
+                    classmap[code] = i + 1
+        self.alphabet = alphabet
+        self.stride = len(table) // len(accepting)
+        # coluna dos símbolos fora do alfabeto (só deixa de ser 0 com 256 classes)
+        self.foreign = self.stride - 1 if self.stride > 256 else 0
+        self.table = table
+        self.start = start
+        self.accepting = accepting
+        self.names = names
+        self.classmap = bytes(classmap)
+        self._fast = _fast_table(table)
+
+    @property
+    def n_states(self) -> int:
+        return len(self.accepting)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_fast', None)
+        if not isinstance(state['table'], array):
+            state['table'] = array('i', state['table'])
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._fast = _fast_table(self.table)
+
+    def next_state(self, state: int, symbol: Union[str, int]) -> int:
+        """Retorna o índice do estado alcançado a partir de ``state`` lendo ``symbol``."""
+        code = _symbol_code(symbol)
+        return self._fast[state * self.stride + self.classmap[code]] // self.stride
+
+    def sink_state(self) -> Optional[int]:
+        """Estado morto de fato: não aceitador e com todas as colunas levando a si mesmo.
+
+        None se não houver (por exemplo, no AFD de ``AhoCorasick``, em que a
+        classe 0 volta à raiz). Calculado na primeira chamada.
+        """
+        if '_sink' not in self.__dict__:
+            t, stride = self._fast, self.stride
+
+            def is_sink(q: int) -> bool:
+                off = q * stride
+                return not self.accepting[q] and all(x == off for x in t[off:off + stride])
+
+            guess = t[self.start * stride + self.foreign] // stride
+            self._sink = guess if is_sink(guess) else next(
+                (q for q in range(self.n_states) if is_sink(q)), None)
+        return self._sink
+
+    def run(self, data: Input, state: Optional[int] = None) -> int:
+        """Processa ``data`` e retorna o índice do estado final.
+
+        Aceita ``str``, ``bytes``, ``bytearray`` e ``memoryview`` (inclusive
+        de ``mmap``); a entrada é traduzida em blocos, sem criar um objeto
+        por caractere. ``state`` permite retomar a partir de um estado.
+        Caracteres de uma ``str`` fora de latin-1 seguem a coluna ``foreign``.
+        """
+        off = (self.start if state is None else state) * self.stride
+        buf = as_bytes(data)
+        t = self._fast
+        classmap = self.classmap
+        if buf is None:
+            for c in _text_classes(data, classmap, self.foreign):
+                off = t[off + c]
+            return off // self.stride
+        n = len(buf)
+        if n <= BLOCK_SIZE and isinstance(buf, (bytes, bytearray)):
+            for c in buf.translate(classmap):
+                off = t[off + c]
+            return off // self.stride
+        for i in range(0, n, BLOCK_SIZE):
+            for c in bytes(buf[i:i + BLOCK_SIZE]).translate(classmap):
+                off = t[off + c]
+        return off // self.stride
+
+    def accepts(self, data: Input) -> bool:
+        """Retorna True se o AFD aceita ``data``."""
+        return self.accepting[self.run(data)] == 1
+
+    def accepts_lines(self, data: Input) -> List[bool]:
+        """Vereditos de cada linha de ``data`` (separadas por ``\\n``), em um único laço.
+
+        Evita criar um objeto por linha: o bloco inteiro é traduzido de uma
+        vez, com ``\\n`` numa classe própria que registra o veredito e
+        volta ao estado inicial. Se ``\\n`` pertence ao alfabeto (ou o
+        alfabeto é grande demais para a classe extra), divide as linhas.
+        """
+        buf = as_bytes(data)
+        if buf is None or 10 in self.alphabet or self.stride > 255:
+            lines = (data.split('\n') if isinstance(data, str) else bytes(buf).split(b'\n'))
+            return [self.accepts(line) for line in lines]
+        stride = self.stride
+        classmap = bytearray(self.classmap)
+        classmap[10] = stride
+        t, flags = self._fast, self.accepting
+        start = off = self.start * stride
+        out = []
+        append = out.append
+        for i in range(0, len(buf), BLOCK_SIZE):
+            for c in bytes(buf[i:i + BLOCK_SIZE]).translate(classmap):
+                if c == stride:
+                    append(flags[off // stride] == 1)
+                    off = start
+                else:
+                    off = t[off + c]
+        append(flags[off // stride] == 1)
+        return out
+
+    def chunk_maps(self, data: Input, chunks: int = SCAN_CHUNKS):
+        """Mapas de transição dos pedaços de ``data`` (veja ``chunk_bounds``).
+
+        A linha ``i`` do resultado diz, para cada estado de partida, o estado
+        ao fim do pedaço ``i``. Com NumPy, os pedaços avançam juntos: cada
+        passo aplica a tabela a uma matriz ``pedaços x estados``; sem NumPy,
+        cada pedaço é executado a partir de cada estado. Os mapas não
+        dependem uns dos outros e podem ser calculados em processos
+        diferentes (``parallel.dfa_scan_file``).
+        """
+        stride, n = self.stride, self.n_states
+        buf = as_bytes(data)
+        if buf is None:
+            return [[self.run(data, q) for q in range(n)]]
+        bounds = chunk_bounds(len(buf), chunks)
+        np = _numpy()
+        if np is None:
+            return [[self.run(buf[lo:hi], q) for q in range(n)]
+                    for lo, hi in zip([0] + bounds[:-1], bounds)]
+        count = len(bounds)
+        width = bounds[0] if count > 1 else 0
+        table = np.asarray(self.table, dtype=np.int64)
+        # linha q = deslocamentos dos pedaços que partiram do estado q
+        cur = np.repeat(np.arange(n, dtype=np.int64) * stride, count).reshape(n, count)
+        idx = np.empty_like(cur)
+        band = max(1, SCAN_BLOCK // count)
+        for j in range(0, width, band):
+            b = min(band, width - j)
+            block = b''.join([bytes(buf[k * width + j:k * width + j + b]) for k in range(count)])
+            columns = np.frombuffer(block.translate(self.classmap), dtype=np.uint8)
+            for col in columns.reshape(count, b).T.copy():
+                np.add(cur, col, out=idx)
+                np.take(table, idx, out=cur)
+        # o restante da divisão pertence só ao último pedaço
+        last = cur[:, -1].copy()
+        for c in bytes(buf[count * width:]).translate(self.classmap):
+            last = table[last + c]
+        cur[:, -1] = last
+        return (cur // stride).T.copy()
+
+    def run_scan(self, data: Input, chunks: int = SCAN_CHUNKS, boundaries: bool = False):
+        """Como ``run``, mas pela composição dos mapas de ``chunk_maps``.
+
+        Com ``boundaries=True`` retorna ``(estado final, [(posição, estado),
+        ...])`` com o estado ao fim de cada pedaço.
+        """
+        buf = as_bytes(data)
+        if buf is None:
+            final = self.run(data)
+            return (final, [(len(data), final)]) if boundaries else final
+        prefix = compose_maps(self.chunk_maps(buf, chunks))
+        states = [int(p[self.start]) for p in prefix]
+        if boundaries:
+            return states[-1], list(zip(chunk_bounds(len(buf), chunks), states))
+        return states[-1]
+
+    def run_traced(self, data: Input, stats: 'Stats', state: Optional[int] = None) -> int:
+        """Como ``run``, registrando passos e transições em ``stats``.
+
+        Laço separado do de ``run``, que não paga nada pela instrumentação.
+        As configurações amostradas são ``(estado, posição)``.
+        """
+        stride = self.stride
+        counts = stats.begin(self, len(self.table), stride, self._transition_label)
+        off = (self.start if state is None else state) * stride
+        buf = as_bytes(data)
+        if buf is None:
+            blocks = [(0, _text_classes(data, self.classmap, self.foreign))]
+        else:
+            blocks = ((i, bytes(buf[i:i + BLOCK_SIZE]).translate(self.classmap))
+                      for i in range(0, len(buf), BLOCK_SIZE))
+        t, names = self._fast, self.names
+        every = stats.sample_every
+        steps = stats.steps
+        for i, block in blocks:
+            for pos, c in enumerate(block, i + 1):
+                key = off + c
+                counts[key] += 1
+                off = t[key]
+                steps += 1
+                if every and steps % every == 0:
+                    stats.sample(steps, (names[off // stride], pos))
+        stats.steps = steps
+        return off // stride
+
+    def _transition_label(self, key: int) -> Tuple[Hashable, Optional[str]]:
+        """``(estado, símbolo)`` de uma célula da tabela (símbolo None = fora do alfabeto)."""
+        q, c = divmod(key, self.stride)
+        if c == self.foreign or c not in self.classmap:
+            return self.names[q], None
+        return self.names[q], chr(self.classmap.index(c))
+
+    def reachable(self) -> List[int]:
+        """Índices dos estados alcançáveis a partir do inicial (em ordem de BFS)."""
+        t, stride = self._fast, self.stride
+        order = [self.start]
+        seen = {self.start}
+        for q in order:
+            for off in t[q * stride:(q + 1) * stride]:
+                r = off // stride
+                if r not in seen:
+                    seen.add(r)
+                    order.append(r)
+        return order
+
+    def minimize(self) -> 'DFA':
+        """Retorna o AFD mínimo equivalente (refinamento de partições de Hopcroft).
+
+        Estados inalcançáveis são descartados antes. A partição inicial
+        separa aceitadores de não aceitadores; cada bloco retirado da lista
+        de trabalho divide os blocos que têm predecessores nele, e do par
+        resultante só o menor volta à lista, o que dá O(k·n log n).
+        """
+        stride = self.stride
+        t = self._fast
+        states = self.reachable()
+        local = {q: i for i, q in enumerate(states)}
+        n = len(states)
+        succ = [[local[off // stride] for off in t[q * stride:(q + 1) * stride]] for q in states]
+        inverse: List[List[List[int]]] = [[[] for _ in range(n)] for _ in range(stride)]
+        for q, row in enumerate(succ):
+            for c, r in enumerate(row):
+                inverse[c][r].append(q)
+
+        acc = [q for q in range(n) if self.accepting[states[q]]]
+        rej = [q for q in range(n) if not self.accepting[states[q]]]
+        blocks = [set(b) for b in (acc, rej) if b]
+        block_of = [0] * n
+        for b, members in enumerate(blocks):
+            for q in members:
+                block_of[q] = b
+        work = [min(range(len(blocks)), key=lambda b: len(blocks[b]))] if len(blocks) > 1 else []
+        in_work = set(work)
+
+        while work:
+            b0 = work.pop()
+            in_work.discard(b0)
+            splitter = list(blocks[b0])
+            for c in range(stride):
+                inv = inverse[c]
+                touched: Dict[int, List[int]] = {}
+                for r in splitter:
+                    for q in inv[r]:
+                        touched.setdefault(block_of[q], []).append(q)
+                for b, qs in touched.items():
+                    if len(qs) == len(blocks[b]):
+                        continue
+                    new = len(blocks)
+                    moved = set(qs)
+                    blocks[b] -= moved
+                    blocks.append(moved)
+                    for q in qs:
+                        block_of[q] = new
+                    if b in in_work or len(moved) <= len(blocks[b]):
+                        work.append(new)
+                        in_work.add(new)
+                    else:
+                        work.append(b)
+                        in_work.add(b)
+
+        table = array('i')
+        flags = bytearray(len(blocks))
+        for b, members in enumerate(blocks):
+            rep = next(iter(members))
+            table.extend(block_of[r] * stride for r in succ[rep])
+            flags[b] = self.accepting[states[rep]]
+        return DFA.from_table(self.alphabet, table, block_of[local[self.start]], flags,
+                              classmap=self.classmap)
+
+    def accepts_batch(self, strings: Iterable[Input]):
+        """Classifica várias cadeias avançando todas juntas pela tabela.
+
+        As cadeias são concatenadas em um buffer NumPy indexado por
+        deslocamentos; a ordem de processamento é por tamanho decrescente,
+        de modo que as cadeias ainda ativas formam sempre um prefixo, e cada
+        passo aplica a tabela a todas de uma vez. Retorna um
+        ``numpy.ndarray`` de ``bool``; sem NumPy instalado, retorna uma
+        lista de ``bool`` calculada cadeia a cadeia.
+        """
+        np = _numpy()
+        strings = strings if isinstance(strings, list) else list(strings)
+        if np is None:
+            return [self.accepts(s) for s in strings]
+        result = np.zeros(len(strings), dtype=bool)
+        table = np.asarray(self.table, dtype=np.int64)
+        accepting = np.frombuffer(self.accepting, dtype=np.uint8).astype(bool)
+        for lo in range(0, len(strings), BATCH_STRINGS):
+            finals = self._run_batch(np, table, strings[lo:lo + BATCH_STRINGS])
+            result[lo:lo + len(finals)] = accepting[finals]
+        return result
+
+    def _pack(self, np, strings: list):
+        """Concatena ``strings`` em um único buffer de bytes.
+
+        Retorna ``(buffer, tamanhos, inválidas)``, onde ``inválidas`` lista as
+        posições de cadeias ``str`` com caracteres fora de latin-1. Lotes
+        homogêneos (só ``str`` ou só objetos de bytes) são unidos em C.
+        """
+        try:
+            lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+            try:
+                return ''.join(strings).encode('latin-1'), lengths, []
+            except TypeError:
+                return b''.join(strings), lengths, []
+        except (TypeError, UnicodeEncodeError):
+            pass
+        items = [as_bytes(s) for s in strings]
+        invalid = [i for i, b in enumerate(items) if b is None]
+        for i in invalid:
+            items[i] = b''
+        lengths = np.fromiter(map(len, items), dtype=np.int64, count=len(items))
+        return b''.join(items), lengths, invalid
+
+    def _run_batch(self, np, table, strings: list):
+        """Retorna o índice do estado final de cada cadeia de ``strings``."""
+        buf, lengths, invalid = self._pack(np, strings)
+        classes = np.frombuffer(buf.translate(self.classmap), dtype=np.uint8)
+        offsets = np.zeros(len(strings), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        order = np.argsort(-lengths, kind='stable')
+        sorted_lengths = lengths[order]
+        starts = offsets[order]
+
+        states = np.full(len(strings), self.start * self.stride, dtype=np.int64)
+        # ``active`` = número de cadeias com tamanho > j (um prefixo, pela ordenação)
+        j = 0
+        active = int(np.count_nonzero(sorted_lengths))
+        while active > BATCH_SCALAR_TAIL:
+            head = states[:active]
+            head[:] = table[head + classes[starts[:active] + j]]
+            j += 1
+            active = int(np.searchsorted(-sorted_lengths, -j, side='left'))
+        finals = states // self.stride
+        for k in range(active):
+            pos = int(starts[k])
+            finals[k] = self.run(buf[pos + j:pos + int(sorted_lengths[k])], int(finals[k]))
+
+        out = np.empty(len(strings), dtype=np.int64)
+        out[order] = finals
+        for i in invalid:
+            out[i] = self.run(strings[i])
+        return out
@@ -3,14 +3,28 @@
 Este módulo contém:
 - respostas objetivas das questões (funções que retornam a letra correta);
 - implementações demonstrativas:
-  - DFA que aceita cadeias com número par de 'a' (alfabeto {a,b});
-  - PDA simples que reconhece a^n b^n (n>=0);
-  - Simulador minimal de Máquina de Turing para incrementar número binário na fita.
-
-As implementações são educacionais e não otimizadas.
+  - DFA que aceita cadeias com número par de 'a' (alfabeto {a,b}), construído
+    sobre o motor genérico orientado a tabela de `src.dfa`;
+  - PDA determinístico que reconhece a^n b^n (n>=0), sobre o motor de `src.pda`;
+  - Máquina de Turing que incrementa um número binário na fita, executada pelo
+    motor genérico de `src.tm` (o `SimpleTMSimulator` original é mantido
+    como referência didática).
+
+As implementações são educacionais; os motores genéricos ficam em módulos
+próprios do pacote `src`. Cada autômato é construído (e seu motor importado)
+só no primeiro uso — `get_even_a_dfa()`, `get_an_bn_pda()`,
+`get_increment_tm()`, também acessíveis como `EVEN_A_DFA`, `AN_BN_PDA` e
+`INCREMENT_TM` —, o que mantém rápida a partida de `python -m src`.
 """
 
-from typing import List, Tuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .dfa import DFA, Input
+    from .instrument import Stats
+    from .pda import DPDA
+    from .tm import TuringMachine
 
 
 ## Respostas objetivas (funções que retornam a letra correta)
@@ -56,43 +70,76 @@ def q10() -> str:
 
 ## Exemplos algorítmicos
 
-def dfa_even_a(s: str) -> bool:
+@lru_cache(maxsize=None)
+def get_even_a_dfa() -> 'DFA':
+    """AFD do exercício: estado 'par' (inicial e de aceitação) e 'impar'."""
+    from .dfa import DFA
+    return DFA(
+        states=('par', 'impar'),
+        alphabet='ab',
+        transitions={
+            ('par', 'a'): 'impar',
+            ('par', 'b'): 'par',
+            ('impar', 'a'): 'par',
+            ('impar', 'b'): 'impar',
+        },
+        start='par',
+        accepting={'par'},
+    )
+
+
+def dfa_even_a(s: 'Input', stats: Optional['Stats'] = None) -> bool:
     """
     DFA que aceita cadeias sobre {a,b} onde o número de 'a' é par.
     Retorna True se aceita, False caso contrário (inclui símbolo inválido).
+    Aceita `str`, `bytes` ou `memoryview`. Com `stats` (um
+    `src.instrument.Stats`), a execução é instrumentada.
     """
-    state = 0  # 0 = par, 1 = impar
-    for ch in s:
-        if ch == 'a':
-            state ^= 1
-        elif ch == 'b':
-            pass
-        else:
-            # símbolo inválido para o alfabeto {a,b}
-            return False
-    return state == 0
-
-
-def pda_an_bn(s: str) -> bool:
+    dfa = get_even_a_dfa()
+    if stats is not None:
+        return dfa.accepting[dfa.run_traced(s, stats)] == 1
+    return dfa.accepts(s)
+
+
+def dfa_even_a_batch(strings):
+    """Versão em lote de `dfa_even_a`: retorna um array NumPy de bool."""
+    return get_even_a_dfa().accepts_batch(strings)
+
+
+@lru_cache(maxsize=None)
+def get_an_bn_pda() -> 'DPDA':
+    """APD do exercício: empilha um 'A' por 'a' e desempilha um por 'b'.
+
+    'Z' marca o fundo da pilha. Aceita por estado final ('q0' para a cadeia
+    vazia).
     """
-    PDA determinístico simples que aceita a^n b^n (n >= 0).
+    from .pda import DPDA
+    return DPDA(
+        states=('q0', 'q1', 'q2', 'q3'),
+        input_alphabet='ab',
+        stack_alphabet=('Z', 'A'),
+        transitions={
+            ('q0', 'a', 'Z'): ('q1', 'AZ'),
+            ('q1', 'a', 'A'): ('q1', 'AA'),
+            ('q1', 'b', 'A'): ('q2', ''),
+            ('q2', 'b', 'A'): ('q2', ''),
+            ('q2', '', 'Z'): ('q3', 'Z'),
+        },
+        start='q0',
+        start_stack='Z',
+        accepting={'q0', 'q3'},
+    )
+
+
+def pda_an_bn(s: 'Input', stats: Optional['Stats'] = None) -> bool:
+    """
+    PDA determinístico que aceita a^n b^n (n >= 0).
     Aceita somente cadeias na forma a...ab...b com mesmo número de a's e b's.
+    Com `stats`, registra passos, transições e altura máxima da pilha.
     """
-    # contar 'a's no prefixo, depois consumir com 'b's
-    i = 0
-    n = len(s)
-    count_a = 0
-    # contar prefixo de 'a'
-    while i < n and s[i] == 'a':
-        count_a += 1
-        i += 1
-    # agora devem vir exatamente count_a símbolos 'b'
-    count_b = 0
-    while i < n and s[i] == 'b':
-        count_b += 1
-        i += 1
-    # aceito se consumi toda a string e counts iguais
-    return i == n and count_a == count_b
+    if stats is not None:
+        return get_an_bn_pda().accepts_traced(s, stats)
+    return get_an_bn_pda().accepts(s)
 
 
 class SimpleTMSimulator:
@@ -132,15 +179,54 @@ class SimpleTMSimulator:
         return ''.join(self.tape)
 
 
-def tm_increment_binary(bin_str: str) -> str:
+@lru_cache(maxsize=None)
+def get_increment_tm() -> 'TuringMachine':
+    """MT do incremento: 'seek' vai até o branco após o último bit; 'carry'
+    volta trocando 1 por 0 até achar um 0 (ou o branco à esquerda) e escrever 1.
+    """
+    from .tm import TuringMachine
+    return TuringMachine(
+        states=('seek', 'carry', 'done'),
+        tape_alphabet='01_',
+        transitions={
+            ('seek', '0'): ('seek', '0', 'R'),
+            ('seek', '1'): ('seek', '1', 'R'),
+            ('seek', '_'): ('carry', '_', 'L'),
+            ('carry', '1'): ('carry', '0', 'L'),
+            ('carry', '0'): ('done', '1', 'S'),
+            ('carry', '_'): ('done', '1', 'S'),
+        },
+        start='seek',
+        accepting={'done'},
+    )
+
+
+def tm_increment_binary(bin_str: str, stats: Optional['Stats'] = None) -> str:
     """
-    Interface simples para incrementar uma string binária usando o simulador.
-    Aceita apenas '0'/'1' na entrada.
+    Incrementa uma string binária executando `INCREMENT_TM` no motor de MT
+    (em macro-passos: cada carreira de bits iguais é percorrida de uma vez).
+    Aceita apenas '0'/'1' na entrada. Com `stats`, executa passo a passo
+    registrando passos, transições e células visitadas da fita.
     """
-    if any(c not in '01' for c in bin_str):
+    if not set(bin_str) <= set('01'):
         raise ValueError("Entrada deve conter apenas '0' e '1'")
-    sim = SimpleTMSimulator(bin_str if bin_str != '' else '0')
-    return sim.increment()
+    if stats is not None:
+        return get_increment_tm().run_traced(bin_str or '0', stats).output()
+    return get_increment_tm().run_accelerated(bin_str if bin_str != '' else '0').output()
+
+
+_AUTOMATA = {
+    'EVEN_A_DFA': get_even_a_dfa,
+    'AN_BN_PDA': get_an_bn_pda,
+    'INCREMENT_TM': get_increment_tm,
+}
+
+
+def __getattr__(name: str):
+    """Dá acesso a `EVEN_A_DFA`, `AN_BN_PDA` e `INCREMENT_TM` (construídos no primeiro uso)."""
+    if name in _AUTOMATA:
+        return _AUTOMATA[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_description() -> str:
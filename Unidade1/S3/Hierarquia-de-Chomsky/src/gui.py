@@ -4,7 +4,10 @@ import threading
 import os
 from pathlib import Path
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+
+from src.output import FRAME_MS, OutputQueue
+from src.runner_pool import WarmPool, format_event
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -31,6 +34,11 @@ class TestRunnerGUI(tk.Tk if not TTKBOOTSTRAP_AVAILABLE else Window):
         # tamanho um pouco maior quando tema aplicado
         self.geometry('900x600')
 
+        # saída dos processos: fila esvaziada em lotes a cada FRAME_MS
+        self.output = OutputQueue()
+        # processos de teste persistentes, criados no primeiro uso
+        self.pool = None
+        self.spill_var = tk.BooleanVar(value=False)
         self.create_widgets()
         self.populate_test_list()
         # carregar automaticamente a descrição na info_box
@@ -38,6 +46,8 @@ class TestRunnerGUI(tk.Tk if not TTKBOOTSTRAP_AVAILABLE else Window):
             self.load_description()
         except Exception:
             pass
+        self.after(FRAME_MS, self.drain_output)
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
 
     def create_widgets(self):
         frame = ttk.Frame(self)
@@ -77,9 +87,12 @@ class TestRunnerGUI(tk.Tk if not TTKBOOTSTRAP_AVAILABLE else Window):
         # botões dentro do frame rolável
         ttk.Button(scrollable_frame, text='Executar selecionados', command=self.run_selected_tests).pack(fill='x', pady=2)
         ttk.Button(scrollable_frame, text='Executar todos os testes', command=self.run_all_tests).pack(fill='x', pady=2)
+        ttk.Button(scrollable_frame, text='Executar alterados', command=self.run_changed_tests).pack(fill='x', pady=2)
         ttk.Button(scrollable_frame, text='Atualizar lista', command=self.populate_test_list).pack(fill='x', pady=2)
     # botão 'Mostrar descrição' removido: descrição agora carregada automaticamente
         ttk.Button(scrollable_frame, text='Limpar saída', command=self.clear_output).pack(fill='x', pady=2)
+        ttk.Checkbutton(scrollable_frame, text='Salvar log completo em arquivo', variable=self.spill_var,
+                        command=self.toggle_spill).pack(fill='x', pady=2)
         ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', pady=6)
         ttk.Button(scrollable_frame, text='Executar exercícios', command=self.run_exercises).pack(fill='x', pady=2)
         ttk.Button(scrollable_frame, text='Abrir pasta de testes', command=self.open_tests_folder).pack(fill='x', pady=2)
@@ -179,21 +192,57 @@ class TestRunnerGUI(tk.Tk if not TTKBOOTSTRAP_AVAILABLE else Window):
             self.append_output(f'Erro ao obter descrição: {e}\n')
 
     def append_output(self, text: str):
-        def write():
-            # manter compatibilidade: escrever também em command_output
-            try:
-                self.command_output.insert(tk.END, text)
-                self.command_output.see(tk.END)
-            except Exception:
-                pass
-        self.after(0, write)
+        """Enfileira texto para `command_output` (seguro a partir de qualquer thread)."""
+        self.output.put(text)
+
+    def drain_output(self):
+        """Insere de uma vez o texto enfileirado e mantém só as últimas linhas no widget."""
+        try:
+            text = self.output.drain()
+            if text:
+                widget = self.command_output
+                follow = widget.yview()[1] >= 0.999  # rolar só se já estava no fim
+                widget.insert(tk.END, text)
+                excess = int(widget.index('end-1c').split('.')[0]) - self.output.max_lines
+                if excess > 0:
+                    widget.delete('1.0', f'{excess + 1}.0')
+                if follow:
+                    widget.see(tk.END)
+        except Exception:
+            pass
+        self.after(FRAME_MS, self.drain_output)
 
     def clear_output(self):
+        self.output.clear()
         try:
             self.command_output.delete('1.0', tk.END)
         except Exception:
             pass
 
+    def toggle_spill(self):
+        """Liga/desliga a gravação de toda a saída em um arquivo escolhido pelo usuário."""
+        if not self.spill_var.get():
+            self.output.spill_to(None)
+            return
+        path = filedialog.asksaveasfilename(title='Salvar log completo', defaultextension='.log',
+                                            filetypes=[('Log', '*.log'), ('Texto', '*.txt')])
+        if not path:
+            self.spill_var.set(False)
+            return
+        try:
+            self.output.spill_to(path)
+        except OSError as e:
+            self.spill_var.set(False)
+            messagebox.showerror('Erro', f'Não foi possível abrir o arquivo: {e}')
+            return
+        self.append_output(f'Gravando saída em {path}\n')
+
+    def on_close(self):
+        self.output.close()
+        if self.pool is not None:
+            self.pool.close()
+        self.destroy()
+
     def run_in_thread(self, cmd, cwd=None):
         def target():
             try:
@@ -213,21 +262,42 @@ class TestRunnerGUI(tk.Tk if not TTKBOOTSTRAP_AVAILABLE else Window):
         thread = threading.Thread(target=target, daemon=True)
         thread.start()
 
+    def run_in_pool(self, targets=None, changed_only=False):
+        """Executa testes nos processos persistentes, exibindo os eventos conforme chegam."""
+        if self.pool is None:
+            self.pool = WarmPool(root=ROOT)
+        if self.pool.busy:
+            messagebox.showinfo('Informação', 'Já há testes em execução')
+            return
+
+        def target():
+            try:
+                for event in self.pool.run(targets, changed_only=changed_only):
+                    text = format_event(event)
+                    if text:
+                        self.append_output(text)
+            except Exception as e:
+                self.append_output(f'Erro ao executar testes: {e}\n')
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+
     def run_selected_tests(self):
         sel = [self.test_listbox.get(i) for i in self.test_listbox.curselection()]
         if not sel:
             messagebox.showinfo('Informação', 'Nenhum teste selecionado')
             return
-        paths = [str(TESTS_DIR / s) for s in sel]
-        cmd = [sys.executable, '-m', 'pytest', '-q', *paths]
-        self.append_output(f'Executando: {" ".join(cmd)}\n')
-        self.run_in_thread(cmd, cwd=str(ROOT))
-    
+        self.append_output(f'Executando: {" ".join(sel)}\n')
+        self.run_in_pool([f'tests/{s}' for s in sel])
 
     def run_all_tests(self):
-        cmd = [sys.executable, '-m', 'pytest', '-q']
-        self.append_output(f'Executando: {" ".join(cmd)}\n')
-        self.run_in_thread(cmd, cwd=str(ROOT))
+        self.append_output('Executando todos os testes\n')
+        self.run_in_pool()
+
+    def run_changed_tests(self):
+        """Executa só os testes afetados por mudanças em `src/` desde a última execução."""
+        self.append_output('Executando testes afetados por alterações\n')
+        self.run_in_pool(changed_only=True)
 
     def run_exercises(self):
         cmd = [sys.executable, '-m', 'src.exercises']
@@ -0,0 +1,110 @@
+"""Instrumentação opcional das execuções dos motores (AFD, APD e MT).
+
+Os laços rápidos (``DFA.run``, ``DPDA.run``, ``TuringMachine.run``) não
+têm nenhum teste de depuração por passo. A instrumentação usa variantes
+separadas — ``DFA.run_traced``, ``DPDA.run_traced``/``accepts_traced`` e
+``TuringMachine.run_traced`` — que recebem um ``Stats`` e preenchem:
+
+- ``steps``: passos executados (símbolos lidos, transições ε incluídas no APD);
+- ``transitions``: contagem por célula da tabela do motor (``array('Q')``,
+  mesmo índice da tabela compilada); ``hot_transitions`` as traduz para
+  ``(estado, símbolo...)``; ``state_visits`` soma as contagens por estado;
+- ``max_stack``: maior altura de pilha (APD);
+- ``tape_low``/``tape_high``: posições extremas visitadas por cada cabeça (MT);
+- ``samples``: configurações amostradas a cada ``sample_every`` passos, como
+  ``(passo, configuração)``, também entregues a ``callback``, se houver.
+
+Um mesmo ``Stats`` pode acumular várias execuções do mesmo motor (por
+exemplo, blocos sucessivos de uma entrada em fluxo).
+"""
+
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Limite padrão de configurações guardadas em ``Stats.samples``.
+MAX_SAMPLES = 10_000
+
+
+class Stats:
+    """Métricas de uma ou mais execuções instrumentadas.
+
+    ``sample_every`` é o intervalo de amostragem em passos (0 desliga);
+    com ``callback`` e sem intervalo, toda configuração é amostrada.
+    ``callback(passo, configuração)`` é chamado a cada amostra, mesmo
+    depois de ``max_samples`` ter sido atingido.
+    """
+
+    def __init__(self, sample_every: int = 0, callback: Optional[Callable[[int, Any], None]] = None,
+                 max_samples: int = MAX_SAMPLES):
+        if sample_every < 0:
+            raise ValueError("sample_every deve ser não negativo")
+        self.sample_every = sample_every or (1 if callback is not None else 0)
+        self.callback = callback
+        self.max_samples = max_samples
+        self.steps = 0
+        self.transitions: Optional[array] = None
+        self.max_stack = 0
+        # None até a primeira posição registrada da fita
+        self.tape_low: List[Optional[int]] = []
+        self.tape_high: List[Optional[int]] = []
+        self.samples: List[Tuple[int, Any]] = []
+        self._row = 1
+        self._label: Callable[[int], Tuple] = lambda key: (key,)
+        self._engine = None
+
+    def begin(self, engine, size: int, row: int, label: Callable[[int], Tuple]) -> array:
+        """Prepara as contagens para ``engine`` (chamado pelos motores)."""
+        if self._engine is not None and self._engine is not engine:
+            raise ValueError("Stats já está associado a outro autômato")
+        if self.transitions is None:
+            self.transitions = array('Q', bytes(8 * size))
+        self._engine = engine
+        self._row = row
+        self._label = label
+        return self.transitions
+
+    def sample(self, step: int, config: Any) -> None:
+        if len(self.samples) < self.max_samples:
+            self.samples.append((step, config))
+        if self.callback is not None:
+            self.callback(step, config)
+
+    def touch(self, tape: int, low: int, high: int) -> None:
+        """Registra as posições extremas ``low``/``high`` da cabeça ``tape``."""
+        while len(self.tape_low) <= tape:
+            self.tape_low.append(None)
+            self.tape_high.append(None)
+        if self.tape_low[tape] is None:
+            self.tape_low[tape], self.tape_high[tape] = low, high
+            return
+        self.tape_low[tape] = min(self.tape_low[tape], low)
+        self.tape_high[tape] = max(self.tape_high[tape], high)
+
+    @property
+    def tape_cells(self) -> List[int]:
+        """Células visitadas por fita (marca d'água de memória da fita)."""
+        return [hi - lo + 1 if lo is not None else 0 for lo, hi in zip(self.tape_low, self.tape_high)]
+
+    @property
+    def state_visits(self) -> array:
+        """Transições disparadas a partir de cada estado (índice compilado)."""
+        counts = self.transitions if self.transitions is not None else array('Q')
+        row = self._row
+        return array('Q', (sum(counts[i:i + row]) for i in range(0, len(counts), row)))
+
+    def hot_transitions(self, k: int = 10) -> List[Tuple[Tuple, int]]:
+        """As ``k`` transições mais usadas, como ``(rótulo, contagem)``."""
+        if self.transitions is None:
+            return []
+        counts = self.transitions
+        top = sorted((i for i in range(len(counts)) if counts[i]), key=counts.__getitem__, reverse=True)
+        return [(self._label(i), counts[i]) for i in top[:k]]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'steps': self.steps,
+            'max_stack': self.max_stack,
+            'tape_cells': self.tape_cells,
+            'hot_transitions': self.hot_transitions(),
+            'samples': len(self.samples),
+        }
@@ -0,0 +1,224 @@
+"""AFN (autômato finito não determinístico) com transições vazias (ε).
+
+Conjuntos de estados do AFN são representados como *bitsets* imutáveis
+(inteiros Python: o bit ``i`` indica o estado de índice ``i``), o que torna
+união, comparação e uso como chave de dicionário operações em C.
+
+- ``NFA.accepts`` simula o AFN diretamente sobre os bitsets;
+- ``NFA.to_dfa`` faz a construção de subconjuntos sob demanda (apenas os
+  conjuntos alcançáveis), memorizando fechos-ε por estado e os conjuntos já
+  vistos, e devolve um ``DFA`` do motor orientado a tabela de ``src.dfa``
+  (por padrão já minimizado pelo algoritmo de Hopcroft), com uma coluna
+  por classe de bytes de mesmo comportamento (``NFA.byte_classes``).
+"""
+
+from array import array
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .dfa import DFA, Input, _symbol_code, as_bytes
+
+# Símbolo usado nas transições vazias.
+EPSILON = ''
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Itera sobre os índices dos bits ligados de ``bits``, do menor ao maior."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class NFA:
+    """AFN com transições ε.
+
+    Parâmetros:
+    - ``states``: nomes dos estados;
+    - ``alphabet``: símbolos de entrada (caracteres ou bytes);
+    - ``transitions``: dicionário ``(estado, símbolo) -> estados destino``,
+      com ``EPSILON`` ('') como símbolo das transições vazias;
+    - ``start``: estado inicial;
+    - ``accepting``: estados de aceitação.
+    """
+
+    def __init__(self, states: Iterable[Hashable], alphabet: Union[str, bytes, Iterable],
+                 transitions: Dict[Tuple[Hashable, Union[str, int]], Iterable[Hashable]],
+                 start: Hashable, accepting: Iterable[Hashable]):
+        names = list(states)
+        index = {name: i for i, name in enumerate(names)}
+        if len(index) != len(names):
+            raise ValueError("Estados repetidos na definição do AFN")
+        if start not in index:
+            raise ValueError(f"Estado inicial desconhecido: {start!r}")
+        codes = bytes(_symbol_code(c) for c in alphabet)
+        eps = [0] * len(names)
+        moves: List[Dict[int, int]] = [{} for _ in names]
+        for (src, sym), dsts in transitions.items():
+            if src not in index:
+                raise ValueError(f"Transição com estado desconhecido: {src!r}")
+            bits = 0
+            for dst in dsts:
+                if dst not in index:
+                    raise ValueError(f"Transição com estado desconhecido: {dst!r}")
+                bits |= 1 << index[dst]
+            if sym == EPSILON:
+                eps[index[src]] |= bits
+                continue
+            code = _symbol_code(sym)
+            if code not in codes:
+                raise ValueError(f"Símbolo fora do alfabeto: {sym!r}")
+            row = moves[index[src]]
+            row[code] = row.get(code, 0) | bits
+        accept = 0
+        for name in accepting:
+            if name not in index:
+                raise ValueError(f"Estado de aceitação desconhecido: {name!r}")
+            accept |= 1 << index[name]
+        self._init_compiled(codes, eps, moves, index[start], accept, names)
+
+    @classmethod
+    def from_arrays(cls, alphabet: bytes, eps: List[int], moves: List[Dict[int, int]],
+                    start: int, accept: int, names: Optional[List[Hashable]] = None) -> 'NFA':
+        """Constrói o AFN a partir da forma compilada (bitsets por estado)."""
+        self = cls.__new__(cls)
+        self._init_compiled(bytes(alphabet), eps, moves, start, accept,
+                            names if names is not None else list(range(len(eps))))
+        return self
+
+    def _init_compiled(self, alphabet: bytes, eps: List[int], moves: List[Dict[int, int]],
+                       start: int, accept: int, names: List[Hashable]) -> None:
+        self.alphabet = alphabet
+        self.eps = eps
+        self.moves = moves
+        self.start = start
+        self.accept = accept
+        self.names = names
+        # memória dos fechos-ε e das transições já fechadas, por estado
+        self._closure: List[Optional[int]] = [None] * len(eps)
+        self._closed_moves: List[Optional[Dict[int, int]]] = [None] * len(eps)
+        # por byte, bitset dos estados que têm alguma transição com ele
+        self._has_move: Dict[int, int] = {}
+        for i, row in enumerate(moves):
+            for code in row:
+                self._has_move[code] = self._has_move.get(code, 0) | (1 << i)
+
+    @property
+    def n_states(self) -> int:
+        return len(self.eps)
+
+    def state_set(self, bits: int) -> frozenset:
+        """Converte um bitset nos nomes dos estados correspondentes."""
+        return frozenset(self.names[i] for i in iter_bits(bits))
+
+    def closure_of(self, state: int) -> int:
+        """Fecho-ε do estado ``state`` (memorizado)."""
+        cached = self._closure[state]
+        if cached is not None:
+            return cached
+        eps = self.eps
+        bits = 1 << state
+        stack = [state]
+        while stack:
+            new = eps[stack.pop()] & ~bits
+            if new:
+                bits |= new
+                stack.extend(iter_bits(new))
+        self._closure[state] = bits
+        return bits
+
+    def closure(self, bits: int) -> int:
+        """Fecho-ε de um conjunto de estados."""
+        result = 0
+        for i in iter_bits(bits):
+            result |= self.closure_of(i)
+        return result
+
+    def closed_moves(self, state: int) -> Dict[int, int]:
+        """Transições de ``state`` por símbolo, já com o fecho-ε dos destinos."""
+        cached = self._closed_moves[state]
+        if cached is None:
+            cached = {code: self.closure(bits) for code, bits in self.moves[state].items()}
+            self._closed_moves[state] = cached
+        return cached
+
+    def start_set(self) -> int:
+        return self.closure_of(self.start)
+
+    def step(self, bits: int, code: int) -> int:
+        """Conjunto alcançado a partir de ``bits`` lendo o byte ``code``."""
+        result = 0
+        closed = self._closed_moves
+        for i in iter_bits(bits & self._has_move.get(code, 0)):
+            row = closed[i]
+            if row is None:
+                row = self.closed_moves(i)
+            result |= row[code]
+        return result
+
+    def accepts(self, data: Input) -> bool:
+        """Simula o AFN sobre ``data`` (sem construir o AFD)."""
+        buf = as_bytes(data)
+        if buf is None:
+            return False
+        bits = self.start_set()
+        for code in bytes(buf):
+            bits = self.step(bits, code)
+            if not bits:
+                return False
+        return bool(bits & self.accept)
+
+    def byte_classes(self) -> Tuple[bytes, List[Optional[int]]]:
+        """Agrupa os bytes pelas transições que têm em todos os estados.
+
+        Retorna ``(classmap, representantes)``: bytes da mesma classe levam
+        cada estado ao mesmo conjunto, e ``representantes[c]`` é um byte da
+        classe ``c`` (None na coluna dos bytes sem transição alguma, que
+        levam ao conjunto vazio). Um padrão como ``.`` ou ``[^a]`` usa os
+        256 bytes, mas só algumas classes.
+        """
+        moves = self.moves
+        keys = [tuple((i, moves[i][code]) for i in iter_bits(self._has_move.get(code, 0)))
+                for code in range(256)]
+        distinct = [key for key in dict.fromkeys(keys) if key]
+        # coluna dos bytes sem transição: 0, ou a última se as 256 classes forem vivas
+        columns = [()] + distinct if len(distinct) < 256 else distinct + [()]
+        cls = {key: c for c, key in enumerate(columns)}
+        reps: List[Optional[int]] = [None] * len(columns)
+        for code, key in enumerate(keys):
+            if key and reps[cls[key]] is None:
+                reps[cls[key]] = code
+        return bytes(cls[key] for key in keys), reps
+
+    def to_dfa(self, minimize: bool = True) -> DFA:
+        """Construção de subconjuntos sob demanda.
+
+        Só os conjuntos alcançáveis a partir do inicial são criados; cada um
+        é identificado pelo seu bitset. O conjunto vazio é o estado morto.
+        As colunas da tabela são as classes de ``byte_classes``, e não os
+        símbolos do alfabeto. Com ``minimize=False`` os nomes dos estados
+        do AFD resultante são os bitsets (use ``state_set`` para decodificá-los).
+        """
+        classmap, reps = self.byte_classes()
+        stride = len(reps)
+        sets = [0, self.start_set()]
+        seen = {0: 0, sets[1]: 1}
+        table = array('i')
+        i = 0
+        while i < len(sets):
+            members = [self.closed_moves(q) for q in iter_bits(sets[i])]
+            for code in reps:
+                if code is None:
+                    table.append(0)  # sem transição -> estado morto
+                    continue
+                target = 0
+                for row in members:
+                    target |= row.get(code, 0)
+                j = seen.get(target)
+                if j is None:
+                    j = seen[target] = len(sets)
+                    sets.append(target)
+                table.append(j * stride)
+            i += 1
+        accepting = bytes(1 if s & self.accept else 0 for s in sets)
+        dfa = DFA.from_table(self.alphabet, table, 1, accepting, names=sets, classmap=classmap)
+        return dfa.minimize() if minimize else dfa
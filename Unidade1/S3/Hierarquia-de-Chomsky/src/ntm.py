@@ -0,0 +1,326 @@
+"""Máquina de Turing não determinística (uma fita) e exploração de configurações.
+
+Cada configuração pode ter várias sucessoras; ``NTM.explore`` percorre o
+grafo de configurações em largura (``'bfs'``) ou por aprofundamento
+iterativo (``'iddfs'``) até achar um estado de aceitação, esgotar todos os
+ramos (rejeição) ou estourar um orçamento de passos, memória ou ramos.
+
+Ramificar não copia a fita. Ela é um *zíper* persistente de pedaços
+imutáveis de ``CHUNK`` células: o pedaço sob a cabeça e duas listas
+encadeadas com os pedaços à esquerda e à direita (o mais próximo primeiro).
+Escrever cria um novo pedaço (cópia de ``CHUNK`` bytes) e atravessar uma
+fronteira empilha/desempilha um pedaço; o resto é compartilhado entre
+todos os ramos. Pedaços e células das listas são *hash-consed* num
+``TapeStore`` (conteúdo igual => mesmo id inteiro) e os pedaços ficam
+alinhados em posições absolutas múltiplas de ``CHUNK``, sem pedaços em
+branco no fim das listas. Assim cada configuração é uma tupla de cinco
+inteiros ``(estado, cabeça, esquerda, pedaço, direita)``, com igualdade e
+hash em O(1), e configurações iguais alcançadas por caminhos diferentes
+são visitadas uma única vez.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from .tm import BLANK, MOVES
+
+# Células por pedaço de fita (custo da cópia ao escrever).
+CHUNK = 32
+
+# Profundidade da primeira rodada do aprofundamento iterativo (dobra a cada rodada).
+IDDFS_DEPTH = 16
+
+Config = Tuple[int, int, int, int, int]
+
+
+class TapeStore:
+    """Pedaços de fita e células de lista persistentes, ambos com ids únicos por conteúdo.
+
+    O pedaço 0 é o pedaço em branco e a célula 0 é a lista vazia (cuja
+    "cabeça" é o pedaço em branco, de modo que desempilhar da lista vazia
+    produz fita em branco).
+    """
+
+    def __init__(self, chunk: int = CHUNK):
+        if chunk < 1:
+            raise ValueError("chunk deve ser positivo")
+        self.chunk = chunk
+        blank = bytes(chunk)
+        self.chunks: List[bytes] = [blank]
+        self._chunk_ids: Dict[bytes, int] = {blank: 0}
+        self.heads: List[int] = [0]
+        self.tails: List[int] = [0]
+        self._cell_ids: Dict[int, int] = {}
+
+    def intern(self, data: bytes) -> int:
+        cid = self._chunk_ids.get(data)
+        if cid is None:
+            cid = self._chunk_ids[data] = len(self.chunks)
+            self.chunks.append(data)
+        return cid
+
+    def cons(self, chunk: int, tail: int) -> int:
+        if chunk == 0 and tail == 0:
+            return 0  # branco no fim da fita não é guardado (forma canônica)
+        key = tail << 32 | chunk
+        cell = self._cell_ids.get(key)
+        if cell is None:
+            cell = self._cell_ids[key] = len(self.heads)
+            self.heads.append(chunk)
+            self.tails.append(tail)
+        return cell
+
+    def items(self, cell: int) -> List[int]:
+        """Pedaços de uma lista, do mais próximo ao mais distante da cabeça."""
+        out = []
+        while cell:
+            out.append(self.heads[cell])
+            cell = self.tails[cell]
+        return out
+
+    @property
+    def size(self) -> int:
+        """Pedaços e células guardados (a memória de fita de todos os ramos)."""
+        return len(self.chunks) + len(self.heads)
+
+
+class NTMResult:
+    """Resultado de ``NTM.explore``.
+
+    ``accepted`` é ``None`` quando um orçamento acabou antes da decisão;
+    ``reason`` diz qual (``'steps'``, ``'memory'`` ou ``'branches'``).
+    ``config`` é a configuração de aceitação (ou ``None``) e ``path`` o
+    caminho até ela, quando a exploração foi feita com ``trace=True``.
+    """
+
+    def __init__(self, machine: 'NTM', store: TapeStore, accepted: Optional[bool],
+                 reason: Optional[str], config: Optional[Config], path: Optional[List[Config]],
+                 steps: int, configs: int, max_branches: int, depth: int):
+        self.machine = machine
+        self.store = store
+        self.accepted = accepted
+        self.reason = reason
+        self.config = config
+        self.path = path
+        self.steps = steps
+        self.configs = configs
+        self.max_branches = max_branches
+        self.depth = depth
+
+    @property
+    def state(self) -> Optional[Hashable]:
+        return None if self.config is None else self.machine.names[self.config[0]]
+
+    def output(self) -> str:
+        """Conteúdo da fita da configuração de aceitação, sem os brancos das pontas."""
+        if self.config is None:
+            return ''
+        return self.machine.tape_of(self.store, self.config)
+
+
+class NTM:
+    """Máquina de Turing não determinística de uma fita.
+
+    Como ``TuringMachine``, mas ``transitions`` mapeia ``(estado, lido)``
+    para um iterável de ações ``(estado, escrito, movimento)``. Um ramo
+    aceita ao entrar num estado de ``accepting`` e morre quando não há
+    ação para sua configuração; a entrada é aceita se algum ramo aceita.
+    """
+
+    def __init__(self, states: Iterable[Hashable], tape_alphabet: Union[str, Iterable[str]],
+                 transitions: Dict[Tuple[Hashable, str], Iterable[Tuple[Hashable, str, str]]],
+                 start: Hashable, accepting: Iterable[Hashable] = (), blank: str = BLANK):
+        self.names: List[Hashable] = list(states)
+        index = {name: i for i, name in enumerate(self.names)}
+        if start not in index:
+            raise ValueError(f"Estado inicial desconhecido: {start!r}")
+        symbols = [blank] + [c for c in dict.fromkeys(tape_alphabet) if c != blank]
+        if len(symbols) > 255 or any(len(c) != 1 or ord(c) > 255 for c in symbols):
+            raise ValueError("Alfabeto da fita deve ter até 255 caracteres latin-1")
+        self.symbols = symbols
+        self.blank = blank
+        sid = {c: i for i, c in enumerate(symbols)}
+        m = self.m = len(symbols)
+        encode = bytearray([255]) * 256
+        for c, i in sid.items():
+            encode[ord(c)] = i
+        self._encode = bytes(encode)
+        self._decode = bytes(ord(c) for c in symbols) + bytes(256 - m)
+
+        # ações por (estado * m + símbolo): tupla de (estado, escrito, deslocamento)
+        self.table: List[Tuple[Tuple[int, int, int], ...]] = [()] * (len(self.names) * m)
+        for (src, read), actions in transitions.items():
+            if src not in index:
+                raise ValueError(f"Transição com estado desconhecido: {src!r}")
+            try:
+                key = index[src] * m + sid[read]
+                acts = []
+                for dst, write, move in actions:
+                    if dst not in index:
+                        raise ValueError(f"Transição com estado desconhecido: {src!r} -> {dst!r}")
+                    acts.append((index[dst], sid[write], MOVES[move]))
+            except KeyError as e:
+                raise ValueError(f"Símbolo ou movimento inválido na transição: {e}") from None
+            self.table[key] = tuple(dict.fromkeys(acts))
+
+        self.start = index[start]
+        self.accepting = bytearray(len(self.names))
+        for name in accepting:
+            if name not in index:
+                raise ValueError(f"Estado de aceitação desconhecido: {name!r}")
+            self.accepting[index[name]] = 1
+
+    def encode(self, text: str) -> bytes:
+        ids = text.encode('latin-1', errors='replace').translate(self._encode)
+        if 255 in ids:
+            raise ValueError(f"Entrada com símbolo fora do alfabeto da fita: {text!r}")
+        return ids
+
+    def initial(self, store: TapeStore, text: str = '') -> Config:
+        """Configuração inicial: ``text`` a partir da posição 0, cabeça em 0."""
+        ids = self.encode(text)
+        n = store.chunk
+        pieces = [ids[i:i + n].ljust(n, b'\0') for i in range(0, max(len(ids), 1), n)]
+        right = 0
+        for piece in reversed(pieces[1:]):
+            right = store.cons(store.intern(piece), right)
+        return (self.start, 0, 0, store.intern(pieces[0]), right)
+
+    def successors(self, store: TapeStore, config: Config) -> List[Config]:
+        """Configurações alcançáveis em um passo (sem copiar a fita)."""
+        state, head, left, cur, right = config
+        n = store.chunk
+        chunk = store.chunks[cur]
+        off = head % n
+        sym = chunk[off]
+        out = []
+        for ns, w, d in self.table[state * self.m + sym]:
+            c = cur if w == sym else store.intern(chunk[:off] + bytes((w,)) + chunk[off + 1:])
+            if 0 <= off + d < n:
+                out.append((ns, head + d, left, c, right))
+            elif d > 0:
+                out.append((ns, head + 1, store.cons(c, left), store.heads[right], store.tails[right]))
+            else:
+                out.append((ns, head - 1, store.tails[left], store.heads[left], store.cons(c, right)))
+        return out
+
+    def tape_of(self, store: TapeStore, config: Config) -> str:
+        """Conteúdo da fita de ``config`` sem os brancos das pontas."""
+        _, _, left, cur, right = config
+        ids = [store.chunks[c] for c in reversed(store.items(left))]
+        ids.append(store.chunks[cur])
+        ids.extend(store.chunks[c] for c in store.items(right))
+        return b''.join(ids).strip(b'\0').translate(self._decode).decode('latin-1')
+
+    def describe(self, store: TapeStore, config: Config) -> Tuple[Hashable, int, str]:
+        """``(estado, posição da cabeça, fita)`` de uma configuração."""
+        return self.names[config[0]], config[1], self.tape_of(store, config)
+
+    def explore(self, text: str = '', strategy: str = 'bfs', max_steps: Optional[int] = None,
+                max_configs: Optional[int] = None, max_branches: Optional[int] = None,
+                trace: bool = False, chunk: int = CHUNK) -> NTMResult:
+        """Procura um ramo de aceitação a partir da entrada ``text``.
+
+        - ``strategy``: ``'bfs'`` (em largura: acha o caminho mais curto) ou
+          ``'iddfs'`` (profundidade limitada, dobrando o limite a cada rodada;
+          guarda só as configurações da rodada corrente);
+        - ``max_steps``: configurações expandidas, no total;
+        - ``max_configs``: configurações distintas guardadas (orçamento de memória);
+        - ``max_branches``: ramos vivos ao mesmo tempo (tamanho da fronteira);
+        - ``trace``: guarda o pai de cada configuração para reconstruir ``path``.
+        """
+        if strategy not in ('bfs', 'iddfs'):
+            raise ValueError("strategy deve ser 'bfs' ou 'iddfs'")
+        store = TapeStore(chunk)
+        start = self.initial(store, text)
+        if self.accepting[start[0]]:
+            return NTMResult(self, store, True, None, start, [start] if trace else None, 0, 1, 1, 0)
+        explore = self._bfs if strategy == 'bfs' else self._iddfs
+        return explore(store, start, max_steps, max_configs, max_branches, trace)
+
+    def _bfs(self, store: TapeStore, start: Config, max_steps: Optional[int],
+             max_configs: Optional[int], max_branches: Optional[int], trace: bool) -> NTMResult:
+        successors, accepting = self.successors, self.accepting
+        seen: Set[Config] = {start}
+        parents: Dict[Config, Config] = {}
+        frontier: List[Config] = [start]
+        steps = widest = depth = 0
+
+        def result(accepted, reason, config=None):
+            path = _path(parents, config) if trace and config is not None else None
+            return NTMResult(self, store, accepted, reason, config, path, steps, len(seen), widest, depth)
+
+        # nível a nível: a fronteira guarda só as configurações (a profundidade é a do nível)
+        while frontier:
+            depth += 1
+            level: List[Config] = []
+            for config in frontier:
+                if steps == max_steps:
+                    return result(None, 'steps')
+                steps += 1
+                for nxt in successors(store, config):
+                    if nxt in seen:
+                        continue
+                    if len(seen) == max_configs:
+                        return result(None, 'memory')
+                    seen.add(nxt)
+                    if trace:
+                        parents[nxt] = config
+                    if accepting[nxt[0]]:
+                        return result(True, None, nxt)
+                    level.append(nxt)
+                if max_branches is not None and len(level) > max_branches:
+                    return result(None, 'branches')
+            widest = max(widest, len(level))
+            frontier = level
+        return result(False, None)
+
+    def _iddfs(self, store: TapeStore, start: Config, max_steps: Optional[int],
+               max_configs: Optional[int], max_branches: Optional[int], trace: bool) -> NTMResult:
+        successors, accepting = self.successors, self.accepting
+        steps = widest = 0
+        limit = IDDFS_DEPTH
+        while True:
+            # profundidade mínima em que cada configuração foi vista nesta rodada
+            seen: Dict[Config, int] = {start: 0}
+            parents: Dict[Config, Config] = {}
+            stack = [(start, 0)]
+            cut = False
+
+            def result(accepted, reason, config=None, depth=0):
+                path = _path(parents, config) if trace and config is not None else None
+                return NTMResult(self, store, accepted, reason, config, path, steps, len(seen), widest, depth)
+
+            while stack:
+                config, depth = stack.pop()
+                if depth == limit:
+                    cut = True
+                    continue
+                if steps == max_steps:
+                    return result(None, 'steps')
+                steps += 1
+                for nxt in successors(store, config):
+                    if seen.get(nxt, limit + 1) <= depth + 1:
+                        continue
+                    if nxt not in seen and len(seen) == max_configs:
+                        return result(None, 'memory')
+                    seen[nxt] = depth + 1
+                    if trace:
+                        parents[nxt] = config
+                    if accepting[nxt[0]]:
+                        return result(True, None, nxt, depth + 1)
+                    stack.append((nxt, depth + 1))
+                widest = max(widest, len(stack))
+                if max_branches is not None and len(stack) > max_branches:
+                    return result(None, 'branches')
+            if not cut:
+                return result(False, None)
+            limit *= 2
+
+
+def _path(parents: Dict[Config, Config], config: Config) -> List[Config]:
+    path = [config]
+    while config in parents:
+        config = parents[config]
+        path.append(config)
+    path.reverse()
+    return path
@@ -0,0 +1,96 @@
+"""Fila de saída em lotes para a área "Comandos e Resultados" da GUI.
+
+As threads que leem processos filhos apenas chamam ``put`` (sem tocar no
+Tk); a GUI chama ``drain`` a cada ``FRAME_MS`` milissegundos e insere o
+texto acumulado de uma vez só. Como o widget guarda apenas as últimas
+``max_lines`` linhas, a fila também descarta o excesso mais antigo ainda
+não exibido, deixando um aviso no lugar. Opcionalmente, todo o texto
+recebido é gravado em disco (``spill_to``), inclusive o descartado.
+
+Este módulo não depende de Tkinter.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+# Intervalo entre esvaziamentos da fila pela GUI (ms).
+FRAME_MS = 50
+
+# Linhas mantidas no widget (buffer circular).
+MAX_LINES = 5000
+
+# Caracteres inseridos por quadro, no máximo; o restante fica para o próximo.
+MAX_CHARS_PER_FRAME = 1 << 18
+
+
+class OutputQueue:
+    """Fila thread-safe de texto com limite de linhas e gravação opcional em disco."""
+
+    def __init__(self, max_lines: int = MAX_LINES, spill_path: Optional[str] = None):
+        if max_lines < 1:
+            raise ValueError("max_lines deve ser positivo")
+        self.max_lines = max_lines
+        self._chunks: Deque[Tuple[str, int]] = deque()
+        self._pending_lines = 0
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._spill = None
+        self.spill_path: Optional[str] = None
+        if spill_path is not None:
+            self.spill_to(spill_path)
+
+    def put(self, text: str) -> None:
+        """Enfileira ``text`` (chamado de qualquer thread)."""
+        if not text:
+            return
+        lines = text.count('\n')
+        with self._lock:
+            if self._spill is not None:
+                self._spill.write(text)
+            self._chunks.append((text, lines))
+            self._pending_lines += lines
+            # o widget manteria só as últimas ``max_lines`` linhas de qualquer forma
+            while self._pending_lines > self.max_lines and len(self._chunks) > 1:
+                _, n = self._chunks.popleft()
+                self._pending_lines -= n
+                self._dropped += n
+
+    def drain(self, max_chars: int = MAX_CHARS_PER_FRAME) -> str:
+        """Retira e concatena o texto pendente (até cerca de ``max_chars``)."""
+        parts = []
+        size = 0
+        with self._lock:
+            if self._dropped:
+                parts.append(f'[... {self._dropped} linhas omitidas ...]\n')
+                self._dropped = 0
+            while self._chunks and size < max_chars:
+                text, lines = self._chunks.popleft()
+                self._pending_lines -= lines
+                parts.append(text)
+                size += len(text)
+        return ''.join(parts)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._chunks) or self._dropped > 0
+
+    def clear(self) -> None:
+        """Descarta o texto ainda não exibido (o arquivo de log não é afetado)."""
+        with self._lock:
+            self._chunks.clear()
+            self._pending_lines = 0
+            self._dropped = 0
+
+    def spill_to(self, path: Optional[str]) -> None:
+        """Passa a gravar toda a saída em ``path`` (``None`` encerra a gravação)."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            self.spill_path = path
+            if path is not None:
+                self._spill = open(path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        self.spill_to(None)
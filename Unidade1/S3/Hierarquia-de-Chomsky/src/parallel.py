@@ -0,0 +1,196 @@
+"""Avaliação paralela de autômatos em processos (contorna o GIL).
+
+``ParallelRunner`` distribui fatias de uma lista de cadeias, ou faixas de
+bytes de um arquivo, entre os processos de um ``ProcessPoolExecutor``. A
+função avaliada (``dfa_even_a``, ``pda_an_bn``, ``tm_increment_binary`` ou
+um método ligado como ``meu_dfa.accepts``) é enviada uma única vez a cada
+processo, pelo ``initializer``; as tarefas carregam só os dados — ou, no
+caso de arquivos, apenas ``(caminho, início, fim)``, e cada processo lê
+sua faixa via ``mmap``.
+
+O veredito de uma cadeia é o valor retornado pela função; conta como
+aceita se for verdadeiro. Um ``ValueError`` (entrada inválida) conta como
+rejeição, com veredito ``False``.
+
+``dfa_scan_file`` paraleliza uma única entrada longa: cada processo calcula
+o mapa de transição (``DFA.chunk_maps``) da sua faixa do arquivo e os mapas
+são compostos com ``compose_maps``.
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from .dfa import DFA, compose_maps
+
+# Cadeias por tarefa ao avaliar listas.
+ITEMS_PER_TASK = 4096
+
+# Tamanho mínimo das faixas de arquivo enviadas a cada tarefa.
+MIN_RANGE_BYTES = 1 << 20
+
+_worker_fn: Optional[Callable[[Any], Any]] = None
+_worker_binary = False
+
+
+def _init_worker(fn: Callable[[Any], Any], binary: bool) -> None:
+    global _worker_fn, _worker_binary
+    _worker_fn = fn
+    _worker_binary = binary
+
+
+def _evaluate(items: Sequence[Any], keep: bool) -> Tuple[int, int, Optional[list]]:
+    fn = _worker_fn
+    accepted = 0
+    results = [] if keep else None
+    for item in items:
+        try:
+            verdict = fn(item)
+        except ValueError:
+            verdict = False
+        if verdict:
+            accepted += 1
+        if keep:
+            results.append(verdict)
+    return accepted, len(items), results
+
+
+def _evaluate_range(path: str, start: int, end: int, keep: bool) -> Tuple[int, int, Optional[list]]:
+    """Avalia as linhas que *começam* em ``[start, end)`` do arquivo."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if start > 0:
+            nl = mm.find(b'\n', start - 1)
+            start = len(mm) if nl < 0 else nl + 1
+        lines = []
+        pos = start
+        while pos < end:
+            nl = mm.find(b'\n', pos)
+            if nl < 0:
+                nl = len(mm)
+            line = mm[pos:nl]
+            if line.endswith(b'\r'):
+                line = line[:-1]
+            lines.append(line if _worker_binary else line.decode('latin-1'))
+            pos = nl + 1
+    return _evaluate(lines, keep)
+
+
+def _range_map(path: str, start: int, end: int) -> List[int]:
+    """Mapa de transição composto da faixa ``[start, end)`` do arquivo."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        part = view[start:end]
+        try:
+            maps = _worker_fn(part)
+        finally:
+            part.release()
+            view.release()
+    return [int(q) for q in compose_maps(maps)[-1]]
+
+
+class ParallelResult:
+    """Contagens agregadas e, opcionalmente, vereditos na ordem da entrada."""
+
+    def __init__(self, accepted: int, total: int, verdicts: Optional[list]):
+        self.accepted = accepted
+        self.total = total
+        self.verdicts = verdicts
+
+    @property
+    def rejected(self) -> int:
+        return self.total - self.accepted
+
+    def __repr__(self) -> str:
+        return f"ParallelResult(accepted={self.accepted}, rejected={self.rejected})"
+
+
+class ParallelRunner:
+    """Pool de processos que avalia ``fn`` sobre muitas cadeias.
+
+    ``binary=True`` entrega as linhas de arquivos como ``bytes`` (mais
+    rápido para AFD/APD); por padrão elas chegam como ``str`` latin-1, o que
+    serve também para ``tm_increment_binary``. Use como gerenciador de
+    contexto ou chame ``close()``.
+    """
+
+    def __init__(self, fn: Callable[[Any], Any], workers: Optional[int] = None, binary: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                         initargs=(fn, binary))
+
+    def __enter__(self) -> 'ParallelRunner':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def _collect(self, futures, verdicts: bool) -> ParallelResult:
+        accepted = total = 0
+        merged: Optional[List[Any]] = [] if verdicts else None
+        for acc, n, results in futures:
+            accepted += acc
+            total += n
+            if verdicts:
+                merged.extend(results)
+        return ParallelResult(accepted, total, merged)
+
+    def map_items(self, items: Sequence[Any], verdicts: bool = False,
+                  items_per_task: int = ITEMS_PER_TASK) -> ParallelResult:
+        """Avalia uma sequência de cadeias, em fatias de ``items_per_task``."""
+        chunks = [items[i:i + items_per_task] for i in range(0, len(items), items_per_task)]
+        return self._collect(self._pool.map(_evaluate, chunks, [verdicts] * len(chunks)), verdicts)
+
+    def map_file(self, path, verdicts: bool = False) -> ParallelResult:
+        """Avalia cada linha de um arquivo, dividido em faixas de bytes."""
+        path = os.fspath(path)
+        size = os.path.getsize(path)
+        if size == 0:
+            return ParallelResult(0, 0, [] if verdicts else None)
+        step = max(MIN_RANGE_BYTES, -(-size // (self.workers * 4)))
+        starts = list(range(0, size, step))
+        ends = [min(s + step, size) for s in starts]
+        n = len(starts)
+        return self._collect(self._pool.map(_evaluate_range, [path] * n, starts, ends,
+                                            [verdicts] * n), verdicts)
+
+
+def evaluate_items(fn: Callable[[Any], Any], items: Sequence[Any], workers: Optional[int] = None,
+                   verdicts: bool = False) -> ParallelResult:
+    """Atalho: cria um ``ParallelRunner``, avalia ``items`` e encerra o pool."""
+    with ParallelRunner(fn, workers) as runner:
+        return runner.map_items(items, verdicts)
+
+
+def evaluate_file(fn: Callable[[Any], Any], path, workers: Optional[int] = None,
+                  verdicts: bool = False, binary: bool = False) -> ParallelResult:
+    """Atalho: cria um ``ParallelRunner``, avalia as linhas de ``path`` e encerra o pool."""
+    with ParallelRunner(fn, workers, binary) as runner:
+        return runner.map_file(path, verdicts)
+
+
+def dfa_scan_file(dfa: DFA, path, workers: Optional[int] = None, boundaries: bool = False):
+    """Executa ``dfa`` sobre o conteúdo inteiro de ``path``, dividido entre processos.
+
+    Retorna o estado final, como ``dfa.run``; com ``boundaries=True``,
+    retorna ``(estado final, [(posição, estado), ...])`` com o estado ao fim
+    da faixa de cada processo.
+    """
+    path = os.fspath(path)
+    size = os.path.getsize(path)
+    if size == 0:
+        return (dfa.start, []) if boundaries else dfa.start
+    workers = workers or os.cpu_count() or 1
+    step = max(MIN_RANGE_BYTES, -(-size // workers))
+    starts = list(range(0, size, step))
+    ends = [min(s + step, size) for s in starts]
+    with ProcessPoolExecutor(min(workers, len(starts)), initializer=_init_worker,
+                             initargs=(dfa.chunk_maps, True)) as pool:
+        maps = list(pool.map(_range_map, [path] * len(starts), starts, ends))
+    states = [int(p[dfa.start]) for p in compose_maps(maps)]
+    if boundaries:
+        return states[-1], list(zip(ends, states))
+    return states[-1]
@@ -0,0 +1,379 @@
+"""Motor genérico de autômato com pilha determinístico (APD / DPDA).
+
+As transições são dadas por ``(estado, símbolo de entrada ou '', topo) ->
+(novo estado, cadeia empilhada)``; a cadeia substitui o topo e seu primeiro
+símbolo vira o novo topo (convenção de Hopcroft-Motwani-Ullman).
+
+Na compilação:
+
+- estados, classes de entrada e símbolos de pilha viram inteiros, e as
+  transições ficam numa tabela plana indexada por
+  ``(estado * stride + classe) * n_pilha + topo``;
+- cada ação é pré-processada para ``(novo estado, desempilha?, bytes a
+  empilhar)``: quando a cadeia termina no próprio topo (``A -> AA``), não
+  há desempilhar/empilhar, só o acréscimo do que é novo;
+- a pilha é um ``array('B')`` de ids de símbolos — um byte por entrada,
+  sem objeto Python por operação de empilhar.
+
+A aceitação pode ser por estado final (``accept_by='final'``) ou por pilha
+vazia (``accept_by='empty'``).
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .dfa import BLOCK_SIZE, Input, _symbol_code, as_bytes
+
+if TYPE_CHECKING:
+    from .instrument import Stats
+
+EPSILON = ''
+
+# Resultado de ``DPDA.run`` quando não há transição aplicável.
+STUCK = -1
+
+Action = Tuple[int, int, bytes]
+
+
+def _input_classmap(alphabet: bytes) -> bytes:
+    """Classe de cada byte: 1..k para o alfabeto, ``k + 1`` para símbolo inválido (0 = ε)."""
+    classmap = bytearray([len(alphabet) + 1]) * 256
+    for i, code in enumerate(alphabet):
+        classmap[code] = i + 1
+    return bytes(classmap)
+
+
+def eps_limit(n_states: int, n_stack: int) -> int:
+    """Passos ε consecutivos antes de começar a procurar laços (veja ``_EpsilonLoops``)."""
+    return n_states * n_stack + 1
+
+
+class _EpsilonLoops:
+    """Detecta um laço numa corrida de transições ε.
+
+    A corrida é infinita se, e só se, um par ``(estado, topo)`` se repete
+    sem que a pilha tenha descido abaixo da altura em que ele foi visto:
+    o que está sob esse topo nunca mais é lido, e o trecho entre as duas
+    ocorrências se repete para sempre. Pares ainda válidos têm alturas
+    não decrescentes, então descer a pilha descarta um sufixo da lista.
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.marks: List[Tuple[int, Tuple[int, int]]] = []  # (altura, par)
+
+    def repeated(self, state: int, stack: array) -> bool:
+        pair = (state, stack[-1])
+        if pair in self.seen:
+            return True
+        self.seen.add(pair)
+        self.marks.append((len(stack), pair))
+        return False
+
+    def drop(self, height: int) -> None:
+        """A pilha desceu até ``height``: pares vistos acima deixam de valer."""
+        marks = self.marks
+        while marks and marks[-1][0] > height:
+            self.seen.discard(marks.pop()[1])
+
+
+class DPDA:
+    """Autômato com pilha determinístico compilado em tabela.
+
+    Parâmetros:
+    - ``states``: nomes dos estados;
+    - ``input_alphabet``: símbolos de entrada (caracteres ou bytes);
+    - ``stack_alphabet``: símbolos de pilha (no máximo 256);
+    - ``transitions``: dicionário ``(estado, entrada ou '', topo) ->
+      (estado, cadeia a empilhar)``;
+    - ``start`` e ``start_stack``: estado inicial e símbolo inicial da pilha;
+    - ``accepting``: estados finais (usados com ``accept_by='final'``).
+    """
+
+    def __init__(self, states: Iterable[Hashable], input_alphabet: Union[str, bytes, Iterable],
+                 stack_alphabet: Sequence[Hashable],
+                 transitions: Dict[Tuple[Hashable, Union[str, int], Hashable], Tuple[Hashable, Sequence[Hashable]]],
+                 start: Hashable, start_stack: Hashable, accepting: Iterable[Hashable] = (),
+                 accept_by: str = 'final'):
+        if accept_by not in ('final', 'empty'):
+            raise ValueError("accept_by deve ser 'final' ou 'empty'")
+        names: List[Hashable] = list(states)
+        index = {name: i for i, name in enumerate(names)}
+        stack_symbols: List[Hashable] = list(stack_alphabet)
+        sindex = {sym: i for i, sym in enumerate(stack_symbols)}
+        if len(sindex) > 256:
+            raise ValueError("O alfabeto de pilha comporta no máximo 256 símbolos")
+        if start not in index or start_stack not in sindex:
+            raise ValueError("Estado inicial ou símbolo inicial de pilha desconhecido")
+        alphabet = bytes(_symbol_code(c) for c in input_alphabet)
+
+        classmap = _input_classmap(alphabet)
+        stride = len(alphabet) + 2
+        ns = len(stack_symbols)
+        n = len(names)
+        table: List[Optional[Action]] = [None] * (n * stride * ns)
+
+        for (src, sym, top), (dst, push) in transitions.items():
+            if src not in index or dst not in index:
+                raise ValueError(f"Transição com estado desconhecido: {src!r} -> {dst!r}")
+            if top not in sindex or any(p not in sindex for p in push):
+                raise ValueError(f"Transição com símbolo de pilha desconhecido: {top!r} / {push!r}")
+            if sym == EPSILON:
+                col = 0
+            else:
+                code = _symbol_code(sym)
+                if code not in alphabet:
+                    raise ValueError(f"Símbolo fora do alfabeto: {sym!r}")
+                col = classmap[code]
+            ids = [sindex[p] for p in push]
+            t = sindex[top]
+            if ids and ids[-1] == t:
+                action = (index[dst], 0, bytes(reversed(ids[:-1])))
+            else:
+                action = (index[dst], 1, bytes(reversed(ids)))
+            table[(index[src] * stride + col) * ns + t] = action
+
+        # determinismo: com ε definido em (q, X), nenhuma leitura em (q, *, X)
+        for q in range(n):
+            for t in range(ns):
+                base = q * stride * ns + t
+                if table[base] is not None and any(table[base + col * ns] is not None
+                                                   for col in range(1, stride)):
+                    raise ValueError(f"Transições não determinísticas em ({names[q]!r}, "
+                                     f"{stack_symbols[t]!r})")
+
+        flags = bytearray(n)
+        for name in accepting:
+            if name not in index:
+                raise ValueError(f"Estado de aceitação desconhecido: {name!r}")
+            flags[index[name]] = 1
+        self._init_compiled(alphabet, stack_symbols, table, index[start], sindex[start_stack],
+                            flags, accept_by, names)
+
+    @classmethod
+    def from_table(cls, alphabet: bytes, stack_symbols: Sequence[Hashable], table: List[Optional[Action]],
+                   start: int, start_stack: int, accepting: Sequence[int], accept_by: str = 'final',
+                   names: Optional[List[Hashable]] = None) -> 'DPDA':
+        """Constrói o APD diretamente da forma compilada.
+
+        ``table`` tem uma ação ``(novo estado, desempilha?, bytes a
+        empilhar)`` ou None por célula ``(estado * stride + classe) *
+        n_pilha + topo``, com ``stride = len(alphabet) + 2``; ``accepting``
+        tem uma flag por estado.
+        """
+        alphabet = bytes(alphabet)
+        n = len(accepting)
+        if accept_by not in ('final', 'empty'):
+            raise ValueError("accept_by deve ser 'final' ou 'empty'")
+        if len(table) != n * (len(alphabet) + 2) * len(stack_symbols):
+            raise ValueError("Tabela com tamanho incompatível com estados e alfabetos")
+        self = cls.__new__(cls)
+        self._init_compiled(alphabet, list(stack_symbols), table, start, start_stack,
+                            bytearray(accepting), accept_by,
+                            names if names is not None else list(range(n)))
+        return self
+
+    def _init_compiled(self, alphabet: bytes, stack_symbols: List[Hashable], table: List[Optional[Action]],
+                       start: int, start_stack: int, accepting: bytearray, accept_by: str,
+                       names: List[Hashable]) -> None:
+        self.names = names
+        self.stack_symbols = stack_symbols
+        self.alphabet = alphabet
+        self.classmap = _input_classmap(alphabet)
+        self.stride = len(alphabet) + 2  # coluna 0 = ε
+        ns = self.n_stack = len(stack_symbols)
+        self.table = table
+        n = len(names)
+        # estados com alguma transição ε (só neles ``run`` chama ``_epsilon``)
+        self.has_eps = bytearray(n)
+        for q in range(n):
+            base = q * self.stride * ns
+            if any(a is not None for a in table[base:base + ns]):
+                self.has_eps[q] = 1
+        self.start = start
+        self.start_stack = start_stack
+        self.accept_by = accept_by
+        self.accepting = accepting
+        self._eps_limit = eps_limit(n, ns)
+
+    def new_stack(self) -> array:
+        return array('B', (self.start_stack,))
+
+    def _epsilon(self, state: int, stack: array, at_end: bool) -> int:
+        """Aplica transições ε a partir de ``state``; no fim da entrada, para se aceitar.
+
+        Corridas curtas não pagam nada; passado ``eps_limit`` passos, os
+        pares ``(estado, topo)`` são registrados e um laço de transições
+        vazias dá ``STUCK`` (uma corrida longa que termina não é cortada).
+        """
+        table, stride, ns = self.table, self.stride, self.n_stack
+        budget = self._eps_limit
+        loops = None
+        while True:
+            if at_end and self._accepts_config(state, stack):
+                return state
+            if not stack:
+                return state
+            act = table[state * stride * ns + stack[-1]]
+            if act is None:
+                return state
+            budget -= 1
+            if budget < 0:
+                if loops is None:
+                    loops = _EpsilonLoops()
+                if loops.repeated(state, stack):
+                    return STUCK  # laço de transições vazias
+            state, pop, push = act
+            if pop:
+                stack.pop()
+                if loops is not None:
+                    loops.drop(len(stack))
+            if push:
+                stack.frombytes(push)
+
+    def _accepts_config(self, state: int, stack: array) -> bool:
+        if self.accept_by == 'empty':
+            return not stack
+        return self.accepting[state] == 1
+
+    def run(self, data: Input, state: Optional[int] = None, stack: Optional[array] = None) -> int:
+        """Consome ``data`` a partir de ``(state, stack)`` e retorna o novo estado.
+
+        A pilha é alterada no lugar. Retorna ``STUCK`` se nenhuma transição
+        se aplica; ε-transições pendentes no fim da entrada não são seguidas
+        (veja ``close``), o que permite retomar com o próximo bloco.
+        """
+        if state is None:
+            state = self.start
+        elif state == STUCK:
+            return STUCK
+        if stack is None:
+            stack = self.new_stack()
+        buf = as_bytes(data)
+        if buf is None:
+            return STUCK
+        table, stride, ns, has_eps = self.table, self.stride, self.n_stack, self.has_eps
+        for i in range(0, len(buf), BLOCK_SIZE):
+            for c in bytes(buf[i:i + BLOCK_SIZE]).translate(self.classmap):
+                if has_eps[state]:
+                    state = self._epsilon(state, stack, False)
+                    if state == STUCK:
+                        return STUCK
+                if not stack:
+                    return STUCK
+                act = table[(state * stride + c) * ns + stack[-1]]
+                if act is None:
+                    return STUCK
+                state, pop, push = act
+                if pop:
+                    stack.pop()
+                if push:
+                    stack.frombytes(push)
+        return state
+
+    def close(self, state: int, stack: array) -> bool:
+        """Fim da entrada: segue transições ε até aceitar ou parar; retorna o veredito."""
+        if state == STUCK:
+            return False
+        state = self._epsilon(state, stack, True)
+        return state != STUCK and self._accepts_config(state, stack)
+
+    def accepts(self, data: Input) -> bool:
+        """Retorna True se o APD aceita ``data``."""
+        stack = self.new_stack()
+        return self.close(self.run(data, self.start, stack), stack)
+
+    # --- execução instrumentada (laços separados dos de ``run``/``close``) ---
+
+    def run_traced(self, data: Input, stats: 'Stats', state: Optional[int] = None,
+                   stack: Optional[array] = None) -> int:
+        """Como ``run``, registrando passos, transições e altura da pilha em ``stats``.
+
+        As configurações amostradas são ``(estado, altura da pilha, topo)``.
+        """
+        if state is None:
+            state = self.start
+        elif state == STUCK:
+            return STUCK
+        if stack is None:
+            stack = self.new_stack()
+        buf = as_bytes(data)
+        if buf is None:
+            return STUCK
+        counts = self._begin_traced(stats)
+        stats.max_stack = max(stats.max_stack, len(stack))
+        for i in range(0, len(buf), BLOCK_SIZE):
+            for c in bytes(buf[i:i + BLOCK_SIZE]).translate(self.classmap):
+                if self.has_eps[state]:
+                    state = self._epsilon_traced(state, stack, False, stats, counts)
+                    if state == STUCK:
+                        return STUCK
+                state = self._step_traced(state, c, stack, stats, counts)
+                if state == STUCK:
+                    return STUCK
+        return state
+
+    def close_traced(self, state: int, stack: array, stats: 'Stats') -> bool:
+        """Como ``close``, contando as transições ε finais em ``stats``."""
+        if state == STUCK:
+            return False
+        state = self._epsilon_traced(state, stack, True, stats, self._begin_traced(stats))
+        return state != STUCK and self._accepts_config(state, stack)
+
+    def accepts_traced(self, data: Input, stats: 'Stats') -> bool:
+        """Como ``accepts``, preenchendo ``stats`` (veja ``instrument.Stats``)."""
+        stack = self.new_stack()
+        return self.close_traced(self.run_traced(data, stats, self.start, stack), stack, stats)
+
+    def _begin_traced(self, stats: 'Stats') -> array:
+        return stats.begin(self, len(self.table), self.stride * self.n_stack, self._transition_label)
+
+    def _step_traced(self, state: int, col: int, stack: array, stats: 'Stats', counts: array) -> int:
+        """Uma transição (coluna ``col``; 0 = ε) com registro em ``stats``."""
+        ns = self.n_stack
+        if not stack:
+            return STUCK
+        key = (state * self.stride + col) * ns + stack[-1]
+        act = self.table[key]
+        if act is None:
+            return STUCK
+        counts[key] += 1
+        state, pop, push = act
+        if pop:
+            stack.pop()
+        if push:
+            stack.frombytes(push)
+            if len(stack) > stats.max_stack:
+                stats.max_stack = len(stack)
+        stats.steps += 1
+        if stats.sample_every and stats.steps % stats.sample_every == 0:
+            top = self.stack_symbols[stack[-1]] if stack else None
+            stats.sample(stats.steps, (self.names[state], len(stack), top))
+        return state
+
+    def _epsilon_traced(self, state: int, stack: array, at_end: bool, stats: 'Stats',
+                        counts: array) -> int:
+        budget = self._eps_limit
+        loops = None
+        while True:
+            if at_end and self._accepts_config(state, stack):
+                return state
+            if not stack or self.table[state * self.stride * self.n_stack + stack[-1]] is None:
+                return state
+            budget -= 1
+            if budget < 0:
+                if loops is None:
+                    loops = _EpsilonLoops()
+                if loops.repeated(state, stack):
+                    return STUCK
+            height = len(stack) - self.table[state * self.stride * self.n_stack + stack[-1]][1]
+            state = self._step_traced(state, 0, stack, stats, counts)
+            if loops is not None:
+                loops.drop(height)
+
+    def _transition_label(self, key: int) -> Tuple[Hashable, str, Hashable]:
+        """``(estado, entrada, topo)`` de uma célula da tabela ('' = ε)."""
+        rest, top = divmod(key, self.n_stack)
+        q, col = divmod(rest, self.stride)
+        sym = '' if col == 0 else chr(self.alphabet[col - 1])
+        return self.names[q], sym, self.stack_symbols[top]
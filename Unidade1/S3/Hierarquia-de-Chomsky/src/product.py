@@ -0,0 +1,300 @@
+"""Operações sobre AFDs sem construir produtos completos.
+
+``intersection``, ``union``, ``difference`` e ``symmetric_difference``
+devolvem um ``LazyProduct``: os estados do produto são pares de estados
+dos operandos criados só quando alcançados (por ``run``/``accepts``, por
+``witness`` ou pelas verificações abaixo), e a tabela cresce junto. O
+alfabeto do produto é a união dos alfabetos; um símbolo fora do alfabeto
+de um operando leva esse operando ao seu estado morto. Os operandos
+podem ser ``DFA`` ou outros produtos. ``complement`` é direto (troca as
+flags de aceitação) e devolve um ``DFA``.
+
+``counterexample`` decide a equivalência com o algoritmo de Hopcroft–Karp:
+uma union-find sobre os estados dos dois autômatos, percorrida em largura
+a partir do par inicial, que para no primeiro par com aceitações
+diferentes e devolve a cadeia que leva até ele. Cada união reduz o número
+de classes, então são visitados no máximo ``n_a + n_b - 1`` pares, e não
+``n_a * n_b``. A inclusão ``L(a) ⊆ L(b)`` é a equivalência entre
+``union(a, b)`` e ``b``.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .dfa import BLOCK_SIZE, DFA, Input, _symbol_code, _text_classes, as_bytes
+
+Automaton = Union[DFA, 'LazyProduct']
+
+# operação -> aceitação do par (aceita_a, aceita_b)
+OPS: Dict[str, Callable[[int, int], int]] = {
+    'and': lambda x, y: x & y,
+    'or': lambda x, y: x | y,
+    'diff': lambda x, y: x & (y ^ 1),
+    'xor': lambda x, y: x ^ y,
+}
+
+
+def _stepper(m: Automaton) -> Callable[[int, int], int]:
+    """Função ``(estado, classe) -> estado`` de um operando (índices de estado)."""
+    if isinstance(m, LazyProduct):
+        return m.step
+    t, stride = m._fast, m.stride
+    return lambda q, c: t[q * stride + c] // stride
+
+
+class LazyProduct:
+    """Produto de dois autômatos, com estados criados sob demanda.
+
+    Tem a mesma interface de consulta de um ``DFA`` (``alphabet``,
+    ``classmap``, ``start``, ``accepting``, ``next_state``, ``run``,
+    ``accepts``); ``n_states`` é o número de pares criados até agora.
+    ``to_dfa`` materializa só a parte alcançável.
+    """
+
+    def __init__(self, a: Automaton, b: Automaton, op: str):
+        if op not in OPS:
+            raise ValueError(f"Operação desconhecida: {op!r} (use {', '.join(OPS)})")
+        self.a, self.b, self.op = a, b, op
+        self._accept = OPS[op]
+        self.alphabet = bytes(sorted(set(a.alphabet) | set(b.alphabet)))
+        # uma classe do produto por par (classe em a, classe em b); o par das
+        # colunas ``foreign`` dos operandos é a coluna ``foreign`` do produto
+        foreign = (a.foreign, b.foreign)
+        pairs = [(a.classmap[c], b.classmap[c]) for c in range(256)]
+        distinct = [p for p in dict.fromkeys(pairs) if p != foreign]
+        columns = [foreign] + distinct if len(distinct) < 256 else distinct + [foreign]
+        cls = {p: i for i, p in enumerate(columns)}
+        self.stride = len(columns)
+        self.foreign = cls[foreign]
+        self.classmap = bytes(cls[p] for p in pairs)
+        # classe do produto -> classe de cada operando
+        self._cols_a = [p[0] for p in columns]
+        self._cols_b = [p[1] for p in columns]
+        self._step_a, self._step_b = _stepper(a), _stepper(b)
+        self._index: Dict[int, int] = {}
+        self.pairs: List[Tuple[int, int]] = []
+        # deslocamentos (``indice * stride``) como no DFA; -1 = ainda não calculado
+        self.table: List[int] = []
+        self.accepting = bytearray()
+        self.start = self._state(a.start, b.start)
+
+    @property
+    def n_states(self) -> int:
+        return len(self.accepting)
+
+    @property
+    def names(self) -> List[Tuple[int, int]]:
+        return self.pairs
+
+    def _state(self, qa: int, qb: int) -> int:
+        key = qa << 32 | qb
+        q = self._index.get(key)
+        if q is None:
+            q = self._index[key] = len(self.pairs)
+            self.pairs.append((qa, qb))
+            self.table.extend([-1] * self.stride)
+            self.accepting.append(self._accept(self.a.accepting[qa], self.b.accepting[qb]))
+        return q
+
+    def _fill(self, off: int, c: int) -> int:
+        qa, qb = self.pairs[off // self.stride]
+        nxt = self._state(self._step_a(qa, self._cols_a[c]), self._step_b(qb, self._cols_b[c])) * self.stride
+        self.table[off + c] = nxt
+        return nxt
+
+    def step(self, q: int, c: int) -> int:
+        """Estado alcançado de ``q`` pela classe ``c`` (criando-o se preciso)."""
+        off = q * self.stride
+        nxt = self.table[off + c]
+        if nxt < 0:
+            nxt = self._fill(off, c)
+        return nxt // self.stride
+
+    def next_state(self, state: int, symbol: Union[str, int]) -> int:
+        return self.step(state, self.classmap[_symbol_code(symbol)])
+
+    def run(self, data: Input, state: Optional[int] = None) -> int:
+        """Processa ``data`` e retorna o índice do estado final do produto."""
+        stride = self.stride
+        off = (self.start if state is None else state) * stride
+        buf = as_bytes(data)
+        if buf is None:
+            blocks = [_text_classes(data, self.classmap, self.foreign)]
+        else:
+            blocks = (bytes(buf[i:i + BLOCK_SIZE]).translate(self.classmap)
+                      for i in range(0, len(buf), BLOCK_SIZE))
+        t = self.table
+        for block in blocks:
+            for c in block:
+                nxt = t[off + c]
+                off = nxt if nxt >= 0 else self._fill(off, c)
+        return off // stride
+
+    def accepts(self, data: Input) -> bool:
+        return self.accepting[self.run(data)] == 1
+
+    def explore(self) -> int:
+        """Cria todos os pares alcançáveis; retorna quantos são."""
+        stride = self.stride
+        q = 0
+        while q < len(self.pairs):
+            for c in range(stride):
+                self.step(q, c)
+            q += 1
+        return len(self.pairs)
+
+    def to_dfa(self) -> DFA:
+        """``DFA`` com os pares alcançáveis (nomes = pares de índices dos operandos)."""
+        self.explore()
+        return DFA.from_table(self.alphabet, self.table, self.start, bytes(self.accepting),
+                              list(self.pairs), classmap=self.classmap)
+
+
+def intersection(a: Automaton, b: Automaton) -> LazyProduct:
+    return LazyProduct(a, b, 'and')
+
+
+def union(a: Automaton, b: Automaton) -> LazyProduct:
+    return LazyProduct(a, b, 'or')
+
+
+def difference(a: Automaton, b: Automaton) -> LazyProduct:
+    return LazyProduct(a, b, 'diff')
+
+
+def symmetric_difference(a: Automaton, b: Automaton) -> LazyProduct:
+    return LazyProduct(a, b, 'xor')
+
+
+def complement(a: Automaton) -> DFA:
+    """AFD que aceita as cadeias sobre ``a.alphabet`` que ``a`` rejeita.
+
+    Cadeias com símbolos fora do alfabeto continuam rejeitadas: elas vão
+    para um novo estado morto, e o antigo (se houver) passa a aceitar.
+    """
+    if isinstance(a, LazyProduct):
+        a = a.to_dfa()
+    stride = a.stride
+    sink = a.n_states
+    table = list(a._fast)
+    for q in range(sink):
+        table[q * stride + a.foreign] = sink * stride
+    table.extend([sink * stride] * stride)
+    flags = bytes(f ^ 1 for f in a.accepting) + b'\0'
+    return DFA.from_table(a.alphabet, table, a.start, flags, list(a.names) + [None],
+                          classmap=a.classmap)
+
+
+def _symbols(a: Automaton, b: Automaton) -> List[int]:
+    """Um código por classe de símbolos distinguível por ``a`` ou ``b``.
+
+    Os bytes fora dos dois alfabetos, se houver, também têm um representante.
+    """
+    first: Dict[Tuple[int, int], int] = {}
+    for code in range(256):
+        first.setdefault((a.classmap[code], b.classmap[code]), code)
+    return list(first.values())
+
+
+def _word(origin: Dict[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]], pair: Tuple[int, int]) -> str:
+    codes = []
+    link = origin[pair]
+    while link is not None:
+        pair, code = link
+        codes.append(code)
+        link = origin[pair]
+    return bytes(reversed(codes)).decode('latin-1')
+
+
+def counterexample(a: Automaton, b: Automaton) -> Optional[str]:
+    """Cadeia aceita por exatamente um de ``a`` e ``b``, ou ``None`` se são equivalentes.
+
+    Hopcroft–Karp: os estados dos dois autômatos formam uma única
+    union-find (``2q`` para ``a``, ``2q + 1`` para ``b``); um par só é
+    examinado se unir duas classes ainda distintas.
+    """
+    symbols = _symbols(a, b)
+    cols_a = [a.classmap[c] for c in symbols]
+    cols_b = [b.classmap[c] for c in symbols]
+    step_a, step_b = _stepper(a), _stepper(b)
+    acc_a, acc_b = a.accepting, b.accepting
+    parent: Dict[int, int] = {}
+    size: Dict[int, int] = {}
+
+    def find(x: int) -> int:
+        while True:
+            up = parent.get(x, x)
+            if up == x:
+                return x
+            parent[x] = x = parent.get(up, up)  # compressão por divisão ao meio
+
+    def merge(x: int, y: int) -> bool:
+        x, y = find(x), find(y)
+        if x == y:
+            return False
+        if size.get(x, 1) < size.get(y, 1):
+            x, y = y, x
+        parent[y] = x
+        size[x] = size.get(x, 1) + size.get(y, 1)
+        return True
+
+    start = (a.start, b.start)
+    origin: Dict[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]] = {start: None}
+    merge(2 * a.start, 2 * b.start + 1)
+    queue: Deque[Tuple[int, int]] = deque([start])
+    while queue:
+        pair = queue.popleft()
+        p, q = pair
+        if acc_a[p] != acc_b[q]:
+            return _word(origin, pair)
+        for j, code in enumerate(symbols):
+            p2, q2 = step_a(p, cols_a[j]), step_b(q, cols_b[j])
+            if merge(2 * p2, 2 * q2 + 1):
+                origin[(p2, q2)] = (pair, code)
+                queue.append((p2, q2))
+    return None
+
+
+def equivalent(a: Automaton, b: Automaton) -> bool:
+    """True se ``a`` e ``b`` aceitam a mesma linguagem."""
+    return counterexample(a, b) is None
+
+
+def subset_counterexample(a: Automaton, b: Automaton) -> Optional[str]:
+    """Cadeia aceita por ``a`` e rejeitada por ``b``, ou ``None`` se ``L(a) ⊆ L(b)``."""
+    return counterexample(union(a, b), b)
+
+
+def is_subset(a: Automaton, b: Automaton) -> bool:
+    """True se toda cadeia aceita por ``a`` também é aceita por ``b``."""
+    return subset_counterexample(a, b) is None
+
+
+def witness(m: Automaton) -> Optional[str]:
+    """Menor cadeia aceita por ``m`` (busca em largura), ou ``None`` se a linguagem é vazia.
+
+    Sobre um produto, cria só os pares visitados até achar a cadeia; por
+    exemplo, ``witness(intersection(a, b))`` verifica se ``a`` e ``b`` se sobrepõem.
+    """
+    step = _stepper(m)
+    # um símbolo do alfabeto por classe
+    first: Dict[int, int] = {}
+    for code in m.alphabet:
+        first.setdefault(m.classmap[code], code)
+    classes = sorted(first.items())
+    origin: Dict[int, Optional[Tuple[int, int]]] = {m.start: None}
+    queue: Deque[int] = deque([m.start])
+    while queue:
+        q = queue.popleft()
+        if m.accepting[q]:
+            word = []
+            while origin[q] is not None:
+                q, code = origin[q]
+                word.append(code)
+            return bytes(reversed(word)).decode('latin-1')
+        for c, code in classes:
+            r = step(q, c)
+            if r not in origin:
+                origin[r] = (q, code)
+                queue.append(r)
+    return None
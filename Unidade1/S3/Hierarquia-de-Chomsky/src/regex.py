@@ -0,0 +1,348 @@
+"""Expressões regulares: construção de Thompson e AFD preguiçoso (lazy DFA).
+
+Sintaxe suportada (sobre bytes/latin-1): literais, ``\\`` para escapar,
+``.`` (qualquer byte), classes ``[abc]``, ``[a-z]``, ``[^...]``,
+agrupamento ``( )``, alternância ``|`` e os quantificadores ``*``, ``+``,
+``?``, ``{n}``, ``{n,}`` e ``{n,m}``.
+
+O padrão vira um ``NFA`` (``src.nfa``) pela construção de Thompson. Em vez
+de determinizar tudo de antemão — o que explode exponencialmente em padrões
+como ``(a|b)*a(a|b){20}`` — o ``LazyDFA`` cria cada estado do AFD (um
+bitset de estados do AFN) só quando a entrada chega nele e guarda as linhas
+de transição em um cache LRU limitado. Se o cache passa a ser descartado a
+todo momento (mais estados novos do que bytes processados justificam), a
+execução segue por simulação direta do AFN, ainda em tempo linear.
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .dfa import DFA, Input, as_bytes
+from .nfa import NFA
+
+# Quantidade padrão de estados do AFD mantidos em cache.
+DEFAULT_CACHE_STATES = 4096
+
+# Se, depois de alguma remoção do cache, forem criados estados a uma taxa
+# maior que um a cada MIN_BYTES_PER_STATE bytes, usa-se a simulação do AFN.
+MIN_BYTES_PER_STATE = 10
+
+_ALL_BYTES = frozenset(range(256))
+
+
+class _Parser:
+    """Analisador descendente recursivo que produz a árvore sintática.
+
+    Nós: ``('set', frozenset_de_bytes)``, ``('cat', [nós])``,
+    ``('alt', [nós])`` e ``('rep', nó, mínimo, máximo_ou_None)``.
+    """
+
+    def __init__(self, pattern: str):
+        try:
+            self.src = pattern.encode('latin-1')
+        except UnicodeEncodeError:
+            raise ValueError("Padrão com caracteres fora de latin-1") from None
+        self.pos = 0
+
+    def error(self, msg: str) -> ValueError:
+        return ValueError(f"{msg} na posição {self.pos} do padrão")
+
+    def peek(self) -> Optional[int]:
+        return self.src[self.pos] if self.pos < len(self.src) else None
+
+    def take(self) -> int:
+        c = self.peek()
+        if c is None:
+            raise self.error("Fim inesperado")
+        self.pos += 1
+        return c
+
+    def parse(self):
+        node = self.alt()
+        if self.peek() is not None:
+            raise self.error(f"Caractere inesperado {chr(self.peek())!r}")
+        return node
+
+    def alt(self):
+        branches = [self.cat()]
+        while self.peek() == ord('|'):
+            self.pos += 1
+            branches.append(self.cat())
+        return branches[0] if len(branches) == 1 else ('alt', branches)
+
+    def cat(self):
+        items = []
+        while self.peek() is not None and self.peek() not in b'|)':
+            items.append(self.repeat())
+        return items[0] if len(items) == 1 else ('cat', items)
+
+    def repeat(self):
+        node = self.atom()
+        while True:
+            c = self.peek()
+            if c == ord('*'):
+                node = ('rep', node, 0, None)
+            elif c == ord('+'):
+                node = ('rep', node, 1, None)
+            elif c == ord('?'):
+                node = ('rep', node, 0, 1)
+            elif c == ord('{'):
+                self.pos += 1
+                lo, hi = self.bounds()
+                node = ('rep', node, lo, hi)
+                continue
+            else:
+                return node
+            self.pos += 1
+
+    def number(self) -> Optional[int]:
+        start = self.pos
+        while self.peek() is not None and chr(self.peek()).isdigit():
+            self.pos += 1
+        return int(self.src[start:self.pos]) if self.pos > start else None
+
+    def bounds(self) -> Tuple[int, Optional[int]]:
+        lo = self.number()
+        if lo is None:
+            raise self.error("Repetição sem limite inferior")
+        hi: Optional[int] = lo
+        if self.peek() == ord(','):
+            self.pos += 1
+            hi = self.number()
+        if self.take() != ord('}'):
+            raise self.error("Repetição sem '}'")
+        if hi is not None and hi < lo:
+            raise self.error("Repetição com máximo menor que o mínimo")
+        return lo, hi
+
+    def atom(self):
+        c = self.take()
+        if c == ord('('):
+            node = self.alt()
+            if self.take() != ord(')'):
+                raise self.error("Parêntese não fechado")
+            return node
+        if c == ord('['):
+            return ('set', self.char_class())
+        if c == ord('.'):
+            return ('set', _ALL_BYTES)
+        if c == ord('\\'):
+            return ('set', frozenset((self.take(),)))
+        if c in b'*+?{)|':
+            self.pos -= 1
+            raise self.error(f"Operador {chr(c)!r} sem operando")
+        return ('set', frozenset((c,)))
+
+    def char_class(self) -> frozenset:
+        negate = self.peek() == ord('^')
+        if negate:
+            self.pos += 1
+        members = set()
+        first = True
+        while first or self.peek() != ord(']'):
+            first = False
+            c = self.take()
+            if c == ord('\\'):
+                c = self.take()
+            if self.peek() == ord('-') and self.pos + 1 < len(self.src) and self.src[self.pos + 1] != ord(']'):
+                self.pos += 1
+                end = self.take()
+                if end == ord('\\'):
+                    end = self.take()
+                if end < c:
+                    raise self.error("Intervalo inválido na classe")
+                members.update(range(c, end + 1))
+            else:
+                members.add(c)
+        self.pos += 1
+        return frozenset(_ALL_BYTES - members if negate else members)
+
+
+class _Thompson:
+    """Emite estados do AFN a partir da árvore (um fragmento por nó)."""
+
+    def __init__(self):
+        self.eps: List[int] = []
+        self.moves: List[dict] = []
+
+    def new(self) -> int:
+        self.eps.append(0)
+        self.moves.append({})
+        return len(self.eps) - 1
+
+    def link(self, src: int, dst: int) -> None:
+        self.eps[src] |= 1 << dst
+
+    def emit(self, node) -> Tuple[int, int]:
+        kind = node[0]
+        if kind == 'set':
+            s, e = self.new(), self.new()
+            bit = 1 << e
+            self.moves[s] = dict.fromkeys(node[1], bit)
+            return s, e
+        if kind == 'cat':
+            s = e = self.new()
+            for child in node[1]:
+                cs, ce = self.emit(child)
+                self.link(e, cs)
+                e = ce
+            return s, e
+        if kind == 'alt':
+            s, e = self.new(), self.new()
+            for child in node[1]:
+                cs, ce = self.emit(child)
+                self.link(s, cs)
+                self.link(ce, e)
+            return s, e
+        _, child, lo, hi = node
+        s = e = self.new()
+        for _ in range(lo):
+            cs, ce = self.emit(child)
+            self.link(e, cs)
+            e = ce
+        if hi is None:
+            cs, ce = self.emit(child)
+            end = self.new()
+            self.link(e, cs)
+            self.link(e, end)
+            self.link(ce, cs)
+            self.link(ce, end)
+            return s, end
+        end = self.new()
+        for _ in range(hi - lo):
+            # cada cópia opcional pode ser pulada direto para o fim
+            self.link(e, end)
+            cs, ce = self.emit(child)
+            self.link(e, cs)
+            e = ce
+        self.link(e, end)
+        return s, end
+
+
+def _build(tree) -> NFA:
+    builder = _Thompson()
+    start, end = builder.emit(tree)
+    alphabet = bytes(sorted({code for row in builder.moves for code in row}))
+    return NFA.from_arrays(alphabet, builder.eps, builder.moves, start, 1 << end)
+
+
+def thompson(pattern: str) -> NFA:
+    """Converte ``pattern`` em um AFN pela construção de Thompson."""
+    return _build(_Parser(pattern).parse())
+
+
+class LazyDFA:
+    """AFD construído sob demanda a partir de um AFN.
+
+    Cada estado é o bitset de estados do AFN; sua linha de transições
+    (indexada pelo byte lido) é preenchida à medida que a entrada a exige e
+    fica em um cache LRU de no máximo ``max_states`` linhas.
+    """
+
+    def __init__(self, nfa: NFA, max_states: int = DEFAULT_CACHE_STATES):
+        if max_states < 1:
+            raise ValueError("max_states deve ser positivo")
+        self.nfa = nfa
+        self.max_states = max_states
+        self.start = nfa.start_set()
+        self._cache: 'OrderedDict[int, list]' = OrderedDict()
+        # estatísticas acumuladas
+        self.states_built = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    def run(self, data: Input, bits: Optional[int] = None, stop_on_accept: bool = False) -> int:
+        """Processa ``data`` e retorna o bitset final (0 = rejeição definitiva).
+
+        Com ``stop_on_accept``, retorna assim que um estado de aceitação é
+        alcançado (usado pela busca em subcadeias).
+        """
+        buf = as_bytes(data)
+        if buf is None:
+            return 0
+        buf = bytes(buf)
+        step = self.nfa.step
+        accept = self.nfa.accept if stop_on_accept else 0
+        bits = self.start if bits is None else bits
+        if bits & accept:
+            return bits
+        cache = self._cache
+        limit = self.max_states
+        built = evicted = 0
+        row = cache.get(bits)
+        if row is None:
+            if len(cache) >= limit:
+                cache.popitem(last=False)
+                evicted += 1
+            row = cache[bits] = [None] * 256
+            built += 1
+        for pos, code in enumerate(buf):
+            nxt = row[code]
+            if nxt is None:
+                nxt = row[code] = step(bits, code)
+            bits = nxt
+            if not bits or bits & accept:
+                break
+            row = cache.get(bits)
+            if row is None:
+                if len(cache) >= limit:
+                    cache.popitem(last=False)
+                    evicted += 1
+                    if built * MIN_BYTES_PER_STATE > pos + 1:
+                        # o cache não está sendo reaproveitado: simula o AFN
+                        self.fallbacks += 1
+                        bits = self._simulate(buf, pos + 1, bits, accept)
+                        break
+                row = cache[bits] = [None] * 256
+                built += 1
+            else:
+                cache.move_to_end(bits)
+        self.states_built += built
+        self.evictions += evicted
+        return bits
+
+    def _simulate(self, buf: bytes, pos: int, bits: int, accept: int) -> int:
+        step = self.nfa.step
+        for code in buf[pos:]:
+            bits = step(bits, code)
+            if not bits or bits & accept:
+                break
+        return bits
+
+    def matches(self, data: Input) -> bool:
+        """Retorna True se ``data`` inteira pertence à linguagem do AFN."""
+        return bool(self.run(data) & self.nfa.accept)
+
+
+class Regex:
+    """Expressão regular compilada com correspondência por AFD preguiçoso."""
+
+    def __init__(self, pattern: str, max_states: int = DEFAULT_CACHE_STATES):
+        self.pattern = pattern
+        tree = _Parser(pattern).parse()
+        self.nfa = _build(tree)
+        self._full = LazyDFA(self.nfa, max_states)
+        # busca: .*(padrão), parando no primeiro estado de aceitação
+        anywhere = ('cat', [('rep', ('set', _ALL_BYTES), 0, None), tree])
+        self._search = LazyDFA(_build(anywhere), max_states)
+
+    def fullmatch(self, data: Input) -> bool:
+        """Retorna True se toda a entrada casa com o padrão."""
+        return self._full.matches(data)
+
+    def search(self, data: Input) -> bool:
+        """Retorna True se alguma subcadeia da entrada casa com o padrão."""
+        return bool(self._search.run(data, stop_on_accept=True) & self._search.nfa.accept)
+
+    def to_dfa(self) -> DFA:
+        """Determinização completa e minimizada (pode ser exponencial).
+
+        As colunas do AFD são as classes de bytes do AFN (``NFA.byte_classes``):
+        ``.`` e classes negadas cobrem os 256 bytes em poucas colunas.
+        """
+        return self.nfa.to_dfa()
+
+
+def compile(pattern: str, max_states: int = DEFAULT_CACHE_STATES) -> Regex:
+    """Compila ``pattern`` em um ``Regex``."""
+    return Regex(pattern, max_states)
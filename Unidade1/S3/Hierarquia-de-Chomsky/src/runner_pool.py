@@ -0,0 +1,345 @@
+"""Execução de testes em processos persistentes ("aquecidos") e incremental.
+
+``WarmPool`` mantém processos que já importaram ``pytest`` (e as
+dependências pesadas, como NumPy) e executa neles ``pytest.main`` para
+cada alvo — arquivo de teste ou *node id* —, distribuindo os alvos entre
+os processos à medida que ficam livres. Antes de cada alvo, os módulos de
+``src/`` e ``tests/`` são descartados de ``sys.modules``, de modo que
+edições no código sejam sempre vistas.
+
+Os resultados chegam como eventos (dicionários), não como texto:
+
+- ``{'event': 'start', 'target', 'worker'}``;
+- ``{'event': 'test', 'target', 'nodeid', 'outcome', 'duration', 'message'}``
+  (``outcome`` é 'passed', 'failed' ou 'skipped');
+- ``{'event': 'error', 'target', 'message'}`` (erro de coleta);
+- ``{'event': 'done', 'target', 'worker', 'exitstatus', 'duration'}`` (com
+  ``message`` se o processo morreu durante o alvo; ele é substituído);
+- ``{'event': 'summary', 'passed', 'failed', 'skipped', 'errors', 'duration', 'targets'}``.
+
+``ImpactCache`` registra, para cada arquivo de teste, os módulos de
+``src/`` carregados durante sua execução e os hashes desses arquivos;
+``WarmPool.run(changed_only=True)`` executa só os testes cujas
+dependências (ou o próprio arquivo) mudaram, que ainda não foram
+registrados ou que falharam na última vez.
+"""
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Arquivo padrão do cache de impacto (na raiz do projeto).
+CACHE_NAME = '.test_impact.json'
+
+
+def _relpath(path: Path, root: Path) -> str:
+    return path.resolve().relative_to(root).as_posix()
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _target_file(target: str) -> str:
+    """Arquivo de um alvo (``tests/test_x.py::test_y`` -> ``tests/test_x.py``)."""
+    return target.split('::', 1)[0]
+
+
+class ImpactCache:
+    """Mapa arquivo de teste -> hashes das suas dependências em ``src/``."""
+
+    def __init__(self, root: Path = ROOT, path: Optional[Path] = None):
+        self.root = Path(root).resolve()
+        self.path = Path(path) if path is not None else self.root / CACHE_NAME
+        self.entries: Dict[str, dict] = {}
+        try:
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def snapshot(self) -> Dict[str, Optional[str]]:
+        """Hashes atuais dos arquivos ``.py`` de ``src/`` e ``tests/``."""
+        hashes = {}
+        for folder in ('src', 'tests'):
+            for p in sorted((self.root / folder).glob('*.py')):
+                hashes[_relpath(p, self.root)] = _hash_file(p)
+        return hashes
+
+    def record(self, test_file: str, deps: Iterable[str], passed: bool,
+               hashes: Dict[str, Optional[str]]) -> None:
+        files = set(deps) | {test_file}
+        conftest = 'tests/conftest.py'
+        if conftest in hashes:
+            files.add(conftest)
+        self.entries[test_file] = {
+            'deps': {f: hashes.get(f) for f in sorted(files)},
+            'passed': passed,
+        }
+
+    def stale(self, test_files: Iterable[str], hashes: Dict[str, Optional[str]]) -> List[str]:
+        """Arquivos de teste que precisam rodar de novo."""
+        result = []
+        for f in test_files:
+            entry = self.entries.get(f)
+            if (entry is None or not entry['passed']
+                    or any((hashes[dep] if dep in hashes else _hash_file(self.root / dep)) != h
+                           for dep, h in entry['deps'].items())):
+                result.append(f)
+        return result
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+class _EventPlugin:
+    """Plugin do pytest que envia resultados ao processo principal."""
+
+    def __init__(self, events, target: str):
+        self.events = events
+        self.target = target
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.events.put({'event': 'error', 'target': self.target,
+                             'message': str(report.longrepr)})
+
+    def pytest_runtest_logreport(self, report):
+        # fase 'call', ou falhas/skips em setup e teardown
+        if report.when != 'call' and report.passed:
+            return
+        message = ''
+        if report.failed:
+            message = str(report.longrepr)
+        elif report.skipped and isinstance(report.longrepr, tuple):
+            message = str(report.longrepr[2])
+        self.events.put({'event': 'test', 'target': self.target, 'nodeid': report.nodeid,
+                         'outcome': report.outcome, 'duration': report.duration,
+                         'message': message})
+
+
+def _is_project_module(module, prefixes) -> bool:
+    f = getattr(module, '__file__', None)
+    return bool(f) and os.path.abspath(f).startswith(prefixes)
+
+
+def _worker_main(root: str, tasks, events, extra_args: List[str]) -> None:
+    """Laço de um processo do pool: executa alvos até receber ``None``."""
+    os.chdir(root)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    import pytest  # importado uma única vez por processo
+    try:
+        import numpy  # noqa: F401 -- dependência pesada opcional, mantida carregada
+    except ImportError:
+        pass
+    src_dir = os.path.join(root, 'src') + os.sep
+    prefixes = (src_dir, os.path.join(root, 'tests') + os.sep)
+    while True:
+        target = tasks.get()
+        if target is None:
+            return
+        for name, module in list(sys.modules.items()):
+            # inclui o pacote ``src`` deste processo, se ``root`` for outro projeto
+            if name.partition('.')[0] == 'src' or _is_project_module(module, prefixes):
+                del sys.modules[name]
+        events.put({'event': 'start', 'target': target, 'worker': os.getpid()})
+        t0 = time.perf_counter()
+        try:
+            status = int(pytest.main(['-p', 'no:terminal', '-p', 'no:cacheprovider',
+                                      *extra_args, target], plugins=[_EventPlugin(events, target)]))
+        except BaseException as e:  # erro interno do pytest: reporta e segue
+            events.put({'event': 'error', 'target': target, 'message': repr(e)})
+            status = 3
+        deps = sorted(_relpath(Path(m.__file__), Path(root)) for m in list(sys.modules.values())
+                      if _is_project_module(m, (src_dir,)))
+        events.put({'event': 'done', 'target': target, 'worker': os.getpid(), 'exitstatus': status,
+                    'duration': time.perf_counter() - t0, 'deps': deps})
+
+
+class WarmPool:
+    """Processos persistentes que executam alvos do pytest em paralelo.
+
+    Os processos são criados (com ``spawn``) sob demanda — no máximo
+    ``workers`` (padrão: número de CPUs), e nunca mais que o número de
+    alvos da execução — e reaproveitados nas seguintes; chame ``close()``
+    ao terminar. Cada processo tem sua própria fila e recebe um alvo por
+    vez, de modo que o alvo de um processo que morre (mesmo antes do
+    evento 'start') é conhecido e relatado como erro. Apenas uma execução
+    por vez é permitida.
+    """
+
+    def __init__(self, workers: Optional[int] = None, root: Path = ROOT,
+                 cache: Optional[ImpactCache] = None, extra_args: Iterable[str] = ()):
+        self.root = Path(root).resolve()
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache if cache is not None else ImpactCache(self.root)
+        self.extra_args = list(extra_args)
+        self._ctx = multiprocessing.get_context('spawn')
+        self._procs: List = []
+        self._inboxes: List = []  # fila de tarefas de cada processo, na mesma ordem
+        self._events = None
+        self._busy = threading.Lock()
+
+    def __enter__(self) -> 'WarmPool':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def start(self, count: Optional[int] = None) -> None:
+        """Garante ``min(count, workers)`` processos vivos (padrão: ``workers``)."""
+        wanted = min(self.workers, count if count is not None else self.workers)
+        if self._events is None:
+            self._events = self._ctx.Queue()
+            atexit.register(self.close)
+        while len(self._procs) < wanted:
+            self._procs.append(None)
+            self._inboxes.append(None)
+            self._spawn(len(self._procs) - 1)
+
+    def _spawn(self, i: int) -> None:
+        # não-daemon: os próprios testes podem criar processos (``parallel``)
+        tasks = self._ctx.Queue()
+        p = self._ctx.Process(target=_worker_main,
+                              args=(str(self.root), tasks, self._events, self.extra_args))
+        p.start()
+        self._procs[i], self._inboxes[i] = p, tasks
+
+    def close(self) -> None:
+        atexit.unregister(self.close)
+        for tasks in self._inboxes:
+            tasks.put(None)
+        for p in self._procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        self._procs = []
+        self._inboxes = []
+        self._events = None
+
+    def _reap(self, held: Dict[int, str]) -> List[dict]:
+        """Substitui processos mortos; retorna eventos de término dos alvos que tinham."""
+        events = []
+        for i, p in enumerate(self._procs):
+            if p.is_alive():
+                continue
+            self._spawn(i)
+            target = held.pop(i, None)
+            if target is not None:
+                events.append(_dead_worker_event(target, p.exitcode))
+        return events
+
+    def all_targets(self) -> List[str]:
+        return [_relpath(p, self.root) for p in sorted((self.root / 'tests').glob('test_*.py'))]
+
+    def changed_targets(self) -> List[str]:
+        """Arquivos de teste afetados por mudanças desde a última execução registrada."""
+        return self.cache.stale(self.all_targets(), self.cache.snapshot())
+
+    @property
+    def busy(self) -> bool:
+        return self._busy.locked()
+
+    def run(self, targets: Optional[Iterable[str]] = None, changed_only: bool = False) -> Iterator[dict]:
+        """Executa ``targets`` (padrão: todos os arquivos de teste) e produz eventos.
+
+        Com ``changed_only=True``, ``targets`` é restrito aos arquivos
+        afetados segundo o cache de impacto.
+        """
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("O pool já está executando testes")
+        try:
+            hashes = self.cache.snapshot()
+            targets = list(targets) if targets is not None else self.all_targets()
+            if changed_only:
+                stale = set(self.cache.stale({_target_file(t) for t in targets}, hashes))
+                targets = [t for t in targets if _target_file(t) in stale]
+            yield from self._run(targets, hashes)
+        finally:
+            self._busy.release()
+
+    def _run(self, targets: List[str], hashes: Dict[str, Optional[str]]) -> Iterator[dict]:
+        t0 = time.perf_counter()
+        totals = {'passed': 0, 'failed': 0, 'skipped': 0, 'errors': 0}
+        file_ok: Dict[str, bool] = {}
+        file_deps: Dict[str, set] = {}
+        todo = list(reversed(targets))
+        if targets:
+            self.start(len(targets))
+        held: Dict[int, str] = {}  # índice do processo -> alvo entregue a ele
+        pending = len(targets)
+        last_reap = time.perf_counter()
+        while pending:
+            for i in range(len(self._procs)):
+                if todo and i not in held:
+                    held[i] = todo.pop()
+                    self._inboxes[i].put(held[i])
+            try:
+                events = [self._events.get(timeout=0.5)]
+            except queue.Empty:
+                events = []
+            if not events or time.perf_counter() - last_reap > 0.5:
+                events += self._reap(held)
+                last_reap = time.perf_counter()
+            for event in events:
+                kind = event['event']
+                target_file = _target_file(event['target'])
+                if kind == 'test':
+                    totals[event['outcome']] = totals.get(event['outcome'], 0) + 1
+                elif kind == 'error':
+                    totals['errors'] += 1
+                elif kind == 'done':
+                    if 'worker' in event:
+                        i = next((i for i, p in enumerate(self._procs) if p.pid == event['worker']), None)
+                        if i is None or held.get(i) != event['target']:
+                            continue  # alvo já dado como perdido com o processo
+                        del held[i]
+                    pending -= 1
+                    if 'message' in event:
+                        totals['errors'] += 1
+                    # 5 = nenhum teste coletado (por exemplo, só benchmarks desmarcados)
+                    ok = event['exitstatus'] in (0, 5)
+                    file_ok[target_file] = file_ok.get(target_file, True) and ok
+                    file_deps.setdefault(target_file, set()).update(event.pop('deps'))
+                yield event
+        for f, ok in file_ok.items():
+            self.cache.record(f, file_deps[f], ok, hashes)
+        if file_ok:
+            self.cache.save()
+        yield dict(event='summary', duration=time.perf_counter() - t0, targets=len(targets), **totals)
+
+
+def _dead_worker_event(target: str, exitcode) -> dict:
+    return {'event': 'done', 'target': target, 'exitstatus': 3, 'duration': 0.0, 'deps': [],
+            'message': f'processo de teste terminou inesperadamente (código {exitcode})'}
+
+
+def format_event(event: dict) -> Optional[str]:
+    """Texto de um evento para exibição (None para eventos silenciosos)."""
+    kind = event['event']
+    if kind == 'test':
+        line = f"{event['outcome'].upper():<8} {event['nodeid']} ({event['duration'] * 1e3:.0f} ms)\n"
+        if event['outcome'] == 'failed' and event['message']:
+            line += event['message'] + '\n'
+        return line
+    if kind == 'error' or (kind == 'done' and 'message' in event):
+        return f"ERRO     {event['target']}\n{event['message']}\n"
+    if kind == 'summary':
+        return (f"{event['passed']} passaram, {event['failed']} falharam, {event['skipped']} pulados, "
+                f"{event['errors']} erros em {event['targets']} alvos ({event['duration']:.2f} s)\n")
+    return None
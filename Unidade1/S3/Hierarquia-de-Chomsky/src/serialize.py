@@ -0,0 +1,315 @@
+"""Formato binário versionado para autômatos compilados (AFD, APD e MT).
+
+Layout (inteiros little-endian)::
+
+    cabeçalho   '<4sHBBII'  magia b'AUTM', versão, tipo (1=AFD, 2=APD, 3=MT),
+                            reservado, tamanho do JSON, número de arrays
+    diretório   '<8scxxxxxxxQQ' por array: nome, typecode de ``array``,
+                            deslocamento no arquivo, número de itens
+    metadados   JSON (UTF-8): escalares e nomes (estados, símbolos)
+    arrays      dados brutos, cada um alinhado em 8 bytes
+
+``load`` mapeia o arquivo com ``mmap`` e entrega os arrays como
+``memoryview`` sobre o mapeamento, sem cópia: vários processos que
+carregam o mesmo arquivo compartilham as mesmas páginas do cache do
+sistema. Tabelas de AFD/MT maiores que ``LIST_COPY_LIMIT`` entradas são
+usadas direto do mapeamento pelo laço de execução; as menores ganham a
+cópia em lista de sempre (mais rápida de indexar). O APD guarda suas ações
+como tuplas, então é decodificado para a forma em memória ao carregar.
+``load_arrays(..., numpy=True)`` devolve os arrays como ``numpy.ndarray``
+(``frombuffer``, também sem cópia).
+
+``CompileCache`` guarda autômatos compilados num diretório, com o nome do
+arquivo dado pelo hash do conteúdo da especificação (argumentos do
+construtor): compilar de novo a mesma especificação só carrega o arquivo.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+from .dfa import DFA
+from .pda import DPDA
+from .tm import TuringMachine
+
+MAGIC = b'AUTM'
+VERSION = 1
+
+KIND_DFA, KIND_PDA, KIND_TM = 1, 2, 3
+_KINDS = {DFA: KIND_DFA, DPDA: KIND_PDA, TuringMachine: KIND_TM}
+
+_HEADER = struct.Struct('<4sHBBII')
+_ENTRY = struct.Struct('<8scxxxxxxxQQ')
+
+_NUMPY_TYPES = {'b': 'i1', 'B': 'u1', 'i': '<i4', 'I': '<u4'}
+
+Automaton = Union[DFA, DPDA, TuringMachine]
+
+
+# --- nomes de estados e símbolos no JSON ---
+
+def _encode_name(name: Hashable) -> Any:
+    if name is None or isinstance(name, (bool, int, float, str)):
+        return name
+    if isinstance(name, tuple):
+        return {'t': [_encode_name(x) for x in name]}
+    if isinstance(name, frozenset):
+        return {'s': sorted((_encode_name(x) for x in name), key=repr)}
+    return str(name)
+
+
+def _decode_name(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        if 't' in value:
+            return tuple(_decode_name(x) for x in value['t'])
+        return frozenset(_decode_name(x) for x in value['s'])
+    return value
+
+
+# --- conversão de cada tipo de autômato em (metadados, arrays) ---
+
+def _dfa_parts(dfa: DFA) -> Tuple[dict, Dict[str, array]]:
+    meta = {'alphabet': list(dfa.alphabet), 'start': dfa.start}
+    arrays = {'table': array('i', dfa.table), 'accept': array('B', dfa.accepting),
+              'classmap': array('B', dfa.classmap)}
+    return meta, arrays
+
+
+def _dfa_build(meta: dict, arrays: Dict[str, memoryview], names: List[Hashable]) -> DFA:
+    classmap = arrays.get('classmap')
+    return DFA.from_table(bytes(meta['alphabet']), arrays['table'], meta['start'],
+                          bytes(arrays['accept']), names,
+                          classmap=bytes(classmap) if classmap is not None else None)
+
+
+def _pda_parts(pda: DPDA) -> Tuple[dict, Dict[str, array]]:
+    nxt, pop, push_at, push = array('i'), array('B'), array('I', [0]), bytearray()
+    for act in pda.table:
+        if act is None:
+            nxt.append(-1)
+            pop.append(0)
+        else:
+            nxt.append(act[0])
+            pop.append(act[1])
+            push += act[2]
+        push_at.append(len(push))
+    meta = {
+        'alphabet': list(pda.alphabet), 'stack_symbols': [_encode_name(s) for s in pda.stack_symbols],
+        'start': pda.start, 'start_stack': pda.start_stack, 'accept_by': pda.accept_by,
+    }
+    arrays = {
+        'next': nxt, 'pop': pop, 'push_at': push_at, 'push': array('B', push),
+        'accept': array('B', pda.accepting),
+    }
+    return meta, arrays
+
+
+def _pda_build(meta: dict, arrays: Dict[str, memoryview], names: List[Hashable]) -> DPDA:
+    nxt, pop, push_at, push = arrays['next'], arrays['pop'], arrays['push_at'], bytes(arrays['push'])
+    table = [None if nxt[i] < 0 else (nxt[i], pop[i], push[push_at[i]:push_at[i + 1]])
+             for i in range(len(nxt))]
+    return DPDA.from_table(bytes(meta['alphabet']), [_decode_name(s) for s in meta['stack_symbols']],
+                           table, meta['start'], meta['start_stack'], bytes(arrays['accept']),
+                           meta['accept_by'], names)
+
+
+def _tm_parts(tm: TuringMachine) -> Tuple[dict, Dict[str, array]]:
+    meta = {'symbols': tm.symbols, 'blank': tm.blank, 'tapes': tm.n_tapes, 'start': tm.start}
+    arrays = {'next': array('i', tm.next), 'write': array('B', tm.write),
+              'move': array('b', tm.move), 'accept': array('B', tm.accepting)}
+    return meta, arrays
+
+
+def _tm_build(meta: dict, arrays: Dict[str, memoryview], names: List[Hashable]) -> TuringMachine:
+    tm = TuringMachine.__new__(TuringMachine)
+    tm.names = names
+    tm.symbols = meta['symbols']
+    tm.blank = meta['blank']
+    tm.n_tapes = meta['tapes']
+    m = tm.m = len(tm.symbols)
+    encode = bytearray([255]) * 256
+    for i, c in enumerate(tm.symbols):
+        encode[ord(c)] = i
+    tm._encode = bytes(encode)
+    tm._decode = bytes(ord(c) for c in tm.symbols) + bytes(256 - m)
+    tm.next, tm.write, tm.move = arrays['next'], arrays['write'], arrays['move']
+    tm.start = meta['start']
+    tm.accepting = bytearray(arrays['accept'])
+    tm._compile()
+    return tm
+
+
+_PARTS = {KIND_DFA: _dfa_parts, KIND_PDA: _pda_parts, KIND_TM: _tm_parts}
+_BUILD = {KIND_DFA: _dfa_build, KIND_PDA: _pda_build, KIND_TM: _tm_build}
+
+
+# --- leitura e escrita ---
+
+def dumps(automaton: Automaton) -> bytes:
+    """Serializa ``automaton`` no formato binário."""
+    kind = _KINDS.get(type(automaton))
+    if kind is None:
+        raise ValueError(f"Tipo de autômato não serializável: {type(automaton).__name__}")
+    meta, arrays = _PARTS[kind](automaton)
+    meta['names'] = [_encode_name(n) for n in automaton.names]
+    blob = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+
+    offset = _HEADER.size + _ENTRY.size * len(arrays) + len(blob)
+    entries, chunks = [], []
+    for name, arr in arrays.items():
+        pad = -offset % 8
+        offset += pad
+        if sys.byteorder != 'little':
+            arr = array(arr.typecode, arr)
+            arr.byteswap()
+        data = arr.tobytes()
+        entries.append(_ENTRY.pack(name.encode('ascii'), arr.typecode.encode('ascii'), offset, len(arr)))
+        chunks.append(b'\0' * pad + data)
+        offset += len(data)
+    header = _HEADER.pack(MAGIC, VERSION, kind, 0, len(blob), len(arrays))
+    return b''.join([header, *entries, blob, *chunks])
+
+
+def dump(automaton: Automaton, path) -> None:
+    """Grava ``automaton`` em ``path`` (de forma atômica: arquivo temporário + rename)."""
+    path = Path(path)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(dumps(automaton))
+    os.replace(tmp, path)
+
+
+def _parse(buf) -> Tuple[int, dict, Dict[str, Tuple[str, int, int]]]:
+    if len(buf) < _HEADER.size:
+        raise ValueError("Arquivo de autômato truncado")
+    magic, version, kind, _, meta_len, count = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo não é um autômato serializado")
+    if version != VERSION:
+        raise ValueError(f"Versão de formato não suportada: {version}")
+    if kind not in _BUILD:
+        raise ValueError(f"Tipo de autômato desconhecido: {kind}")
+    if len(buf) < _HEADER.size + count * _ENTRY.size + meta_len:
+        raise ValueError("Arquivo de autômato truncado")
+    directory = {}
+    pos = _HEADER.size
+    for _ in range(count):
+        name, typecode, offset, n = _ENTRY.unpack_from(buf, pos)
+        typecode = typecode.decode('ascii')
+        if offset + n * array(typecode).itemsize > len(buf):
+            raise ValueError("Arquivo de autômato truncado")
+        directory[name.rstrip(b'\0').decode('ascii')] = (typecode, offset, n)
+        pos += _ENTRY.size
+    meta = json.loads(bytes(buf[pos:pos + meta_len]).decode('utf-8'))
+    return kind, meta, directory
+
+
+def _views(buf, directory) -> Dict[str, Any]:
+    view = memoryview(buf)
+    arrays = {}
+    for name, (typecode, offset, n) in directory.items():
+        size = array(typecode).itemsize
+        if sys.byteorder != 'little' and size > 1:
+            arr = array(typecode, view[offset:offset + n * size].tobytes())
+            arr.byteswap()
+            arrays[name] = arr
+        else:
+            arrays[name] = view[offset:offset + n * size].cast(typecode)
+    return arrays
+
+
+def _map(path) -> mmap.mmap:
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def loads(data: bytes) -> Automaton:
+    """Reconstrói um autômato a partir de ``dumps``."""
+    kind, meta, directory = _parse(data)
+    names = [_decode_name(n) for n in meta['names']]
+    return _BUILD[kind](meta, _views(data, directory), names)
+
+
+def load(path) -> Automaton:
+    """Carrega um autômato de ``path`` via ``mmap`` (arrays sem cópia)."""
+    mm = _map(path)
+    kind, meta, directory = _parse(mm)
+    names = [_decode_name(n) for n in meta['names']]
+    return _BUILD[kind](meta, _views(mm, directory), names)
+
+
+def load_arrays(path, numpy: bool = False) -> Tuple[int, dict, Dict[str, Any]]:
+    """Retorna ``(tipo, metadados, arrays)`` sem construir o autômato.
+
+    Os arrays são ``memoryview`` sobre o arquivo mapeado, ou ``numpy.ndarray``
+    somente-leitura com ``numpy=True`` — em ambos os casos, sem cópia.
+    """
+    mm = _map(path)
+    kind, meta, directory = _parse(mm)
+    if not numpy:
+        return kind, meta, _views(mm, directory)
+    import numpy as np
+    arrays = {name: np.frombuffer(mm, dtype=_NUMPY_TYPES[typecode], count=n, offset=offset)
+              for name, (typecode, offset, n) in directory.items()}
+    return kind, meta, arrays
+
+
+# --- cache de compilação ---
+
+def _canonical(obj: Any) -> Any:
+    """Forma determinística de uma especificação (para o hash)."""
+    if isinstance(obj, dict):
+        return ['dict', sorted(([_canonical(k), _canonical(v)] for k, v in obj.items()), key=repr)]
+    if isinstance(obj, (set, frozenset)):
+        return ['set', sorted((_canonical(x) for x in obj), key=repr)]
+    if isinstance(obj, (list, tuple)):
+        return ['seq', [_canonical(x) for x in obj]]
+    if isinstance(obj, (bytes, bytearray)):
+        return ['bytes', list(obj)]
+    return obj
+
+
+def spec_hash(cls: type, spec: Dict[str, Any]) -> str:
+    """Hash SHA-256 de uma especificação (classe + argumentos do construtor)."""
+    text = repr([VERSION, cls.__name__, _canonical(spec)])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class CompileCache:
+    """Diretório de autômatos compilados, indexado pelo hash da especificação.
+
+    ``cache.compile(DFA, states=..., alphabet=..., ...)`` recebe a classe e
+    os mesmos argumentos nomeados do construtor; se o arquivo
+    correspondente existe, ele é carregado com ``load`` (``mmap``); senão o
+    autômato é compilado e gravado.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, cls: type, spec: Dict[str, Any]) -> Path:
+        return self.directory / f'{spec_hash(cls, spec)}.autm'
+
+    def compile(self, cls: type, **spec) -> Automaton:
+        if cls not in _KINDS:
+            raise ValueError(f"Tipo de autômato não serializável: {cls.__name__}")
+        path = self.path_for(cls, spec)
+        try:
+            automaton = load(path)
+        except (OSError, ValueError):
+            pass  # ausente ou corrompido: compila de novo
+        else:
+            self.hits += 1
+            return automaton
+        self.misses += 1
+        automaton = cls(**spec)
+        dump(automaton, path)
+        return automaton
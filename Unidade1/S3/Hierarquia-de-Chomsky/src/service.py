@@ -0,0 +1,391 @@
+"""Serviço asyncio de verificação de pertinência, com micro-lotes.
+
+Clientes conectam por TCP ou socket Unix e enviam pedidos
+``<comando> <cadeia>`` (comandos: ``dfa``, ``pda``, ``tm``, como na CLI),
+em um de dois enquadramentos:
+
+- ``'line'``: um pedido por linha (``\\n``); a resposta é uma linha;
+- ``'length'``: cada mensagem precedida do tamanho em 4 bytes big-endian
+  (permite ``\\n`` e bytes quaisquer na cadeia).
+
+Respostas: ``1``/``0`` (veredito), a saída da MT, ``erro`` (entrada
+inválida para a MT) ou ``erro: <motivo>``. Um cliente pode enviar vários
+pedidos sem esperar (pipelining); as respostas saem na ordem dos pedidos.
+
+Pedidos concorrentes de todos os clientes vão para uma fila por comando;
+um laço por comando junta o que chegar em até ``max_delay`` segundos (ou
+``max_batch`` pedidos) e avalia o lote com uma única chamada — no próprio
+processo ou, com ``workers > 0``, num ``ProcessPoolExecutor`` (até
+``workers`` lotes em paralelo; enquanto estão ocupados, a fila acumula e
+os lotes crescem).
+
+Sob sobrecarga, as filas são limitadas: com ``overload='wait'`` a leitura
+do cliente para até haver espaço (e o TCP propaga a pressão ao cliente);
+com ``'reject'`` o pedido é respondido com ``erro: ocupado``. Cada conexão
+tem ainda no máximo ``max_inflight`` pedidos sem resposta.
+
+``stats()`` traz latência (p50/p99, do pedido lido até o resultado) e
+tamanhos de lote. Uso: ``python -m src.service --port 8765``.
+"""
+
+import asyncio
+import struct
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .bench import percentile
+
+# Pedidos por lote e espera máxima para completar um lote (s).
+MAX_BATCH = 512
+MAX_DELAY = 0.002
+
+# Pedidos aguardando lote, por comando, e pedidos sem resposta por conexão.
+MAX_QUEUE = 10_000
+MAX_INFLIGHT = 1024
+
+# Maior mensagem aceita (bytes); maior, a conexão é encerrada.
+MAX_FRAME = 1 << 20
+
+# Latências e tamanhos de lote guardados para os percentis (os mais recentes).
+STATS_SAMPLES = 100_000
+
+_LENGTH = struct.Struct('>I')
+
+BatchFn = Callable[[List[bytes]], List[Any]]
+
+
+def _dfa_batch(items: List[bytes]) -> List[bool]:
+    from .exercises import get_even_a_dfa
+    dfa = get_even_a_dfa()
+    if any(b'\n' in s for s in items):
+        return [dfa.accepts(s) for s in items]
+    return dfa.accepts_lines(b'\n'.join(items))
+
+
+def _pda_batch(items: List[bytes]) -> List[bool]:
+    from .exercises import get_an_bn_pda
+    accepts = get_an_bn_pda().accepts
+    return [accepts(s) for s in items]
+
+
+def _tm_batch(items: List[bytes]) -> List[Optional[bytes]]:
+    from .exercises import tm_increment_binary
+    results = []
+    for s in items:
+        try:
+            results.append(tm_increment_binary(s.decode('latin-1')).encode('latin-1'))
+        except ValueError:
+            results.append(None)
+    return results
+
+
+CHECKERS: Dict[str, BatchFn] = {
+    'dfa': _dfa_batch,
+    'pda': _pda_batch,
+    'tm': _tm_batch,
+}
+
+
+class ServiceBusy(RuntimeError):
+    """Fila cheia com ``overload='reject'``."""
+
+
+def _encode_result(result: Any) -> bytes:
+    if result is True:
+        return b'1'
+    if result is False:
+        return b'0'
+    if result is None:
+        return b'erro'
+    if isinstance(result, BaseException):
+        return f'erro: {result}'.encode('utf-8', errors='replace')
+    return bytes(result)
+
+
+class ServiceStats:
+    """Contadores e amostras de latência e tamanho de lote."""
+
+    def __init__(self, samples: int = STATS_SAMPLES):
+        self.requests = 0
+        self.batches = 0
+        self.rejected = 0
+        self.failed = 0
+        self.latencies: Deque[float] = deque(maxlen=samples)
+        self.batch_sizes: Deque[int] = deque(maxlen=samples)
+
+    def summary(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+        sizes = sorted(self.batch_sizes)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'rejected': self.rejected,
+            'failed': self.failed,
+            'latency_p50_ms': percentile(lat, 50) * 1000 if lat else 0.0,
+            'latency_p99_ms': percentile(lat, 99) * 1000 if lat else 0.0,
+            'batch_p50': percentile(sizes, 50) if sizes else 0.0,
+            'batch_p99': percentile(sizes, 99) if sizes else 0.0,
+            'batch_max': sizes[-1] if sizes else 0,
+            'batch_mean': self.requests / self.batches if self.batches else 0.0,
+        }
+
+
+class _Batcher:
+    """Fila e laço de micro-lotes de um comando."""
+
+    def __init__(self, service: 'MembershipService', fn: BatchFn):
+        self.service = service
+        self.fn = fn
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=service.max_queue)
+        self._slots = asyncio.Semaphore(max(service.workers, 1))
+        self._tasks = set()
+        self.task = asyncio.ensure_future(self._loop())
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue, svc = self.queue, self.service
+        while True:
+            await self._slots.acquire()
+            batch = [await queue.get()]
+            deadline = loop.time() + svc.max_delay
+            while len(batch) < svc.max_batch:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.ensure_future(self._evaluate(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _evaluate(self, batch: List[Tuple[bytes, asyncio.Future, float]]) -> None:
+        loop = asyncio.get_running_loop()
+        svc, stats = self.service, self.service.stats
+        inputs = [item[0] for item in batch]
+        try:
+            if svc.pool is not None:
+                results = await loop.run_in_executor(svc.pool, self.fn, inputs)
+            else:
+                results = self.fn(inputs)
+        except Exception as e:  # o lote inteiro falha, o serviço continua
+            stats.failed += len(batch)
+            results = [e] * len(batch)
+        finally:
+            self._slots.release()
+        now = loop.time()
+        for (_, fut, started), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+            stats.latencies.append(now - started)
+        stats.requests += len(batch)
+        stats.batches += 1
+        stats.batch_sizes.append(len(batch))
+
+    async def close(self) -> None:
+        self.task.cancel()
+        for task in list(self._tasks):
+            await asyncio.gather(task, return_exceptions=True)
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
+class MembershipService:
+    """Servidor de pertinência com micro-lotes (veja a documentação do módulo).
+
+    ``checkers`` mapeia o nome do comando para uma função de lote
+    ``lista de bytes -> lista de resultados`` (com ``workers > 0``, ela
+    precisa ser serializável por ``pickle``, isto é, definida em módulo).
+    """
+
+    def __init__(self, checkers: Optional[Dict[str, BatchFn]] = None, framing: str = 'line',
+                 max_batch: int = MAX_BATCH, max_delay: float = MAX_DELAY, max_queue: int = MAX_QUEUE,
+                 max_inflight: int = MAX_INFLIGHT, workers: int = 0, overload: str = 'wait'):
+        if framing not in ('line', 'length'):
+            raise ValueError("framing deve ser 'line' ou 'length'")
+        if overload not in ('wait', 'reject'):
+            raise ValueError("overload deve ser 'wait' ou 'reject'")
+        if max_batch < 1 or max_queue < 1 or max_inflight < 1 or max_delay < 0 or workers < 0:
+            raise ValueError("Limites do serviço devem ser positivos")
+        self.checkers = dict(CHECKERS if checkers is None else checkers)
+        self.framing = framing
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.max_inflight = max_inflight
+        self.workers = workers
+        self.overload = overload
+        self.stats = ServiceStats()
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._batchers: Dict[str, _Batcher] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start(self) -> None:
+        """Cria as filas (e o pool de processos); chamado pelos ``serve_*``."""
+        if self._batchers:
+            return
+        if self.workers:
+            self.pool = ProcessPoolExecutor(self.workers)
+        self._batchers = {name: _Batcher(self, fn) for name, fn in self.checkers.items()}
+
+    async def serve_tcp(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        await self.start()
+        server = await asyncio.start_server(self._handle, host, port, limit=MAX_FRAME + 1)
+        self._servers.append(server)
+        return server
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        await self.start()
+        server = await asyncio.start_unix_server(self._handle, path, limit=MAX_FRAME + 1)
+        self._servers.append(server)
+        return server
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        for batcher in self._batchers.values():
+            await batcher.close()
+        self._batchers.clear()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    async def _submit(self, command: str, data: bytes) -> asyncio.Future:
+        """Enfileira um pedido; o futuro recebe o resultado do lote."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        batcher = self._batchers.get(command)
+        if batcher is None:
+            fut.set_result(ValueError(f'comando desconhecido {command!r}'))
+            return fut
+        item = (data, fut, loop.time())
+        if self.overload == 'reject':
+            try:
+                batcher.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.stats.rejected += 1
+                fut.set_result(ServiceBusy('ocupado'))
+        else:
+            await batcher.queue.put(item)
+        return fut
+
+    async def check(self, command: str, data: bytes) -> Any:
+        """Resultado de um pedido feito dentro do processo (passa pelos mesmos lotes)."""
+        result = await (await self._submit(command, data))
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        if self.framing == 'line':
+            line = await reader.readline()
+            if not line:
+                return None
+            if line.endswith(b'\n'):
+                line = line[:-2] if line.endswith(b'\r\n') else line[:-1]
+            return line
+        try:
+            header = await reader.readexactly(_LENGTH.size)
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                raise ValueError('mensagem truncada') from None
+            return None
+        (size,) = _LENGTH.unpack(header)
+        if size > MAX_FRAME:
+            raise ValueError('mensagem grande demais')
+        return await reader.readexactly(size)
+
+    def _frame(self, body: bytes) -> bytes:
+        if self.framing == 'line':
+            return body + b'\n'
+        return _LENGTH.pack(len(body)) + body
+
+    async def _write_responses(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        while True:
+            fut = await pending.get()
+            if fut is None:
+                break
+            writer.write(self._frame(_encode_result(await fut)))
+            if pending.empty():
+                await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.max_inflight)
+        responder = asyncio.ensure_future(self._write_responses(pending, writer))
+        try:
+            while not responder.done():
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                command, _, data = request.partition(b' ')
+                await pending.put(await self._submit(command.decode('latin-1'), data))
+        except (ValueError, asyncio.LimitOverrunError, asyncio.IncompleteReadError) as e:
+            fut = asyncio.get_running_loop().create_future()
+            fut.set_result(ValueError(str(e) or 'mensagem inválida'))
+            await pending.put(fut)
+        except ConnectionError:
+            pass
+        finally:
+            if not responder.done():
+                await pending.put(None)
+            await asyncio.gather(responder, return_exceptions=True)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def main(argv=None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m src.service',
+                                     description='Serviço de verificação de cadeias com micro-lotes.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='CAMINHO', help='escuta num socket Unix em vez de TCP')
+    parser.add_argument('--framing', choices=('line', 'length'), default='line')
+    parser.add_argument('--workers', type=int, default=0, help='processos para avaliar lotes (0 = no próprio processo)')
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    parser.add_argument('--max-delay-ms', type=float, default=MAX_DELAY * 1000)
+    parser.add_argument('--max-queue', type=int, default=MAX_QUEUE)
+    parser.add_argument('--overload', choices=('wait', 'reject'), default='wait')
+    parser.add_argument('--stats-every', type=float, default=0, metavar='S',
+                        help='imprime estatísticas a cada S segundos (0 = só ao encerrar)')
+    args = parser.parse_args(argv)
+
+    service = MembershipService(framing=args.framing, max_batch=args.max_batch,
+                                max_delay=args.max_delay_ms / 1000, max_queue=args.max_queue,
+                                workers=args.workers, overload=args.overload)
+
+    async def run() -> None:
+        if args.unix:
+            server = await service.serve_unix(args.unix)
+        else:
+            server = await service.serve_tcp(args.host, args.port)
+        where = ', '.join(str(s.getsockname()) for s in server.sockets)
+        print(f'escutando em {where} ({args.framing})', file=sys.stderr)
+        try:
+            while True:
+                await asyncio.sleep(args.stats_every or 3600)
+                if args.stats_every:
+                    print(service.stats.summary(), file=sys.stderr)
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    print(service.stats.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Execução incremental (em fluxo) dos autômatos sobre entrada em blocos.
+
+Os *runners* guardam apenas a configuração corrente do autômato — o estado
+do AFD, o estado e a pilha compacta do APD, ou a fase e o contador do AP de
+``a^n b^n`` — e recebem a entrada
+aos pedaços com ``feed(chunk)``. A qualquer momento ``accepting`` dá o
+veredito parcial (aceitaria se a entrada terminasse ali) e ``finish()`` o
+veredito final.
+
+Os auxiliares ``iter_file_chunks`` (arquivo via ``mmap``),
+``iter_reader_chunks`` (qualquer objeto com ``readinto``, como
+``sys.stdin.buffer``) e ``iter_socket_chunks`` produzem blocos sem carregar
+a entrada inteira em memória.
+"""
+
+import mmap
+from typing import Iterable, Iterator, Tuple, Union
+
+from .dfa import DFA, Input, as_bytes
+from .pda import DPDA, STUCK
+
+# Tamanho padrão dos blocos lidos de arquivos e sockets.
+CHUNK_SIZE = 1 << 20
+
+Runner = Union['DFARunner', 'PDARunner', 'AnBnRunner']
+
+
+class DFARunner:
+    """Executa um ``DFA`` de forma incremental."""
+
+    def __init__(self, dfa: DFA):
+        self.dfa = dfa
+        self.state = dfa.start
+        self.consumed = 0
+        # só há atalho se o AFD tiver um estado morto de fato
+        self._sink = dfa.sink_state()
+
+    def feed(self, chunk: Input) -> None:
+        self.consumed += len(chunk)
+        if self.state != self._sink:
+            self.state = self.dfa.run(chunk, self.state)
+
+    @property
+    def accepting(self) -> bool:
+        return self.dfa.accepting[self.state] == 1
+
+    @property
+    def rejected(self) -> bool:
+        """True se nenhuma continuação da entrada pode mais ser aceita."""
+        return self.state == self._sink
+
+    def finish(self) -> bool:
+        return self.accepting
+
+
+class PDARunner:
+    """Executa um ``DPDA`` de forma incremental (estado + pilha ``array('B')``)."""
+
+    def __init__(self, pda: DPDA):
+        self.pda = pda
+        self.state = pda.start
+        self.stack = pda.new_stack()
+        self.consumed = 0
+
+    def feed(self, chunk: Input) -> None:
+        self.consumed += len(chunk)
+        self.state = self.pda.run(chunk, self.state, self.stack)
+
+    @property
+    def accepting(self) -> bool:
+        # ``close`` segue transições ε: trabalha sobre uma cópia da pilha
+        return self.pda.close(self.state, self.stack[:])
+
+    @property
+    def rejected(self) -> bool:
+        return self.state == STUCK
+
+    def finish(self) -> bool:
+        return self.pda.close(self.state, self.stack)
+
+
+class AnBnRunner:
+    """Reconhecedor incremental de ``a^n b^n`` (mesma linguagem de ``pda_an_bn``).
+
+    Guarda só a fase (lendo 'a' ou lendo 'b') e a altura da pilha, que no
+    AP desta linguagem é um contador. Cada bloco é consumido com
+    ``bytes.lstrip``, sem laço por caractere em Python.
+    """
+
+    def __init__(self):
+        self.reading_a = True
+        self.count = 0
+        self.failed = False
+        self.consumed = 0
+
+    def feed(self, chunk: Input) -> None:
+        self.consumed += len(chunk)
+        if self.failed:
+            return
+        buf = as_bytes(chunk)
+        if buf is None:
+            self.failed = True
+            return
+        buf = bytes(buf)
+        if self.reading_a:
+            rest = buf.lstrip(b'a')
+            self.count += len(buf) - len(rest)
+            if not rest:
+                return
+            self.reading_a = False
+            buf = rest
+        rest = buf.lstrip(b'b')
+        self.count -= len(buf) - len(rest)
+        if rest or self.count < 0:
+            self.failed = True
+
+    @property
+    def accepting(self) -> bool:
+        return not self.failed and self.count == 0
+
+    @property
+    def rejected(self) -> bool:
+        return self.failed
+
+    def finish(self) -> bool:
+        return self.accepting
+
+
+def iter_file_chunks(path, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Percorre um arquivo mapeado em memória (``mmap``) bloco a bloco.
+
+    Só um bloco por vez é copiado para fora do mapeamento; as páginas do
+    arquivo ficam no cache do sistema operacional, não no processo.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # arquivo vazio não pode ser mapeado
+        with mm:
+            for i in range(0, len(mm), chunk_size):
+                yield mm[i:i + chunk_size]
+
+
+def iter_reader_chunks(reader, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """Lê blocos de ``reader`` (arquivo binário, pipe...) reaproveitando um buffer.
+
+    Cada fatia produzida só é válida até o próximo passo do iterador.
+    """
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    while True:
+        n = reader.readinto(buf)
+        if not n:
+            return
+        yield view[:n]
+
+
+def iter_socket_chunks(sock, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """Recebe blocos de um socket até o fechamento da conexão (``recv_into``)."""
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    while True:
+        n = sock.recv_into(buf)
+        if not n:
+            return
+        yield view[:n]
+
+
+def verdicts(runner: Runner, chunks: Iterable[Input]) -> Iterator[Tuple[int, bool]]:
+    """Alimenta ``runner`` e produz ``(bytes_consumidos, veredito_parcial)`` por bloco."""
+    for chunk in chunks:
+        runner.feed(chunk)
+        yield runner.consumed, runner.accepting
+
+
+def run_chunks(runner: Runner, chunks: Iterable[Input]) -> bool:
+    """Consome todos os blocos e retorna o veredito final.
+
+    Para de ler assim que a rejeição é definitiva.
+    """
+    for chunk in chunks:
+        runner.feed(chunk)
+        if runner.rejected:
+            break
+    return runner.finish()
+
+
+def run_file(runner: Runner, path, chunk_size: int = CHUNK_SIZE) -> bool:
+    """Valida o conteúdo de um arquivo (via ``mmap``) sem carregá-lo em memória."""
+    return run_chunks(runner, iter_file_chunks(path, chunk_size))
@@ -0,0 +1,492 @@
+"""Motor genérico de Máquina de Turing (uma ou várias fitas).
+
+A máquina é dada por estados, alfabeto da fita, transições e estado
+inicial. Na compilação:
+
+- símbolos viram ids de um byte (o branco é sempre o id 0) e a chave de
+  despacho é ``estado * m**k + Σ símbolo_i * m**i`` (``m`` símbolos,
+  ``k`` fitas);
+- para uma fita, as ações ficam em três vetores paralelos (próximo estado
+  já multiplicado por ``m``, símbolo escrito e deslocamento), de modo que
+  cada passo são três consultas indexadas por inteiro.
+
+A ``Tape`` é bi-infinita: um ``bytearray`` com a posição da origem, que
+cresce geometricamente em qualquer das pontas — estender à esquerda custa
+O(1) amortizado, ao contrário de ``list.insert(0, ...)``.
+
+``TuringMachine.run_accelerated`` executa máquinas de uma fita em
+*macro-passos* sobre uma ``RunTape`` (fita codificada por carreiras): quando
+a transição corrente mantém o estado e move a cabeça, a máquina varreria
+toda a carreira de símbolos iguais à frente, e isso é feito de uma vez.
+Cadeias longas de "vai um" e varreduras custam O(carreiras), não O(passos).
+"""
+
+import re
+from array import array
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from .instrument import Stats
+
+BLANK = '_'
+
+MOVES = {'L': -1, 'R': 1, 'S': 0}
+
+# Crescimento mínimo da fita, em células.
+MIN_GROWTH = 64
+
+# Tabelas ``memoryview`` com mais entradas que isto não são copiadas para
+# listas em ``_compile`` (veja ``dfa.LIST_COPY_LIMIT``).
+LIST_COPY_LIMIT = 1 << 22
+
+
+class Tape:
+    """Fita bi-infinita de ids de símbolos (0 = branco)."""
+
+    def __init__(self, content: bytes = b''):
+        self.buf = bytearray(content)
+        self.origin = 0  # índice em ``buf`` da célula 0
+
+    def grow_left(self, at_least: int = 1) -> int:
+        """Acrescenta brancos à esquerda; retorna quantas células foram criadas."""
+        n = max(at_least, len(self.buf), MIN_GROWTH)
+        self.buf[0:0] = bytes(n)
+        self.origin += n
+        return n
+
+    def grow_right(self, at_least: int = 1) -> None:
+        self.buf.extend(bytes(max(at_least, len(self.buf), MIN_GROWTH)))
+
+    def read(self, pos: int) -> int:
+        i = self.origin + pos
+        return self.buf[i] if 0 <= i < len(self.buf) else 0
+
+    def write(self, pos: int, sym: int) -> None:
+        i = self.origin + pos
+        if i < 0:
+            i += self.grow_left(-i)
+        elif i >= len(self.buf):
+            self.grow_right(i - len(self.buf) + 1)
+        self.buf[i] = sym
+
+    def span(self) -> Tuple[int, int]:
+        """Intervalo ``[início, fim)`` de posições fora do qual só há brancos."""
+        used = len(self.buf.strip(b'\x00'))
+        if not used:
+            return 0, 0
+        lead = len(self.buf) - len(self.buf.lstrip(b'\x00'))
+        return lead - self.origin, lead + used - self.origin
+
+    def cells(self) -> bytes:
+        """Conteúdo entre a primeira e a última célula não branca."""
+        return bytes(self.buf.strip(b'\x00'))
+
+
+class RunTape:
+    """Fita codificada por carreiras ``[símbolo, quantidade]`` em duas pilhas.
+
+    ``left[-1]`` é a carreira imediatamente à esquerda da cabeça e
+    ``right[-1]`` a carreira que começa na célula sob a cabeça; além das
+    pilhas, só há brancos (que nunca são guardados nas pontas).
+    """
+
+    def __init__(self, runs: Iterable[Tuple[int, int]] = ()):
+        self.left: List[List[int]] = []
+        self.right: List[List[int]] = []
+        for sym, count in reversed(list(runs)):
+            self.push(self.right, sym, count)
+
+    @staticmethod
+    def push(stack: List[List[int]], sym: int, count: int) -> None:
+        if not count or (not stack and sym == 0):
+            return
+        if stack and stack[-1][0] == sym:
+            stack[-1][1] += count
+        else:
+            stack.append([sym, count])
+
+    @staticmethod
+    def take(stack: List[List[int]], count: int) -> None:
+        """Remove ``count`` células do topo (todas da mesma carreira)."""
+        if stack:
+            top = stack[-1]
+            top[1] -= count
+            if top[1] <= 0:
+                stack.pop()
+
+    def head(self) -> int:
+        return self.right[-1][0] if self.right else 0
+
+    def step_left(self) -> None:
+        """Move a cabeça uma célula à esquerda."""
+        sym = self.left[-1][0] if self.left else 0
+        self.take(self.left, 1)
+        self.push(self.right, sym, 1)
+
+    def runs(self) -> List[Tuple[int, int]]:
+        """Carreiras da esquerda para a direita, sem brancos nas pontas."""
+        runs = [tuple(r) for r in self.left] + [tuple(r) for r in reversed(self.right)]
+        while runs and runs[-1][0] == 0:
+            runs.pop()
+        while runs and runs[0][0] == 0:
+            runs.pop(0)
+        return runs
+
+    def cells(self) -> bytes:
+        return b''.join(bytes((sym,)) * count for sym, count in self.runs())
+
+
+class TMResult:
+    """Resultado de uma execução: estado final, passos e fitas."""
+
+    def __init__(self, machine: 'TuringMachine', state: int, steps: int, halted: bool,
+                 tapes: List[Tape], heads: List[int]):
+        self.machine = machine
+        self.state_index = state
+        self.steps = steps
+        self.halted = halted
+        self.tapes = tapes
+        self.heads = heads
+
+    @property
+    def state(self) -> Hashable:
+        return self.machine.names[self.state_index]
+
+    @property
+    def accepted(self) -> bool:
+        return self.halted and self.machine.accepting[self.state_index] == 1
+
+    def output(self, tape: int = 0) -> str:
+        """Conteúdo da fita ``tape`` sem os brancos das pontas."""
+        return self.machine.decode(self.tapes[tape].cells())
+
+    def runs(self, tape: int = 0) -> List[Tuple[str, int]]:
+        """Conteúdo da fita como carreiras ``(caractere, quantidade)``."""
+        t = self.tapes[tape]
+        if isinstance(t, RunTape):
+            runs = t.runs()
+        else:
+            runs = [(m.group()[0], len(m.group())) for m in re.finditer(rb'(.)\1*', t.cells(), re.S)]
+        return [(self.machine.symbols[sym], count) for sym, count in runs]
+
+
+class TuringMachine:
+    """Máquina de Turing determinística com ``tapes`` fitas.
+
+    Parâmetros:
+    - ``states``: nomes dos estados;
+    - ``tape_alphabet``: símbolos da fita (caracteres), incluindo ``blank``;
+    - ``transitions``: ``(estado, lidos) -> (estado, escritos, movimentos)``,
+      com ``lidos``/``escritos``/``movimentos`` como tuplas de um item por
+      fita (para uma fita, aceita também um único caractere/movimento);
+      movimentos são 'L', 'R' ou 'S';
+    - ``start``: estado inicial;
+    - ``accepting``: estados de parada que contam como aceitação.
+
+    A máquina para quando não há transição para a configuração corrente.
+    """
+
+    def __init__(self, states: Iterable[Hashable], tape_alphabet: Union[str, Iterable[str]],
+                 transitions: Dict[Tuple[Hashable, Union[str, Sequence[str]]],
+                                   Tuple[Hashable, Union[str, Sequence[str]], Union[str, Sequence[str]]]],
+                 start: Hashable, accepting: Iterable[Hashable] = (), blank: str = BLANK,
+                 tapes: int = 1):
+        self.names: List[Hashable] = list(states)
+        index = {name: i for i, name in enumerate(self.names)}
+        if start not in index:
+            raise ValueError(f"Estado inicial desconhecido: {start!r}")
+        symbols = [blank] + [c for c in dict.fromkeys(tape_alphabet) if c != blank]
+        if len(symbols) > 255 or any(len(c) != 1 or ord(c) > 255 for c in symbols):
+            raise ValueError("Alfabeto da fita deve ter até 255 caracteres latin-1")
+        if tapes < 1:
+            raise ValueError("A máquina precisa de ao menos uma fita")
+        self.symbols = symbols
+        self.blank = blank
+        self.n_tapes = tapes
+        sid = {c: i for i, c in enumerate(symbols)}
+        m = self.m = len(symbols)
+        # tradução caractere -> id (255 marca símbolo inválido) e id -> caractere
+        encode = bytearray([255]) * 256
+        for c, i in sid.items():
+            encode[ord(c)] = i
+        self._encode = bytes(encode)
+        self._decode = bytes(ord(c) for c in symbols) + bytes(256 - m)
+
+        size = len(self.names) * m ** tapes
+        self.next = array('i', [-1]) * size      # próximo estado * m**k, ou -1 (parada)
+        self.write = array('B', bytes(size * tapes))
+        self.move = array('b', bytes(size * tapes))
+
+        def as_tuple(value, what):
+            if isinstance(value, str) and tapes == 1 and len(value) == 1:
+                return (value,)
+            value = tuple(value)
+            if len(value) != tapes:
+                raise ValueError(f"Esperado um {what} por fita: {value!r}")
+            return value
+
+        for (src, reads), (dst, writes, moves) in transitions.items():
+            if src not in index or dst not in index:
+                raise ValueError(f"Transição com estado desconhecido: {src!r} -> {dst!r}")
+            reads, writes, moves = as_tuple(reads, 'símbolo'), as_tuple(writes, 'símbolo'), as_tuple(moves, 'movimento')
+            try:
+                key = index[src] * m ** tapes + sum(sid[c] * m ** i for i, c in enumerate(reads))
+                wids = [sid[c] for c in writes]
+                dirs = [MOVES[d] for d in moves]
+            except KeyError as e:
+                raise ValueError(f"Símbolo ou movimento inválido na transição: {e}") from None
+            self.next[key] = index[dst] * m ** tapes
+            for t in range(tapes):
+                self.write[key * tapes + t] = wids[t]
+                self.move[key * tapes + t] = dirs[t]
+
+        self.start = index[start]
+        self.accepting = bytearray(len(self.names))
+        for name in accepting:
+            if name not in index:
+                raise ValueError(f"Estado de aceitação desconhecido: {name!r}")
+            self.accepting[index[name]] = 1
+        self._compile()
+
+    def _compile(self) -> None:
+        # cópias em lista para o laço de execução (tabelas grandes mapeadas
+        # de arquivo por ``serialize.load`` são usadas sem cópia)
+        if isinstance(self.next, memoryview) and len(self.next) > LIST_COPY_LIMIT:
+            self._next, self._write, self._move = self.next, self.write, self.move
+            return
+        self._next = self.next.tolist()
+        self._write = self.write.tolist()
+        self._move = self.move.tolist()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_next', '_write', '_move'):
+            state.pop(name, None)
+        for name, typecode in (('next', 'i'), ('write', 'B'), ('move', 'b')):
+            if not isinstance(state[name], array):
+                state[name] = array(typecode, state[name])
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def encode(self, text: str) -> bytes:
+        """Converte caracteres em ids de símbolos (ValueError se inválido)."""
+        try:
+            ids = text.encode('latin-1').translate(self._encode)
+        except UnicodeEncodeError:
+            ids = b'\xff'
+        if 255 in ids:
+            raise ValueError(f"Entrada com símbolo fora do alfabeto da fita: {text!r}")
+        return ids
+
+    def decode(self, ids: bytes) -> str:
+        return bytes(ids).translate(self._decode).decode('latin-1')
+
+    def run(self, inputs: Union[str, Sequence[str]] = '', max_steps: Optional[int] = None,
+            heads: Optional[Sequence[int]] = None) -> TMResult:
+        """Executa a máquina até parar ou até ``max_steps`` passos.
+
+        ``inputs`` é o conteúdo inicial da primeira fita (``str``) ou uma
+        sequência com o de cada fita, escrito a partir da posição 0; as
+        cabeças começam em ``heads`` (padrão: todas na posição 0).
+        """
+        if isinstance(inputs, str):
+            inputs = [inputs] + [''] * (self.n_tapes - 1)
+        if len(inputs) != self.n_tapes:
+            raise ValueError(f"Esperadas {self.n_tapes} entradas, uma por fita")
+        tapes = [Tape(self.encode(text)) for text in inputs]
+        heads = list(heads) if heads is not None else [0] * self.n_tapes
+        limit = -1 if max_steps is None else max_steps
+        if self.n_tapes == 1:
+            state, steps, heads[0] = self._run1(tapes[0], heads[0], limit)
+        else:
+            state, steps = self._run_multi(tapes, heads, limit)
+        halted = self._next[state * self.m ** self.n_tapes + self._key(tapes, heads)] < 0
+        return TMResult(self, state, steps, halted, tapes, heads)
+
+    def _key(self, tapes: List[Tape], heads: List[int]) -> int:
+        m = self.m
+        return sum(tape.read(h) * m ** i for i, (tape, h) in enumerate(zip(tapes, heads)))
+
+    def _run1(self, tape: Tape, head: int, limit: int) -> Tuple[int, int, int]:
+        """Laço de uma fita: retorna ``(estado, passos, cabeça)``."""
+        nxt, wr, mv = self._next, self._write, self._move
+        m = self.m
+        buf = tape.buf
+        h = tape.origin + head
+        if h < 0:
+            h += tape.grow_left(-h)
+        base = self.start * m
+        steps = 0
+        while steps != limit:
+            try:
+                key = base + buf[h]
+            except IndexError:
+                tape.grow_right(h - len(buf) + 1)
+                continue
+            ns = nxt[key]
+            if ns < 0:
+                break
+            buf[h] = wr[key]
+            h += mv[key]
+            base = ns
+            steps += 1
+            if h < 0:
+                h += tape.grow_left()
+        return base // m, steps, h - tape.origin
+
+    def _run_multi(self, tapes: List[Tape], heads: List[int], limit: int) -> Tuple[int, int]:
+        """Laço genérico para várias fitas (atualiza ``heads`` no lugar)."""
+        nxt, wr, mv = self._next, self._write, self._move
+        k = self.n_tapes
+        weights = [self.m ** i for i in range(k)]
+        mk = self.m ** k
+        base = self.start * mk
+        steps = 0
+        while steps != limit:
+            key = base
+            for t in range(k):
+                key += tapes[t].read(heads[t]) * weights[t]
+            ns = nxt[key]
+            if ns < 0:
+                break
+            at = key * k
+            for t in range(k):
+                tapes[t].write(heads[t], wr[at + t])
+                heads[t] += mv[at + t]
+            base = ns
+            steps += 1
+        return base // mk, steps
+
+    def run_traced(self, inputs: Union[str, Sequence[str]], stats: 'Stats',
+                   max_steps: Optional[int] = None, heads: Optional[Sequence[int]] = None) -> TMResult:
+        """Como ``run``, registrando passos, transições e extensão das fitas em ``stats``.
+
+        Usa um laço próprio (genérico para ``k`` fitas), de modo que ``run``
+        não paga nada pela instrumentação. As configurações amostradas são
+        ``(estado, posições das cabeças)``.
+        """
+        if isinstance(inputs, str):
+            inputs = [inputs] + [''] * (self.n_tapes - 1)
+        if len(inputs) != self.n_tapes:
+            raise ValueError(f"Esperadas {self.n_tapes} entradas, uma por fita")
+        tapes = [Tape(self.encode(text)) for text in inputs]
+        heads = list(heads) if heads is not None else [0] * self.n_tapes
+        nxt, wr, mv = self._next, self._write, self._move
+        k = self.n_tapes
+        weights = [self.m ** i for i in range(k)]
+        mk = self.m ** k
+        counts = stats.begin(self, len(nxt), mk, self._transition_label)
+        low, high = list(heads), list(heads)
+        every = stats.sample_every
+        base = self.start * mk
+        steps = 0
+        while steps != max_steps:
+            key = base
+            for t in range(k):
+                key += tapes[t].read(heads[t]) * weights[t]
+            ns = nxt[key]
+            if ns < 0:
+                break
+            counts[key] += 1
+            at = key * k
+            for t in range(k):
+                tapes[t].write(heads[t], wr[at + t])
+                h = heads[t] = heads[t] + mv[at + t]
+                if h < low[t]:
+                    low[t] = h
+                elif h > high[t]:
+                    high[t] = h
+            base = ns
+            steps += 1
+            if every and (stats.steps + steps) % every == 0:
+                stats.sample(stats.steps + steps, (self.names[base // mk], tuple(heads)))
+        stats.steps += steps
+        for t in range(k):
+            stats.touch(t, low[t], high[t])
+        halted = nxt[base + self._key(tapes, heads)] < 0
+        return TMResult(self, base // mk, steps, halted, tapes, heads)
+
+    def _transition_label(self, key: int) -> Tuple[Hashable, str]:
+        """``(estado, símbolos lidos)`` de uma célula da tabela."""
+        q, rest = divmod(key, self.m ** self.n_tapes)
+        read = ''
+        for _ in range(self.n_tapes):
+            rest, sym = divmod(rest, self.m)
+            read += self.symbols[sym]
+        return self.names[q], read
+
+    def run_accelerated(self, inputs: Union[str, Sequence[Tuple[str, int]]] = '',
+                        max_steps: Optional[int] = None) -> TMResult:
+        """Executa uma máquina de uma fita em macro-passos sobre carreiras.
+
+        ``inputs`` é uma ``str`` ou uma lista de carreiras ``(caractere,
+        quantidade)`` — o que permite partir de fitas enormes sem
+        materializá-las. A cabeça começa na posição 0. O número de passos
+        contado é o mesmo da execução célula a célula; uma varredura sem fim
+        sobre brancos avança de uma vez até ``max_steps`` ou, sem limite,
+        para a execução com ``halted=False``. O resultado traz uma ``RunTape`` (use ``runs()``).
+        """
+        if self.n_tapes != 1:
+            raise ValueError("Execução acelerada disponível apenas para uma fita")
+        if isinstance(inputs, str):
+            ids = self.encode(inputs)
+            runs = [(m.group()[0], len(m.group())) for m in re.finditer(rb'(.)\1*', ids, re.S)]
+        else:
+            runs = [(self.encode(c)[0], count) for c, count in inputs]
+        tape = RunTape(runs)
+        left, right, push, take = tape.left, tape.right, tape.push, tape.take
+        nxt, wr, mv = self._next, self._write, self._move
+        m = self.m
+        state = self.start * m
+        steps = pos = 0
+        while max_steps is None or steps < max_steps:
+            sym = right[-1][0] if right else 0
+            key = state + sym
+            ns = nxt[key]
+            if ns < 0:
+                break
+            w, d = wr[key], mv[key]
+            room = None if max_steps is None else max_steps - steps
+            if ns == state and d == 1:
+                # varre para a direita toda a carreira de ``sym`` sob a cabeça
+                if right:
+                    n = right[-1][1] if room is None else min(right[-1][1], room)
+                elif room is None:
+                    break  # laço infinito sobre brancos
+                else:
+                    n = room  # só brancos à direita: os ``room`` passos restantes de uma vez
+                take(right, n)
+                push(left, w, n)
+                steps += n
+                pos += n
+            elif ns == state and d == -1:
+                # célula sob a cabeça + carreira de ``sym`` logo à esquerda
+                if not left and sym == 0:
+                    if room is None:
+                        break  # laço infinito sobre brancos
+                    n = room  # só brancos à esquerda: os ``room`` passos restantes de uma vez
+                else:
+                    extra = left[-1][1] if left and left[-1][0] == sym else 0
+                    n = 1 + extra if room is None else min(1 + extra, room)
+                take(right, 1)
+                take(left, n - 1)
+                push(right, w, n)
+                tape.step_left()
+                steps += n
+                pos -= n
+            else:
+                take(right, 1)
+                if d == 1:
+                    push(left, w, 1)
+                else:
+                    push(right, w, 1)
+                    if d == -1:
+                        tape.step_left()
+                state = ns
+                steps += 1
+                pos += d
+        halted = nxt[state + tape.head()] < 0
+        return TMResult(self, state // m, steps, halted, [tape], [pos])
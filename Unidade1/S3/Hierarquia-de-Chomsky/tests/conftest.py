@@ -0,0 +1,24 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark')
+    group.addoption('--benchmark', action='store_true', default=False,
+                    help='executa os testes marcados com @pytest.mark.benchmark')
+    group.addoption('--benchmark-baseline', metavar='ARQUIVO', default=None,
+                    help='relatório JSON de referência (python -m src.bench --json)')
+    group.addoption('--benchmark-sizes', default='1KB,64KB,1MB',
+                    help='tamanhos das entradas dos benchmarks')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: benchmark de desempenho (use --benchmark)')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='benchmark: use --benchmark para executar')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
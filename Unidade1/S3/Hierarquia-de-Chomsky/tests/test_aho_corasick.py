@@ -0,0 +1,88 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import stream
+from src.aho_corasick import AhoCorasick
+
+
+def naive(patterns, text):
+    found = []
+    for end in range(1, len(text) + 1):
+        for pid, p in enumerate(patterns):
+            if text.startswith(p, end - len(p)) and end >= len(p):
+                found.append((pid, end))
+    return found
+
+
+def test_classic_example_with_overlaps():
+    patterns = ['he', 'she', 'his', 'hers']
+    ac = AhoCorasick(patterns)
+    assert sorted(ac.find_all('ushers')) == [(0, 4), (1, 4), (3, 6)]
+    assert ac.dfa.accepts('ushe') and not ac.dfa.accepts('ush')
+
+
+def test_matches_naive_search_on_random_text():
+    rng = random.Random(7)
+    patterns = [''.join(rng.choice('abc') for _ in range(rng.randint(1, 5))) for _ in range(40)]
+    text = ''.join(rng.choice('abcd') for _ in range(2000))
+    ac = AhoCorasick(patterns)
+    assert sorted(ac.find_all(text)) == sorted(naive(patterns, text))
+
+
+def test_chunked_input_finds_matches_across_boundaries():
+    patterns = [b'needle', b'dle', b'xx']
+    text = b'..need' + b'le..x' + b'x.needl' + b'e'
+    ac = AhoCorasick(patterns)
+    runner = ac.runner()
+    found = []
+    for chunk in (b'..need', b'le..x', b'x.needl', memoryview(b'e')):
+        found += runner.feed(chunk)
+    assert found == ac.find_all(text) == [(0, 8), (1, 8), (2, 12), (0, 19), (1, 19)]
+    assert runner.consumed == len(text)
+    # retomada explícita de ``search``
+    state = ac.dfa.run(text[:10])
+    assert list(ac.search(text[10:], state=state, offset=10)) == [(2, 12), (0, 19), (1, 19)]
+
+
+def test_search_file_uses_mmap_chunks(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'abc' * 1000 + b'\xffkey\x00')
+    ac = AhoCorasick([b'cab', b'key\x00'])
+    found = list(ac.search_file(path, chunk_size=7))
+    assert found == ac.find_all(path.read_bytes())
+    assert found[-1] == (1, 3005) and len(found) == 1000
+
+
+def test_signature_covering_every_byte():
+    every = bytes(range(256))
+    ac = AhoCorasick([every, b'\xff\x00', b'\x00'])
+    data = b'xx' + every + b'\xff' + every
+    assert ac.find_all(data) == naive(ac.patterns, data)
+    runner = ac.runner()
+    found = [m for i in range(0, len(data), 100) for m in runner.feed(data[i:i + 100])]
+    assert found == naive(ac.patterns, data)
+
+
+def test_dfa_through_run_chunks():
+    # a classe 0 volta à raiz: não há estado morto e a leitura não para cedo
+    ac = AhoCorasick(['ab', 'cab'])
+    for text, expected in [('zzzab', True), ('abzz', False), ('zc' * 50 + 'ab', True)]:
+        chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+        assert stream.run_chunks(stream.DFARunner(ac.dfa), chunks) is expected, text
+    every = AhoCorasick([bytes(range(256))])
+    data = bytes(range(256)) * 2
+    assert stream.run_chunks(stream.DFARunner(every.dfa), [data[:300], data[300:]]) is True
+
+
+def test_invalid_patterns():
+    with pytest.raises(ValueError):
+        AhoCorasick(['ok', ''])
+    with pytest.raises(ValueError):
+        AhoCorasick(['€'])
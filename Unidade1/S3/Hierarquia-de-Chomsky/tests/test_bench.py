@@ -0,0 +1,55 @@
+import sys
+import json
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import bench
+
+
+def test_parse_size_and_percentile():
+    assert bench.parse_size('1KB') == 1024
+    assert bench.parse_size('1.5mb') == 3 << 19
+    assert bench.parse_size('1GB') == 1 << 30
+    assert bench.parse_size('100') == 100
+    with pytest.raises(ValueError):
+        bench.parse_size('muito')
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert bench.percentile(values, 50) == 3.0
+    assert bench.percentile(values, 99) == pytest.approx(4.96)
+    assert bench.percentile([7.0], 90) == 7.0
+
+
+def test_measure_report_and_regression_gate(tmp_path):
+    report = bench.run_suite(list(bench.BENCHMARKS), [256], repeat=2)
+    assert [r['bench'] for r in report['results']] == list(bench.BENCHMARKS)
+    tm = report['results'][-1]
+    assert tm['steps'] > 256 and tm['steps_per_s'] > 0
+    assert all(r['seconds']['min'] <= r['seconds']['p99'] for r in report['results'])
+    assert bench.compare(report, report) == []
+
+    faster = json.loads(json.dumps(report))
+    faster['results'][0]['symbols_per_s'] *= 10
+    faster['results'][1]['peak_bytes'] = 0
+    problems = bench.compare(report, faster, threshold=0.2)
+    assert len(problems) == 1 and problems[0].startswith('dfa_even_a')
+
+    path = tmp_path / 'base.json'
+    path.write_text(json.dumps(faster))
+    assert bench.main(['--bench', 'dfa_even_a', '--sizes', '256', '--repeat', '1',
+                       '--json', str(tmp_path / 'out.json'), '--baseline', str(path)]) == 1
+    assert json.loads((tmp_path / 'out.json').read_text())['results'][0]['size'] == 256
+
+
+@pytest.mark.benchmark
+def test_benchmarks_against_baseline(pytestconfig):
+    sizes = [bench.parse_size(s) for s in pytestconfig.getoption('--benchmark-sizes').split(',')]
+    report = bench.run_suite(list(bench.BENCHMARKS), sizes, log=print)
+    baseline = pytestconfig.getoption('--benchmark-baseline')
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            assert bench.compare(report, json.load(f)) == []
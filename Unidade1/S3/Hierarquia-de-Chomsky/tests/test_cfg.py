@@ -0,0 +1,66 @@
+import sys
+import random
+import re
+from itertools import product
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import exercises
+from src.cfg import CYKRecognizer, EarleyRecognizer, Grammar
+
+
+AN_BN = Grammar({'S': ['aSb', '']}, 'S')
+# expressões com precedência; E e T recursivos à esquerda, P com unitárias
+EXPR = Grammar({'E': ['E+T', 'T'], 'T': ['T*F', 'F'], 'F': ['(E)', 'x']}, 'E')
+# palíndromos pares sobre {a, b}: ambígua o suficiente para exercitar o CYK
+PAL = Grammar({'S': ['aSa', 'bSb', '']}, 'S')
+# recursão à direita com anulável intermediário (caso do atalho de Leo)
+RIGHT = Grammar({'L': ['aL', 'N'], 'N': ['', 'b']}, 'L')
+
+
+def words(alphabet, max_len):
+    for n in range(max_len + 1):
+        for w in product(alphabet, repeat=n):
+            yield ''.join(w)
+
+
+def test_cnf_conversion_preserves_language():
+    cnf = EXPR.to_cnf()
+    assert cnf.is_cnf() and not EXPR.is_cnf()
+    for w in words('x+*', 5):
+        assert EarleyRecognizer(cnf).accepts(w) is EarleyRecognizer(EXPR).accepts(w), w
+
+
+@pytest.mark.parametrize('method', ['cyk', 'earley'])
+def test_recognizers(method):
+    for w in words('ab', 8):
+        k = len(w) // 2
+        assert AN_BN.accepts(w, method) is exercises.pda_an_bn(w), w
+        assert PAL.accepts(w, method) is (len(w) % 2 == 0 and w == w[::-1]), w
+        assert RIGHT.accepts(w, method) is (re.fullmatch('a*b?', w) is not None), w
+    assert EXPR.accepts('(x+x)*x', method) is True
+    assert EXPR.accepts('x+*x', method) is False
+    assert AN_BN.accepts(memoryview(b'aabb'), method) is True
+    assert AN_BN.accepts('aé', method) is False
+
+
+def test_earley_long_right_recursion_and_balanced_input():
+    rng = random.Random(1)
+    long_input = 'a' * 20000 + 'b'
+    assert RIGHT.accepts(long_input) is True
+    assert RIGHT.accepts(long_input + 'b') is False
+    assert AN_BN.accepts(b'a' * 3000 + b'b' * 3000) is True
+    expr = 'x' + ''.join(rng.choice('+*') + 'x' for _ in range(2000))
+    assert EXPR.accepts(expr) is True
+
+
+def test_invalid_grammar():
+    with pytest.raises(ValueError):
+        Grammar({'S': ['a']}, 'X')
+    with pytest.raises(ValueError):
+        Grammar({'S': ['a', ('b', 'cd')]}, 'S')
@@ -0,0 +1,116 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import dfa as dfa_module
+from src.dfa import DFA
+from src import exercises
+
+
+def ends_with_ab() -> DFA:
+    return DFA(
+        states=(0, 1, 2),
+        alphabet='ab',
+        transitions={(0, 'a'): 1, (0, 'b'): 0, (1, 'a'): 1, (1, 'b'): 2,
+                     (2, 'a'): 1, (2, 'b'): 0},
+        start=0,
+        accepting={2},
+    )
+
+
+def test_dfa_generic():
+    dfa = ends_with_ab()
+    assert dfa.accepts('ab') is True
+    assert dfa.accepts('babab') is True
+    assert dfa.accepts('aba') is False
+    assert dfa.accepts('') is False
+    assert dfa.accepts('abc') is False
+
+
+def test_dfa_bytes_memoryview_and_resume():
+    data = b'ab' * 100000 + b'b'
+    assert exercises.dfa_even_a(data) is True
+    assert exercises.dfa_even_a(memoryview(data + b'a')) is False
+    assert exercises.dfa_even_a(bytearray(b'ba')) is False
+    assert exercises.dfa_even_a('aé') is False
+    dfa = exercises.EVEN_A_DFA
+    mid = dfa.run('a')
+    assert dfa.accepting[dfa.run('a', mid)] == 1
+
+
+def test_dfa_missing_transition_goes_to_dead_state():
+    dfa = DFA(states=('q',), alphabet='a', transitions={}, start='q', accepting={'q'})
+    assert dfa.accepts('') is True
+    assert dfa.accepts('a') is False
+    assert dfa.names[dfa.run('a')] is None
+
+
+def test_dfa_invalid_definition():
+    with pytest.raises(ValueError):
+        DFA(states=('q',), alphabet='a', transitions={('q', 'b'): 'q'}, start='q', accepting=())
+    with pytest.raises(ValueError):
+        DFA(states=('q',), alphabet='a', transitions={}, start='x', accepting=())
+
+
+def test_accepts_batch_matches_scalar():
+    np = pytest.importorskip('numpy')
+    strings = ['', 'a', 'aa', 'aba', 'b' * 50 + 'a', b'ab' * 40, 'aé', 'abc'] + ['a' * i for i in range(40)]
+    expected = [exercises.dfa_even_a(s) for s in strings]
+    result = exercises.dfa_even_a_batch(strings)
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == expected
+    assert ends_with_ab().accepts_batch([]).tolist() == []
+
+
+@pytest.mark.parametrize('numpy_available', [True, False])
+def test_run_scan_matches_run_with_boundaries(monkeypatch, numpy_available):
+    if not numpy_available:
+        monkeypatch.setattr(dfa_module, '_numpy', lambda: None)
+    dfa = ends_with_ab()
+    data = 'abbaab' * 37 + 'ca' + 'ab' * 11
+    for chunks in (1, 2, 7, 64, 10_000):
+        final, bounds = dfa.run_scan(data, chunks, boundaries=True)
+        assert final == dfa.run(data)
+        assert bounds == [(pos, dfa.run(data[:pos])) for pos in dfa_module.chunk_bounds(len(data), chunks)]
+    assert dfa.run_scan('') == dfa.start
+    assert dfa.run_scan('aé') == dfa.run('aé') == dfa.sink_state()
+
+
+def test_accepts_lines_matches_per_line_accepts():
+    dfa = ends_with_ab()
+    lines = ['ab', '', 'bab', 'abc', 'aab', 'a']
+    assert dfa.accepts_lines('\n'.join(lines)) == [dfa.accepts(w) for w in lines]
+    assert dfa.accepts_lines(b'') == [False]
+    assert dfa.accepts_lines('ab\naé') == [True, False]
+    newline = DFA(states=(0, 1), alphabet='\na', transitions={(0, '\n'): 1, (1, 'a'): 0},
+                  start=0, accepting={0})
+    assert newline.accepts_lines('\na\n') == [True, False, True]
+
+
+def test_full_byte_alphabet():
+    every = bytes(range(256))
+    # paridade de bytes 0xff: duas classes (0xff e o resto)
+    parity = DFA(states=(0, 1), alphabet=every,
+                 transitions={(q, c): q ^ (c == 255) for q in (0, 1) for c in range(256)},
+                 start=0, accepting={0})
+    assert parity.stride == 3
+    assert parity.accepts(every * 2) and not parity.accepts(every)
+    assert parity.accepts_lines(b'\xff\xff\n\xff') == [True, False]
+    assert list(parity.accepts_batch([every, b'', b'\xff'])) == [False, True, False]
+    assert parity.run_scan(every * 3, chunks=7) == 1
+    assert parity.minimize().accepts(every * 2)
+    # último byte lido: as 256 colunas são distintas, classes 0..255
+    last = DFA(states=range(257), alphabet=every,
+               transitions={(q, c): c + 1 for q in range(257) for c in range(256)},
+               start=0, accepting={1, 256})
+    assert last.stride == 257 and last.foreign == 256
+    for c in range(256):
+        assert last.run(bytes([7, c])) == c + 1
+    assert last.accepts(b'abc\x00') and last.accepts('\xff') and not last.accepts(b'\x00a')
+    assert last.minimize().n_states == 3
+    assert not last.accepts('€')
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import exercises
+from src.instrument import Stats
+
+
+def test_dfa_traced_counts_transitions_and_samples():
+    stats = Stats(sample_every=2)
+    assert exercises.dfa_even_a('abaa', stats) is exercises.dfa_even_a('abaa')
+    assert stats.steps == 4
+    assert stats.hot_transitions(1) == [(('par', 'a'), 2)]
+    assert list(stats.state_visits)[:2] == [2, 2]
+    assert stats.samples == [(2, ('impar', 2)), (4, ('impar', 4))]
+    # o mesmo Stats acumula execuções sucessivas (entrada em blocos)
+    state = exercises.EVEN_A_DFA.run_traced(b'a', stats, exercises.EVEN_A_DFA.start)
+    assert stats.steps == 5 and exercises.EVEN_A_DFA.names[state] == 'impar'
+    with pytest.raises(ValueError):
+        exercises.pda_an_bn('ab', stats)
+
+
+def test_pda_traced_stack_depth_and_epsilon_steps():
+    stats = Stats()
+    assert exercises.pda_an_bn('aaabbb', stats) is True
+    assert stats.steps == 7  # 6 leituras + a transição ε final
+    assert stats.max_stack == 4
+    assert (('q2', '', 'Z'), 1) in stats.hot_transitions()
+    rejected = Stats()
+    assert exercises.pda_an_bn('aab', rejected) is False and rejected.max_stack == 3
+
+
+def test_tm_traced_tape_extent_and_callback():
+    seen = []
+    stats = Stats(callback=lambda step, config: seen.append(step))
+    assert exercises.tm_increment_binary('1011', stats) == '1100'
+    assert stats.steps == len(seen) == 8
+    assert stats.tape_low == [0] and stats.tape_cells == [5]
+    assert stats.hot_transitions(2) == [(('seek', '1'), 3), (('carry', '1'), 2)]
+    assert stats.as_dict()['steps'] == 8
+    overflow = Stats()
+    exercises.tm_increment_binary('111', overflow)
+    assert overflow.tape_low == [-1]
+
+
+def test_tm_traced_tape_extent_away_from_origin():
+    # a cabeça começa em 4: a extensão não deve incluir a posição 0
+    stats = Stats()
+    exercises.get_increment_tm().run_traced('0000111', stats, heads=[4])
+    assert (stats.tape_low, stats.tape_high, stats.tape_cells) == ([3], [7], [5])
+    assert Stats().tape_cells == []
@@ -0,0 +1,58 @@
+import sys
+import io
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src import exercises
+from src.__main__ import READ_SIZE, iter_line_blocks, main
+
+
+def run_cli(monkeypatch, args, data: bytes) -> bytes:
+    out = io.BytesIO()
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(data)))
+    monkeypatch.setattr(sys, 'stdout', io.TextIOWrapper(out))
+    assert main(args) == 0
+    sys.stdout.flush()
+    return out.getvalue()
+
+
+def test_line_blocks_never_split_lines():
+    data = b'ab\r\naab\n' * 1000 + b'ba\r'
+    blocks = list(iter_line_blocks(io.BytesIO(data), read_size=7))
+    assert b'\n'.join(blocks).split(b'\n') == [b'ab', b'aab'] * 1000 + [b'ba']
+
+
+def test_line_much_longer_than_read_size():
+    long_line = b'ab' * (2 * READ_SIZE) + b'\r'
+    data = b'x\n' + long_line + b'\na\r\n' + long_line
+    blocks = list(iter_line_blocks(io.BytesIO(data)))
+    assert b'\n'.join(blocks).split(b'\n') == [b'x', long_line[:-1], b'a', long_line[:-1]]
+    # leituras minúsculas: os pedaços são unidos uma vez por linha, não a cada leitura
+    line = b'a' * 300_000
+    assert list(iter_line_blocks(io.BytesIO(line + b'\n' + line), read_size=16)) == [line, line]
+
+
+def test_cli_verdicts_counts_and_tm_output(monkeypatch, tmp_path):
+    words = ['', 'a', 'aa', 'ab', 'aabb', 'ba', 'c']
+    data = '\n'.join(words).encode() + b'\n'
+    expected = ''.join('1\n' if exercises.dfa_even_a(w) else '0\n' for w in words).encode()
+    assert run_cli(monkeypatch, ['dfa'], data) == expected
+    assert run_cli(monkeypatch, ['pda', '--count'], data) == b'3 7\n'
+    path = tmp_path / 'nums.txt'
+    path.write_bytes(b'1011\r\n111\n2\n')
+    assert run_cli(monkeypatch, ['tm', str(path), '-'], b'0') == b'1100\n1000\nerro\n1\n'
+
+
+def test_cli_imports_only_the_selected_engine(tmp_path):
+    path = tmp_path / 'in.txt'
+    path.write_bytes(b'aa\nab\n')
+    code = ("import sys; from src.__main__ import main; main(['dfa', sys.argv[1]]); "
+            "loaded = [m for m in ('tkinter', 'numpy', 'src.pda', 'src.tm') if m in sys.modules]; "
+            "print(loaded)")
+    result = subprocess.run([sys.executable, '-c', code, str(path)], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout == '1\n0\n[]\n'
@@ -0,0 +1,77 @@
+import sys
+import random
+from itertools import product
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.dfa import DFA
+from src.nfa import NFA, EPSILON
+
+
+def third_from_last_a() -> NFA:
+    # (a|b)* a (a|b)(a|b), com uma transição ε no início
+    return NFA(
+        states=('i', 0, 1, 2, 3),
+        alphabet='ab',
+        transitions={('i', EPSILON): {0}, (0, 'a'): {0, 1}, (0, 'b'): {0},
+                     (1, 'a'): {2}, (1, 'b'): {2}, (2, 'a'): {3}, (2, 'b'): {3}},
+        start='i',
+        accepting={3},
+    )
+
+
+def words(max_len):
+    for n in range(max_len + 1):
+        for w in product('ab', repeat=n):
+            yield ''.join(w)
+
+
+def test_nfa_simulation_and_subset_construction():
+    nfa = third_from_last_a()
+    dfa = nfa.to_dfa()
+    raw = nfa.to_dfa(minimize=False)
+    for w in words(7):
+        expected = len(w) >= 3 and w[-3] == 'a'
+        assert nfa.accepts(w) is expected
+        assert dfa.accepts(w) is expected
+        assert raw.accepts(w) is expected
+    # 8 estados vivos (as três últimas letras) + estado morto
+    assert dfa.n_states == 9
+
+
+def test_minimize_merges_equivalent_states():
+    # dois estados redundantes para "número par de a" e um inalcançável
+    dfa = DFA(
+        states=('p0', 'i0', 'p1', 'i1', 'x'),
+        alphabet='ab',
+        transitions={('p0', 'a'): 'i0', ('p0', 'b'): 'p1', ('i0', 'a'): 'p1', ('i0', 'b'): 'i1',
+                     ('p1', 'a'): 'i1', ('p1', 'b'): 'p0', ('i1', 'a'): 'p0', ('i1', 'b'): 'i0',
+                     ('x', 'a'): 'x'},
+        start='p0',
+        accepting={'p0', 'p1', 'x'},
+    )
+    small = dfa.minimize()
+    assert small.n_states == 3  # par, ímpar, morto
+    for w in words(6):
+        assert small.accepts(w) is dfa.accepts(w)
+
+
+def test_random_nfas_agree_with_minimized_dfa():
+    rng = random.Random(7)
+    for _ in range(30):
+        n = rng.randint(1, 6)
+        transitions = {}
+        for q in range(n):
+            for sym in ('a', 'b', EPSILON):
+                targets = {r for r in range(n) if rng.random() < 0.25}
+                if targets:
+                    transitions[(q, sym)] = targets
+        accepting = {q for q in range(n) if rng.random() < 0.4}
+        nfa = NFA(range(n), 'ab', transitions, 0, accepting)
+        dfa = nfa.to_dfa()
+        assert dfa.minimize().n_states == dfa.n_states
+        for w in words(6):
+            assert dfa.accepts(w) is nfa.accepts(w)
@@ -0,0 +1,125 @@
+import itertools
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src.ntm import NTM, TapeStore
+
+
+def contains_aa() -> NTM:
+    # adivinha onde começa o "aa"
+    return NTM(
+        states=('scan', 'guess', 'yes'),
+        tape_alphabet='ab_',
+        transitions={
+            ('scan', 'a'): {('scan', 'a', 'R'), ('guess', 'a', 'R')},
+            ('scan', 'b'): {('scan', 'b', 'R')},
+            ('guess', 'a'): {('yes', 'a', 'S')},
+        },
+        start='scan',
+        accepting={'yes'},
+    )
+
+
+def wanderer() -> NTM:
+    # anda para qualquer lado sobre a fita em branco, sem nunca parar
+    return NTM(
+        states=('w',),
+        tape_alphabet='_',
+        transitions={('w', '_'): [('w', '_', 'L'), ('w', '_', 'R')]},
+        start='w',
+    )
+
+
+def bit_writer() -> NTM:
+    # escreve uma cadeia binária qualquer, um bit a cada duas células (2**k fitas distintas)
+    return NTM(
+        states=('s', 'w'),
+        tape_alphabet='01_',
+        transitions={('s', '_'): [('w', '0', 'R'), ('w', '1', 'R')],
+                     ('w', '_'): [('s', '_', 'R')]},
+        start='s',
+    )
+
+
+@pytest.mark.parametrize('strategy', ['bfs', 'iddfs'])
+def test_contains_aa_matches_substring_check(strategy):
+    ntm = contains_aa()
+    for n in range(8):
+        for t in itertools.product('ab', repeat=n):
+            s = ''.join(t)
+            assert ntm.explore(s, strategy=strategy).accepted == ('aa' in s), s
+
+
+def test_bfs_trace_gives_shortest_path():
+    ntm = contains_aa()
+    result = ntm.explore('babaab', trace=True)
+    assert result.accepted and result.state == 'yes'
+    assert result.depth == 5 and len(result.path) == 6
+    store = result.store
+    assert ntm.describe(store, result.path[0]) == ('scan', 0, 'babaab')
+    assert [ntm.describe(store, c)[1] for c in result.path] == [0, 1, 2, 3, 4, 4]
+
+
+def test_equal_configurations_are_visited_once():
+    # 2**k ramos, mas só 2k+1 posições da cabeça distintas após k passos
+    result = wanderer().explore(max_steps=1000)
+    assert result.accepted is None and result.reason == 'steps'
+    assert result.configs <= 1002
+    assert result.store.size < 200  # fita compartilhada: só pedaços em branco
+
+
+def test_branching_does_not_copy_tapes():
+    ntm = bit_writer()
+    result = ntm.explore(max_steps=2000, chunk=8)
+    # cada fita distinta difere das irmãs só no pedaço sob a cabeça
+    assert result.store.size < 3 * result.configs
+    store = TapeStore(8)
+    config = ntm.initial(store)
+    a, b = ntm.successors(store, config)
+    assert (ntm.tape_of(store, a), ntm.tape_of(store, b), ntm.tape_of(store, config)) == ('0', '1', '')
+
+
+def test_tape_crosses_chunk_boundaries_and_stays_canonical():
+    store = TapeStore(4)
+    # vai até o fim da entrada e volta apagando tudo
+    ntm = NTM(states=('r', 'l'), tape_alphabet='x_',
+              transitions={('r', 'x'): [('r', 'x', 'R')], ('r', '_'): [('l', '_', 'L')],
+                           ('l', 'x'): [('l', '_', 'L')]},
+              start='r')
+    config = ntm.initial(store, 'xxxxxx')
+    while True:
+        nxt = ntm.successors(store, config)
+        if not nxt:
+            break
+        config, = nxt
+        if config[0] == 0:
+            assert ntm.tape_of(store, config) == 'xxxxxx'
+    assert ntm.tape_of(store, config) == ''
+    # fita apagada: as mesmas listas vazias e pedaço em branco de uma fita nova
+    assert config == (1, -1, 0, 0, 0)
+    assert ntm.explore('xxxxxx', chunk=4).accepted is False
+
+
+@pytest.mark.parametrize('strategy', ['bfs', 'iddfs'])
+def test_budgets(strategy):
+    ntm = bit_writer()
+    assert ntm.explore(strategy=strategy, max_configs=50).reason == 'memory'
+    assert ntm.explore(strategy=strategy, max_branches=5).reason == 'branches'
+    assert ntm.explore(strategy=strategy, max_steps=10).steps == 10
+
+
+def test_invalid_definitions():
+    with pytest.raises(ValueError):
+        NTM(states=('a',), tape_alphabet='x', transitions={('a', 'y'): [('a', 'x', 'R')]}, start='a')
+    with pytest.raises(ValueError):
+        NTM(states=('a',), tape_alphabet='x', transitions={('a', 'x'): [('b', 'x', 'R')]}, start='a')
+    with pytest.raises(ValueError):
+        contains_aa().explore('abc')
+    with pytest.raises(ValueError):
+        contains_aa().explore('a', strategy='dfs')
@@ -0,0 +1,42 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src.output import OutputQueue
+
+
+def test_drain_coalesces_and_respects_frame_budget():
+    out = OutputQueue()
+    for i in range(10):
+        out.put(f'linha {i}\n')
+    out.put('')
+    assert out.drain(max_chars=20) == 'linha 0\nlinha 1\nlinha 2\n'
+    assert out.drain().count('\n') == 7
+    assert out.drain() == '' and not out.pending
+
+
+def test_queue_keeps_only_last_lines_and_spills_everything(tmp_path):
+    log = tmp_path / 'saida.log'
+    out = OutputQueue(max_lines=3, spill_path=str(log))
+    threads = [threading.Thread(target=lambda t=t: [out.put(f'{t}:{i}\n') for i in range(100)])
+               for t in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    text = out.drain()
+    assert text.startswith('[... 397 linhas omitidas ...]\n')
+    assert text.count('\n') == 4
+    out.close()
+    assert len(log.read_text(encoding='utf-8').splitlines()) == 400
+    out.put('depois\n')
+    out.clear()
+    assert out.drain() == ''
+    with pytest.raises(ValueError):
+        OutputQueue(max_lines=0)
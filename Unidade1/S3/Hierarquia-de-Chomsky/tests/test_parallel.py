@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src import exercises, parallel
+
+
+def test_map_items_counts_and_verdicts_for_each_machine():
+    words = ['', 'aa', 'ab', 'aab', 'aaaa', 'b'] * 50
+    pairs = ['ab', 'aabb', 'aab', 'ba', ''] * 50
+    numbers = ['0', '1011', '111', 'x1']
+    with parallel.ParallelRunner(exercises.dfa_even_a, workers=2) as runner:
+        res = runner.map_items(words, verdicts=True, items_per_task=7)
+        assert res.verdicts == [exercises.dfa_even_a(w) for w in words]
+        assert res.accepted == sum(res.verdicts) and res.total == len(words)
+    res = parallel.evaluate_items(exercises.pda_an_bn, pairs, workers=2)
+    assert (res.accepted, res.rejected) == (150, 100) and res.verdicts is None
+    res = parallel.evaluate_items(exercises.tm_increment_binary, numbers, workers=2, verdicts=True)
+    assert res.verdicts == ['1', '1100', '1000', False]
+
+
+def test_map_file_splits_on_line_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel, 'MIN_RANGE_BYTES', 16)
+    lines = ['a' * (i % 7) + 'b' * (i % 3) for i in range(400)]
+    path = tmp_path / 'corpus.txt'
+    path.write_text(''.join(w + '\r\n' for w in lines))
+    expected = [exercises.dfa_even_a(w) for w in lines]
+    res = parallel.evaluate_file(exercises.EVEN_A_DFA.accepts, path, workers=3,
+                                 verdicts=True, binary=True)
+    assert res.verdicts == expected
+    (tmp_path / 'empty.txt').write_bytes(b'')
+    assert parallel.evaluate_file(exercises.dfa_even_a, tmp_path / 'empty.txt').total == 0
+
+
+def test_dfa_scan_file_composes_range_maps(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel, 'MIN_RANGE_BYTES', 100)
+    data = b'ab' * 300 + b'a' + b'b' * 77
+    path = tmp_path / 'long.txt'
+    path.write_bytes(data)
+    dfa = exercises.EVEN_A_DFA
+    final, bounds = parallel.dfa_scan_file(dfa, path, workers=3, boundaries=True)
+    assert final == dfa.run(data)
+    assert [pos for pos, _ in bounds] == [226, 452, 678]
+    assert all(state == dfa.run(data[:pos]) for pos, state in bounds)
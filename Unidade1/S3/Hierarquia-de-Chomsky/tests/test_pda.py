@@ -0,0 +1,80 @@
+import sys
+from itertools import product
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import exercises, stream
+from src.instrument import Stats
+from src.pda import DPDA
+
+
+def an_bn_by_empty_stack() -> DPDA:
+    # a^n b^n com n >= 1, aceitando por pilha vazia
+    return DPDA(states=('p', 'r'), input_alphabet='ab', stack_alphabet=('Z', 'A'),
+                transitions={('p', 'a', 'Z'): ('p', 'AZ'), ('p', 'a', 'A'): ('p', 'AA'),
+                             ('p', 'b', 'A'): ('r', ''), ('r', 'b', 'A'): ('r', ''),
+                             ('r', '', 'Z'): ('r', '')},
+                start='p', start_stack='Z', accept_by='empty')
+
+
+def test_pda_an_bn_matches_definition():
+    for n in range(7):
+        for w in product('ab', repeat=n):
+            s = ''.join(w)
+            k = len(s) // 2
+            assert exercises.pda_an_bn(s) is (s == 'a' * k + 'b' * k), s
+    assert exercises.pda_an_bn(b'aabbc') is False
+
+
+def test_accept_by_empty_stack():
+    pda = an_bn_by_empty_stack()
+    for n in range(7):
+        for w in product('ab', repeat=n):
+            s = ''.join(w)
+            k = len(s) // 2
+            assert pda.accepts(s) is (k > 0 and s == 'a' * k + 'b' * k), s
+
+
+def test_deep_nesting_uses_byte_stack():
+    depth = 200000
+    pda = exercises.AN_BN_PDA
+    stack = pda.new_stack()
+    state = pda.run(b'a' * depth, pda.start, stack)
+    assert len(stack) == depth + 1 and stack.itemsize == 1
+    assert pda.close(pda.run(b'b' * depth, state, stack), stack) is True
+
+
+def test_pda_runner_and_nondeterminism_check():
+    runner = stream.PDARunner(exercises.AN_BN_PDA)
+    assert stream.run_chunks(runner, ['aa', 'ab', 'bb']) is True
+    runner = stream.PDARunner(exercises.AN_BN_PDA)
+    runner.feed('aab')
+    assert runner.accepting is False
+    runner.feed('b')
+    assert runner.accepting is True and runner.finish() is True
+    with pytest.raises(ValueError):
+        DPDA(states=('q',), input_alphabet='a', stack_alphabet=('Z',),
+             transitions={('q', 'a', 'Z'): ('q', 'Z'), ('q', '', 'Z'): ('q', 'Z')},
+             start='q', start_stack='Z')
+
+
+def test_long_epsilon_run_is_not_a_loop():
+    # empilha 20 símbolos e os desempilha sem ler nada: termina, e aceita
+    pda = DPDA(states=('p', 'r', 's'), input_alphabet='a', stack_alphabet=('Z', 'A'),
+               transitions={('p', '', 'Z'): ('r', 'A' * 20 + 'Z'), ('r', '', 'A'): ('r', ''),
+                            ('r', '', 'Z'): ('s', 'Z')},
+               start='p', start_stack='Z', accepting={'s'})
+    assert pda.accepts('') is True
+    assert pda.accepts_traced('', Stats()) is True
+    # laços de verdade: a pilha cresce sem fim, ou a mesma configuração se repete
+    for push in ('AZ', 'Z'):
+        looping = DPDA(states=('p',), input_alphabet='a', stack_alphabet=('Z', 'A'),
+                       transitions={('p', '', 'Z'): ('p', push), ('p', '', 'A'): ('p', 'AA')},
+                       start='p', start_stack='Z', accepting=())
+        assert looping.accepts('') is False
+        assert looping.accepts_traced('', Stats()) is False
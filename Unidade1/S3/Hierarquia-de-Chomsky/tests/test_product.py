@@ -0,0 +1,145 @@
+import itertools
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import exercises, product
+from src.dfa import DFA
+
+
+def count_mod(symbol: str, k: int, alphabet: str = 'ab', residue: int = 0) -> DFA:
+    # aceita cadeias em que o número de ``symbol`` é ≡ residue (mod k)
+    transitions = {}
+    for q in range(k):
+        for c in alphabet:
+            transitions[(q, c)] = (q + 1) % k if c == symbol else q
+    return DFA(states=range(k), alphabet=alphabet, transitions=transitions, start=0, accepting={residue})
+
+
+def ends_with(suffix: str, alphabet: str = 'ab') -> DFA:
+    # AFD do sufixo por força bruta sobre os prefixos do sufixo (KMP simplificado)
+    n = len(suffix)
+    transitions = {}
+    for q in range(n + 1):
+        for c in alphabet:
+            s = suffix[:q] + c
+            transitions[(q, c)] = max(i for i in range(n + 1) if s.endswith(suffix[:i]))
+    return DFA(states=range(n + 1), alphabet=alphabet, transitions=transitions, start=0, accepting={n})
+
+
+def words(alphabet: str, max_len: int):
+    for n in range(max_len + 1):
+        for t in itertools.product(alphabet, repeat=n):
+            yield ''.join(t)
+
+
+def test_boolean_operations_match_membership():
+    even_a = exercises.get_even_a_dfa()
+    suffix = ends_with('ab')
+    cases = {
+        product.intersection(even_a, suffix): lambda s: even_a.accepts(s) and suffix.accepts(s),
+        product.union(even_a, suffix): lambda s: even_a.accepts(s) or suffix.accepts(s),
+        product.difference(even_a, suffix): lambda s: even_a.accepts(s) and not suffix.accepts(s),
+        product.symmetric_difference(even_a, suffix): lambda s: even_a.accepts(s) != suffix.accepts(s),
+        product.complement(suffix): lambda s: not suffix.accepts(s),
+    }
+    for m, expected in cases.items():
+        for s in words('ab', 7):
+            assert m.accepts(s) == expected(s), s
+    assert not product.complement(suffix).accepts('abc')
+
+
+def test_different_alphabets_and_nested_products():
+    as_only = count_mod('a', 2, alphabet='a')
+    bs = count_mod('b', 3, alphabet='bc', residue=1)
+    both = product.union(as_only, bs)
+    assert both.alphabet == b'abc'
+    assert both.accepts('aa') and both.accepts('bcc') and not both.accepts('ab')
+    nested = product.intersection(both, ends_with('c', alphabet='abc'))
+    assert nested.accepts('bc') and not nested.accepts('bcb')
+    dfa = nested.to_dfa()
+    for s in words('abc', 5):
+        assert dfa.accepts(s) == nested.accepts(s), s
+
+
+def test_product_is_built_lazily():
+    a = count_mod('a', 1000)
+    b = count_mod('b', 1000)
+    p = product.intersection(a, b)
+    assert p.accepts('a' * 1000 + 'b' * 2000)
+    assert p.n_states < 3100  # só os pares alcançados por essa cadeia, não 10**6
+    assert product.witness(p) == ''
+    assert product.witness(product.intersection(count_mod('a', 7, residue=3), ends_with('bb'))) == 'aaabb'
+    assert product.witness(product.difference(a, a)) is None
+
+
+def test_equivalence_and_counterexamples():
+    a = count_mod('a', 6)
+    b = product.intersection(count_mod('a', 2), count_mod('a', 3))
+    assert product.equivalent(a, b)
+    assert product.equivalent(ends_with('ab'), ends_with('ab').minimize())
+    w = product.counterexample(count_mod('a', 6), count_mod('a', 4))
+    assert w is not None and count_mod('a', 6).accepts(w) != count_mod('a', 4).accepts(w)
+    assert product.counterexample(exercises.get_even_a_dfa(), count_mod('a', 2)) is None
+    # alfabetos diferentes: 'c' é rejeitado por um e não existe no outro
+    assert product.counterexample(count_mod('a', 2, alphabet='ab'), count_mod('a', 2, alphabet='abc')) == 'c'
+    assert product.counterexample(count_mod('a', 2, alphabet='ab'), count_mod('a', 2, alphabet='ab')) is None
+
+
+def test_inclusion():
+    six, two = count_mod('a', 6), count_mod('a', 2)
+    assert product.is_subset(six, two)
+    w = product.subset_counterexample(two, six)
+    assert two.accepts(w) and not six.accepts(w)
+    assert product.subset_counterexample(ends_with('bab'), ends_with('ab')) is None
+
+
+def cycle(k: int, residue: int = 0) -> DFA:
+    # como count_mod('a', k), montado direto da tabela (estado k = morto)
+    stride = 3
+    table = []
+    for q in range(k):
+        table += [k * stride, (q + 1) % k * stride, q * stride]
+    table += [k * stride] * stride
+    flags = bytearray(k + 1)
+    flags[residue] = 1
+    return DFA.from_table(b'ab', table, 0, flags)
+
+
+def test_large_machines_without_full_product():
+    n = 50_000
+    a = cycle(n)
+    assert product.counterexample(a, cycle(n)) is None
+    assert product.counterexample(a, cycle(n, residue=n - 1)) == ''
+    w = product.counterexample(a, cycle(n - 1))
+    assert w == 'a' * (n - 1)
+    assert product.subset_counterexample(cycle(2 * n), a) is None
+
+
+def test_invalid_operation():
+    with pytest.raises(ValueError):
+        product.LazyProduct(count_mod('a', 2), count_mod('a', 3), 'nand')
+
+
+def test_full_byte_alphabets():
+    every = bytes(range(256))
+    # ``last``: aceita cadeias que terminam no byte 0 (256 colunas distintas)
+    last = DFA(states=range(257), alphabet=every,
+               transitions={(q, c): c + 1 for q in range(257) for c in range(256)},
+               start=0, accepting={1})
+    even_a = exercises.get_even_a_dfa()
+    both = product.intersection(last, even_a)
+    assert both.accepts(b'aa\x00') is False  # '\x00' está fora do alfabeto de even_a
+    assert product.union(last, even_a).accepts('aa') and product.union(last, even_a).accepts(b'a\x00')
+    assert product.witness(product.difference(last, even_a)) == '\x00'
+    assert product.complement(last).accepts(b'\x00a') and not product.complement(last).accepts('\x00')
+    assert product.equivalent(last, last.minimize())
+    assert product.counterexample(last, product.complement(last)) == ''
+    dfa = product.union(last, even_a).to_dfa()
+    for s in (b'', b'aa', b'ab\x00', b'\x00\x01', b'ba'):
+        assert dfa.accepts(s) == (last.accepts(s) or even_a.accepts(s)), s
@@ -0,0 +1,61 @@
+import sys
+import random
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import regex
+
+
+CASES = ['(a|b)*a(a|b){3}', 'a+b?c*', '[a-c]{2,4}x', '(ab|ba)*', 'a.b', '[^a]*a', 'x{2,}y', '', 'a|']
+
+
+def random_text(rng, n):
+    return ''.join(rng.choice('abcxy') for _ in range(n))
+
+
+def test_fullmatch_and_search_agree_with_re():
+    rng = random.Random(3)
+    for pattern in CASES:
+        compiled = regex.compile(pattern)
+        expected = re.compile(pattern)
+        for _ in range(200):
+            text = random_text(rng, rng.randint(0, 8))
+            assert compiled.fullmatch(text) is (expected.fullmatch(text) is not None), (pattern, text)
+            assert compiled.search(text) is (expected.search(text) is not None), (pattern, text)
+
+
+def test_lazy_dfa_handles_exponential_pattern_with_small_cache():
+    compiled = regex.compile('(a|b)*a(a|b){20}', max_states=32)
+    rng = random.Random(5)
+    text = ''.join(rng.choice('ab') for _ in range(5000))
+    expected = len(text) > 20 and text[-21] == 'a'
+    assert compiled.fullmatch(text) is expected
+    assert compiled.fullmatch(text[:-21] + 'a' + 'b' * 20) is True
+    lazy = compiled._full
+    assert len(lazy._cache) <= 32
+    assert lazy.evictions > 0 and lazy.fallbacks > 0
+
+
+def test_to_dfa_and_invalid_patterns():
+    dfa = regex.compile('(ab)*').to_dfa()
+    assert dfa.accepts('abab') is True
+    assert dfa.accepts('aba') is False
+    dot = regex.compile('a.b').to_dfa()
+    assert dot.stride <= 4  # '.' cobre os 256 bytes em poucas classes
+    assert all(dot.accepts(bytes([97, c, 98])) for c in range(256))
+    assert not dot.accepts('ab') and not dot.accepts('a\x00\x00b')
+    anything = regex.compile('[^a]|a').to_dfa()
+    assert all(anything.accepts(bytes([c])) for c in range(256))
+    assert not anything.accepts('') and not anything.accepts('aa')
+    negated = regex.compile('[^ab]+c').to_dfa()
+    for s in ['xc', '\xff\x00c', 'ac', 'c', 'xcc', 'xx']:
+        assert negated.accepts(s) == regex.compile('[^ab]+c').fullmatch(s), s
+    for bad in ['(a', 'a)', '*a', 'a{3,1}', '[b-a]']:
+        with pytest.raises(ValueError):
+            regex.compile(bad)
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.runner_pool import ImpactCache, WarmPool, format_event
+
+
+def make_project(root: Path) -> None:
+    (root / 'src').mkdir()
+    (root / 'tests').mkdir()
+    (root / 'src' / '__init__.py').write_text('')
+    (root / 'src' / 'mod.py').write_text('VALUE = 1\n')
+    (root / 'src' / 'other.py').write_text('OTHER = 2\n')
+    (root / 'tests' / 'test_mod.py').write_text(
+        'from src import mod\n\ndef test_value():\n    assert mod.VALUE == 1\n')
+    (root / 'tests' / 'test_other.py').write_text(
+        'import pytest\nfrom src import other\n\ndef test_other():\n    assert other.OTHER == 2\n\n'
+        'def test_skip():\n    pytest.skip("sem motivo")\n')
+
+
+def test_warm_pool_streams_events_and_reruns_only_impacted(tmp_path):
+    make_project(tmp_path)
+    cache = ImpactCache(tmp_path)
+    with WarmPool(workers=1, root=tmp_path, cache=cache) as pool:
+        events = list(pool.run())
+        summary = events[-1]
+        assert (summary['passed'], summary['skipped'], summary['failed']) == (2, 1, 0)
+        outcomes = {e['nodeid']: e['outcome'] for e in events if e['event'] == 'test'}
+        assert outcomes['tests/test_mod.py::test_value'] == 'passed'
+        assert cache.entries['tests/test_mod.py']['deps'].keys() == {
+            'src/__init__.py', 'src/mod.py', 'tests/test_mod.py'}
+        assert pool.changed_targets() == []
+
+        # a mudança é vista pelo mesmo processo (módulos recarregados)
+        (tmp_path / 'src' / 'mod.py').write_text('VALUE = 2\n')
+        assert pool.changed_targets() == ['tests/test_mod.py']
+        events = list(pool.run(changed_only=True))
+        assert events[-1]['targets'] == 1 and events[-1]['failed'] == 1
+        failure = next(e for e in events if e['event'] == 'test')
+        assert 'assert 2 == 1' in format_event(failure)
+
+        # testes que falharam continuam selecionados até passarem
+        assert pool.changed_targets() == ['tests/test_mod.py']
+        (tmp_path / 'src' / 'mod.py').write_text('VALUE = 1\n')
+        assert list(pool.run(changed_only=True))[-1]['passed'] == 1
+        assert pool.changed_targets() == []
+    assert ImpactCache(tmp_path).entries == cache.entries
+
+
+def test_workers_started_lazily_and_dead_workers_fail_their_target(tmp_path):
+    make_project(tmp_path)
+    (tmp_path / 'tests' / 'test_crash.py').write_text(
+        'import os\n\ndef test_crash():\n    os._exit(7)\n')
+    with WarmPool(workers=8, root=tmp_path, cache=ImpactCache(tmp_path)) as pool:
+        events = list(pool.run(['tests/test_crash.py', 'tests/test_mod.py']))
+        assert len(pool._procs) == 2  # não os 8 permitidos
+        crashed = next(e for e in events if e['event'] == 'done' and e['target'] == 'tests/test_crash.py')
+        assert 'código 7' in crashed['message']
+        assert events[-1]['passed'] == 1 and events[-1]['errors'] == 1
+
+        # processo morto antes de receber o alvo (sem evento 'start')
+        pool._procs[0].kill()
+        pool._procs[0].join()
+        events = list(pool.run(['tests/test_mod.py', 'tests/test_other.py']))
+        done = [e for e in events if e['event'] == 'done']
+        assert len(done) == 2 and events[-1]['targets'] == 2
+        assert sum('message' in e for e in done) == 1 and len(pool._procs) == 2
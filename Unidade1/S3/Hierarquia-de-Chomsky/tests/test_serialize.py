@@ -0,0 +1,119 @@
+import pickle
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import dfa as dfa_module
+from src import exercises, serialize
+from src.dfa import DFA
+from src.nfa import NFA
+from src.pda import DPDA
+
+
+def test_dfa_round_trip_with_set_names(tmp_path):
+    nfa = NFA(states=(0, 1, 2), alphabet='ab',
+              transitions={(0, 'a'): {0, 1}, (0, 'b'): {0}, (1, 'b'): {2}},
+              start=0, accepting={2})
+    dfa = nfa.to_dfa()
+    path = tmp_path / 'ab.autm'
+    serialize.dump(dfa, path)
+    loaded = serialize.load(path)
+    assert isinstance(loaded.table, memoryview)  # mapeado, sem cópia
+    assert loaded.names == dfa.names
+    for s in ('', 'ab', 'aab', 'abb', 'bbab', 'ba'):
+        assert loaded.accepts(s) == dfa.accepts(s)
+    assert pickle.loads(pickle.dumps(loaded)).accepts('aab')
+
+
+def test_large_mapped_table_is_not_copied(tmp_path, monkeypatch):
+    monkeypatch.setattr(dfa_module, 'LIST_COPY_LIMIT', 0)
+    path = tmp_path / 'even.autm'
+    serialize.dump(exercises.get_even_a_dfa(), path)
+    loaded = serialize.load(path)
+    assert loaded._fast is loaded.table
+    assert loaded.accepts('abab') and not loaded.accepts('ab' * 3)
+
+
+def test_pda_and_tm_round_trip():
+    pda = serialize.loads(serialize.dumps(exercises.get_an_bn_pda()))
+    assert [pda.accepts(s) for s in ('', 'ab', 'aabb', 'aab', 'ba')] == [True, True, True, False, False]
+    tm = serialize.loads(serialize.dumps(exercises.get_increment_tm()))
+    assert tm.run('1011').output() == '1100'
+
+
+def test_load_arrays_numpy(tmp_path):
+    np = pytest.importorskip('numpy')
+    dfa = exercises.get_even_a_dfa()
+    path = tmp_path / 'even.autm'
+    serialize.dump(dfa, path)
+    kind, meta, arrays = serialize.load_arrays(path, numpy=True)
+    assert kind == serialize.KIND_DFA and meta['start'] == dfa.start
+    assert arrays['table'].tolist() == list(dfa.table)
+    assert not arrays['table'].flags.writeable
+
+
+def test_rejects_bad_data():
+    data = bytearray(serialize.dumps(exercises.get_even_a_dfa()))
+    with pytest.raises(ValueError):
+        serialize.loads(b'XXXX' + bytes(data[4:]))
+    data[4] = 99  # versão
+    with pytest.raises(ValueError):
+        serialize.loads(bytes(data))
+    with pytest.raises(ValueError):
+        serialize.dumps(object())
+
+
+def test_compile_cache(tmp_path):
+    cache = serialize.CompileCache(tmp_path)
+    spec = dict(states=('p', 'q'), alphabet='01', transitions={('p', '1'): 'q', ('q', '1'): 'p',
+                                                                ('p', '0'): 'p', ('q', '0'): 'q'},
+                start='p', accepting={'q'})
+    first = cache.compile(DFA, **spec)
+    again = cache.compile(DFA, **dict(reversed(list(spec.items()))))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(again.table, memoryview)
+    assert again.accepts('1011') == first.accepts('1011') is True
+    cache.compile(DFA, **dict(spec, accepting={'p'}))
+    assert cache.misses == 2
+    with pytest.raises(ValueError):
+        cache.compile(DPDA, states=('s',), input_alphabet='a', stack_alphabet=('Z',),
+                      transitions={}, start='s', start_stack='W')
+
+
+def test_full_byte_alphabet_round_trip(tmp_path):
+    every = bytes(range(256))
+    dfa = DFA(states=(0, 1), alphabet=every,
+              transitions={(q, c): q ^ (c == 0) for q in (0, 1) for c in range(256)},
+              start=0, accepting={1})
+    path = tmp_path / 'full.aut'
+    serialize.dump(dfa, path)
+    loaded = serialize.load(path)
+    assert loaded.classmap == dfa.classmap and loaded.stride == 3
+    assert loaded.accepts(b'\x00abc') and not loaded.accepts(every * 2)
+
+
+def test_truncated_cache_file_is_rebuilt(tmp_path):
+    cache = serialize.CompileCache(tmp_path)
+    spec = dict(states=('p', 'r'), input_alphabet='ab', stack_alphabet=('Z', 'A'),
+                transitions={('p', 'a', 'Z'): ('p', 'AZ'), ('p', 'a', 'A'): ('p', 'AA'),
+                             ('p', 'b', 'A'): ('r', ''), ('r', 'b', 'A'): ('r', ''),
+                             ('r', '', 'Z'): ('r', '')},
+                start='p', start_stack='Z', accept_by='empty')
+    cache.compile(DPDA, **spec)
+    path = cache.path_for(DPDA, spec)
+    data = path.read_bytes()
+    # cortes no cabeçalho, no diretório de arrays, nos metadados e nos dados
+    for size in (3, 20, 40, 60, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            serialize.load(path)
+        pda = cache.compile(DPDA, **spec)
+        assert pda.accepts('aabb') and not pda.accepts('aab')
+    assert (cache.hits, cache.misses) == (0, 7)
+    loaded = serialize.load(path)
+    assert loaded.accepts('ab') and loaded.has_eps == DPDA(**spec).has_eps
@@ -0,0 +1,137 @@
+import asyncio
+import socket
+import struct
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import exercises
+from src.service import MembershipService, ServiceBusy
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 30))
+
+
+async def line_client(port: int, requests):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b''.join(r + b'\n' for r in requests))  # todos de uma vez (pipelining)
+    await writer.drain()
+    answers = [(await reader.readline()).rstrip(b'\n') for _ in requests]
+    writer.close()
+    await writer.wait_closed()
+    return answers
+
+
+def test_concurrent_line_clients_are_batched():
+    async def main():
+        service = MembershipService(max_delay=0.01)
+        server = await service.serve_tcp()
+        port = server.sockets[0].getsockname()[1]
+        inputs = [('ab' * (i % 5) + 'a' * (i % 3)).encode() for i in range(200)]
+        try:
+            results = await asyncio.gather(*[
+                line_client(port, [b'dfa ' + s for s in inputs] + [b'pda aabb', b'tm 1011', b'tm 12', b'xyz 1'])
+                for _ in range(5)
+            ])
+        finally:
+            await service.close()
+        return inputs, results, service.stats.summary()
+
+    inputs, results, stats = run(main())
+    expected = [b'1' if exercises.dfa_even_a(s.decode()) else b'0' for s in inputs]
+    for answers in results:
+        assert answers[:-4] == expected
+        assert answers[-4:-1] == [b'1', b'1100', b'erro']
+        assert answers[-1].startswith(b'erro: comando desconhecido')
+    assert stats['requests'] == 5 * 203
+    assert stats['batches'] < stats['requests'] and stats['batch_max'] > 1
+    assert stats['latency_p99_ms'] >= stats['latency_p50_ms'] > 0
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='sem sockets Unix')
+def test_length_prefixed_over_unix_socket(tmp_path):
+    path = str(tmp_path / 'svc.sock')
+
+    async def main():
+        service = MembershipService(framing='length')
+        await service.serve_unix(path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            for body in (b'dfa a\nab\na', b'pda aab', b'dfa '):
+                writer.write(struct.pack('>I', len(body)) + body)
+            writer.write(struct.pack('>I', 1 << 30))  # grande demais: erro e fim da conexão
+            await writer.drain()
+            answers = []
+            while True:
+                header = await reader.read(4)
+                if not header:
+                    break
+                (size,) = struct.unpack('>I', header)
+                answers.append(await reader.readexactly(size))
+            writer.close()
+            return answers
+        finally:
+            await service.close()
+
+    answers = run(main())
+    assert answers[:3] == [b'0', b'0', b'1']  # 'a\nab\na' tem três 'a'
+    assert answers[3].startswith(b'erro: mensagem grande demais')
+
+
+def test_overload_rejects_when_queue_is_full():
+    async def main():
+        service = MembershipService(max_queue=2, max_batch=1, overload='reject')
+        await service.start()
+        try:
+            return await asyncio.gather(*[service.check('dfa', b'aa') for _ in range(6)],
+                                        return_exceptions=True)
+        finally:
+            await service.close()
+
+    results = run(main())
+    assert results.count(True) == 2
+    assert sum(isinstance(r, ServiceBusy) for r in results) == 4
+
+
+def even_length(items):
+    return [len(s) % 2 == 0 for s in items]
+
+
+def test_process_pool_and_failing_checker():
+    def broken(items):
+        raise RuntimeError('falhou')
+
+    async def main():
+        service = MembershipService(checkers={'even': even_length}, workers=1)
+        await service.start()
+        try:
+            pooled = await asyncio.gather(*[service.check('even', b'x' * i) for i in range(20)])
+        finally:
+            await service.close()
+        service = MembershipService(checkers={'bad': broken})
+        await service.start()
+        try:
+            with pytest.raises(RuntimeError):
+                await service.check('bad', b'')
+            with pytest.raises(ValueError):
+                await service.check('nope', b'')
+        finally:
+            await service.close()
+        return pooled, service.stats
+
+    pooled, stats = run(main())
+    assert pooled == [i % 2 == 0 for i in range(20)]
+    assert stats.failed == 1
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        MembershipService(framing='json')
+    with pytest.raises(ValueError):
+        MembershipService(max_batch=0)
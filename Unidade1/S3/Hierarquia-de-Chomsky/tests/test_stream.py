@@ -0,0 +1,60 @@
+import sys
+import io
+import socket
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src import exercises, stream
+from src.aho_corasick import AhoCorasick
+
+
+def test_dfa_runner_partial_and_final_verdicts():
+    runner = stream.DFARunner(exercises.EVEN_A_DFA)
+    partial = list(stream.verdicts(runner, ['ab', b'a', memoryview(b'bb')]))
+    assert partial == [(2, False), (3, True), (5, True)]
+    assert runner.finish() is True
+    runner.feed('c')
+    assert runner.rejected and runner.finish() is False
+
+
+def test_dfa_runner_without_sink_state():
+    # no AFD de Aho–Corasick, símbolos fora do alfabeto voltam à raiz
+    dfa = AhoCorasick(['ab']).dfa
+    assert dfa.sink_state() is None
+    runner = stream.DFARunner(dfa)
+    runner.feed('zz')
+    assert not runner.rejected
+    runner.feed('ab')
+    assert runner.finish() is True and dfa.accepts('zzab')
+    assert dfa.accepts('€ab') and not dfa.accepts('ab€')
+
+
+def test_an_bn_runner_across_chunk_boundaries():
+    for s in ['', 'ab', 'aabb', 'aaabbb', 'aba', 'aab', 'abb', 'ba', 'abc']:
+        for size in (1, 2, 3):
+            runner = stream.AnBnRunner()
+            chunks = [s[i:i + size] for i in range(0, len(s), size)]
+            assert stream.run_chunks(runner, chunks) is exercises.pda_an_bn(s), (s, size)
+
+
+def test_run_file_and_readers(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'a' * 5000 + b'b' * 5000)
+    assert stream.run_file(stream.AnBnRunner(), path, chunk_size=777) is True
+    assert stream.run_file(stream.DFARunner(exercises.EVEN_A_DFA), path, chunk_size=1000) is True
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert stream.run_file(stream.AnBnRunner(), empty) is True
+
+    reader = io.BytesIO(b'aaabb')
+    assert stream.run_chunks(stream.AnBnRunner(), stream.iter_reader_chunks(reader, 2)) is False
+
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(b'ab' * 1000 + b'a')
+        left.close()
+        chunks = stream.iter_socket_chunks(right, 64)
+        assert stream.run_chunks(stream.DFARunner(exercises.EVEN_A_DFA), chunks) is False
@@ -0,0 +1,129 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest
+
+from src import exercises
+from src.tm import Tape, TuringMachine
+
+
+def copy_machine() -> TuringMachine:
+    # copia a fita 1 para a fita 2
+    return TuringMachine(
+        states=('copy', 'end'),
+        tape_alphabet='ab_',
+        transitions={
+            ('copy', ('a', '_')): ('copy', ('a', 'a'), ('R', 'R')),
+            ('copy', ('b', '_')): ('copy', ('b', 'b'), ('R', 'R')),
+            ('copy', ('_', '_')): ('end', ('_', '_'), ('S', 'S')),
+        },
+        start='copy',
+        accepting={'end'},
+        tapes=2,
+    )
+
+
+def test_tm_increment_matches_integer_arithmetic():
+    for n in range(200):
+        b = format(n, 'b')
+        assert exercises.tm_increment_binary(b) == format(n + 1, 'b')
+    assert exercises.tm_increment_binary('') == '1'
+    assert exercises.tm_increment_binary('0011') == '0100'
+    with pytest.raises(ValueError):
+        exercises.tm_increment_binary('12')
+
+
+def test_long_carry_extends_tape_to_the_left():
+    result = exercises.INCREMENT_TM.run('1' * 100000)
+    assert result.accepted and result.output() == '1' + '0' * 100000
+    assert result.steps == 2 * 100000 + 2
+    assert result.tapes[0].span() == (-1, 100000)
+
+
+def test_multi_tape_and_step_limit():
+    tm = copy_machine()
+    result = tm.run(['abba', ''])
+    assert result.accepted and result.output(1) == 'abba'
+    assert result.heads == [4, 4]
+    partial = tm.run(['abba', ''], max_steps=2)
+    assert not partial.halted and partial.output(1) == 'ab'
+
+
+def test_tape_grows_both_ways():
+    tape = Tape()
+    tape.write(-3, 1)
+    tape.write(5, 2)
+    assert tape.read(-3) == 1 and tape.read(5) == 2 and tape.read(100) == 0
+    assert tape.span() == (-3, 6)
+
+
+def busy_beaver_3() -> TuringMachine:
+    # castor ocupado de 3 estados: 14 passos e seis '1'
+    return TuringMachine(
+        states=('A', 'B', 'C', 'H'),
+        tape_alphabet='_1',
+        transitions={
+            ('A', '_'): ('B', '1', 'R'), ('A', '1'): ('H', '1', 'R'),
+            ('B', '_'): ('C', '_', 'R'), ('B', '1'): ('B', '1', 'R'),
+            ('C', '_'): ('C', '1', 'L'), ('C', '1'): ('A', '1', 'L'),
+        },
+        start='A',
+        accepting={'H'},
+    )
+
+
+def test_accelerated_run_matches_cell_by_cell():
+    for tm, inputs in ((busy_beaver_3(), ['', '1', '1_1']),
+                       (exercises.INCREMENT_TM, ['0', '1', '1011', '0111', '110111'])):
+        for text in inputs:
+            for limit in (None, 3, 7):
+                slow = tm.run(text, max_steps=limit)
+                fast = tm.run_accelerated(text, max_steps=limit)
+                assert (fast.state, fast.steps, fast.halted, fast.output(), fast.heads) == \
+                       (slow.state, slow.steps, slow.halted, slow.output(), slow.heads), (text, limit)
+
+
+def test_accelerated_long_carry_from_runs():
+    n = 10 ** 8
+    result = exercises.INCREMENT_TM.run_accelerated([('1', n)])
+    assert result.accepted and result.steps == 2 * n + 2
+    assert result.runs() == [('1', 1), ('0', n)]
+
+
+def test_accelerated_detects_sweep_over_blanks():
+    tm = TuringMachine(states=('r',), tape_alphabet='_', transitions={('r', '_'): ('r', '_', 'R')},
+                       start='r')
+    result = tm.run_accelerated('')
+    assert not result.halted
+
+
+def test_accelerated_matches_cell_by_cell_on_random_machines():
+    # inclui laços no mesmo estado sobre brancos, escrevendo ou não
+    rng = random.Random(9)
+    for _ in range(400):
+        transitions = {}
+        for q in 'AB':
+            for c in '_1':
+                if rng.random() < 0.85:
+                    transitions[(q, c)] = (rng.choice('ABH'), rng.choice('_1'), rng.choice('LRS'))
+        tm = TuringMachine(states='ABH', tape_alphabet='_1', transitions=transitions,
+                           start='A', accepting={'H'})
+        text = ''.join(rng.choice('_1') for _ in range(rng.randrange(5)))
+        for limit in (1, 5, 13, 40):
+            slow = tm.run(text, max_steps=limit)
+            fast = tm.run_accelerated(text, max_steps=limit)
+            assert (fast.state, fast.steps, fast.halted, fast.output(), fast.heads) == \
+                   (slow.state, slow.steps, slow.halted, slow.output(), slow.heads), (transitions, text, limit)
+    for move in 'LR':
+        for write in '_1':
+            tm = TuringMachine(states=('q',), tape_alphabet='_1',
+                               transitions={('q', '_'): ('q', write, move)}, start='q')
+            slow, fast = tm.run('', max_steps=5), tm.run_accelerated('', max_steps=5)
+            assert (fast.steps, fast.output(), fast.heads) == (slow.steps, slow.output(), slow.heads)
+            assert fast.steps == 5 and fast.output() == ('11111' if write == '1' else '')
+            assert not tm.run_accelerated('').halted